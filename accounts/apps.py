@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'accounts'
+
+    def ready(self):
+        # Registers the connection_created hook that tunes SQLite connections
+        import smarthire.db  # noqa: F401
+        from . import signals  # noqa: F401
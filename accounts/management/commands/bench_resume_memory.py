@@ -0,0 +1,108 @@
+import dataclasses
+import gc
+import json
+import time
+import tracemalloc
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from resume import ContactInfo, Education, Experience, ParsedResume, ResumeParser
+
+DEFAULT_GLOBS = ['tmp/*.pdf', 'resumes/*.pdf']
+
+
+def unslotted(cls, **overrides):
+    """A plain (per-instance __dict__) copy of a resume dataclass, for comparison."""
+    fields = []
+    for f in dataclasses.fields(cls):
+        default = {}
+        if f.default is not dataclasses.MISSING:
+            default['default'] = f.default
+        if f.default_factory is not dataclasses.MISSING:
+            default['default_factory'] = overrides.get(f.name, f.default_factory)
+        fields.append((f.name, f.type, dataclasses.field(**default)))
+    return dataclasses.make_dataclass(f'Plain{cls.__name__}', fields)
+
+
+def dumps(parsed):
+    """JSON bytes of ParsedResume.to_dict(), as a JSONField stores it"""
+    return json.dumps(parsed.to_dict(), separators=(',', ':')).encode()
+
+
+def loads(payload):
+    return ParsedResume.from_dict(json.loads(payload))
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the memory taken by N parsed resumes held as slotted objects, "
+        "as plain dataclasses, as dicts and as serialized bytes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=100_000, help='Number of parsed resumes to hold')
+        parser.add_argument('--json', action='store_true', help='Emit results as JSON')
+
+    def handle(self, *args, **options):
+        count = options['count']
+        base = Path(settings.BASE_DIR)
+        paths = sorted(p for pattern in DEFAULT_GLOBS for p in base.glob(pattern))
+        if not paths:
+            raise CommandError("No sample PDF files found.")
+
+        # Parse the samples once; every copy below is rebuilt from bytes so it
+        # owns its own strings, as resumes loaded from a cache or the DB would.
+        parser = ResumeParser('heuristic')
+        samples = [dumps(parser.parse_resume(str(path))) for path in paths]
+        payloads = [samples[i % len(samples)] for i in range(count)]
+
+        PlainContactInfo = unslotted(ContactInfo)
+        PlainParsedResume = unslotted(ParsedResume, contact_info=PlainContactInfo)
+        PlainExperience = unslotted(Experience)
+        PlainEducation = unslotted(Education)
+
+        def load_plain(payload):
+            data = json.loads(payload)
+            data['contact_info'] = PlainContactInfo(**data['contact_info'])
+            for key in ('work_experience', 'internship_experience'):
+                data[key] = [PlainExperience(**exp) for exp in data[key]]
+            data['all_experience'] = data['work_experience'] + data['internship_experience']
+            data['education'] = [PlainEducation(**edu) for edu in data['education']]
+            return PlainParsedResume(**data)
+
+        layouts = {
+            'slotted objects': loads,
+            'plain dataclasses': load_plain,
+            'dicts': json.loads,
+            'serialized bytes': lambda payload: dumps(loads(payload)),
+        }
+        results = {'count': count, 'layouts': {}}
+        for name, build in layouts.items():
+            gc.collect()
+            tracemalloc.start()
+            held = [build(payload) for payload in payloads]
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results['layouts'][name] = {
+                'total_mb': round(current / 2**20, 1),
+                'bytes_per_resume': round(current / count),
+            }
+            del held
+
+        sample = loads(samples[0])
+        for label, func in (('dumps', lambda: dumps(sample)), ('loads', lambda: loads(samples[0]))):
+            started = time.perf_counter()
+            for _ in range(10_000):
+                func()
+            results[f'{label}_us'] = round((time.perf_counter() - started) * 100, 2)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(f"{count} parsed resumes ({len(samples)} samples)")
+        for name, r in results['layouts'].items():
+            self.stdout.write(f"{name:<18} {r['total_mb']:>9.1f} MB  {r['bytes_per_resume']:>7} bytes/resume")
+        self.stdout.write(f"dumps {results['dumps_us']} us, loads {results['loads_us']} us per resume")
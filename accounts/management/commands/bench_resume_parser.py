@@ -0,0 +1,154 @@
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from resume import NLP_PROFILES, ResumeParser, segment_sections
+
+DEFAULT_GLOBS = ['tmp/*.pdf', 'resumes/*.pdf']
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB, or None where unsupported (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the resume parser's text extractors on sample PDFs. PDF text "
+        "extraction is done once up front and reported separately. The extractor "
+        "stages each segment the text themselves; parse_text segments it once. "
+        "With --nlp-profile all, each NLP profile runs in its own process so "
+        "their memory use can be compared."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', help='PDF files (default: tmp/*.pdf and resumes/*.pdf)')
+        parser.add_argument('--repeat', type=int, default=200, help='Passes over each resume')
+        parser.add_argument(
+            '--nlp-profile', choices=NLP_PROFILES + ('all',), default=settings.RESUME_PARSER_NLP_PROFILE,
+            help='Resume parser NLP profile to benchmark (default: RESUME_PARSER_NLP_PROFILE)',
+        )
+        parser.add_argument('--json', action='store_true', help='Emit results as JSON')
+
+    def handle(self, *args, **options):
+        paths = [Path(p) for p in options['paths']]
+        if not paths:
+            base = Path(settings.BASE_DIR)
+            paths = sorted(p for pattern in DEFAULT_GLOBS for p in base.glob(pattern))
+        if not paths:
+            raise CommandError("No PDF files found.")
+
+        if options['nlp_profile'] == 'all':
+            results = {profile: self.run_in_subprocess(profile, paths, options) for profile in NLP_PROFILES}
+            if options['json']:
+                self.stdout.write(json.dumps(results, indent=2))
+            else:
+                self.write_comparison(results)
+            return
+
+        results = self.run_profile(options['nlp_profile'], paths, options['repeat'])
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(
+            f"{results['resumes']} resumes, {results['characters']} characters, "
+            f"{results['repeat']} passes (median); PDF text {results['pdf_text_ms_per_resume']} ms/resume"
+        )
+        self.stdout.write(
+            f"NLP profile {results['nlp_profile']}: pipeline {results['nlp_pipeline'] or 'none'}, "
+            f"loaded in {results['nlp_load_ms']} ms, peak RSS {results['peak_rss_mb']} MB"
+        )
+        for name, r in results['stages'].items():
+            self.stdout.write(f"{name:<11} {r['us_per_resume']:>9.1f} us/resume  {r['resumes_per_sec']:>9.1f} resumes/sec")
+
+    def run_profile(self, nlp_profile, paths, repeat):
+        parser = ResumeParser(nlp_profile)
+
+        started = time.perf_counter()
+        nlp = parser.nlp
+        nlp_load_ms = round((time.perf_counter() - started) * 1000, 1)
+
+        started = time.perf_counter()
+        texts = [parser.extract_text_from_pdf(str(path)) for path in paths]
+        pdf_text_sec = time.perf_counter() - started
+        texts = [text for text in texts if text]
+
+        stages = {
+            'segment': segment_sections,
+            'contact': parser.extract_contact_info,
+            'experience': parser.extract_experience,
+            'education': parser.extract_education,
+            'summary': parser.extract_summary,
+            'skills': parser.extract_skills,
+            'parse_text': self.parse_text(parser),
+        }
+        results = {
+            'nlp_profile': nlp_profile,
+            'nlp_pipeline': list(nlp.pipe_names) if nlp is not None else None,
+            'nlp_load_ms': nlp_load_ms,
+            'resumes': len(texts),
+            'characters': sum(len(text) for text in texts),
+            'repeat': repeat,
+            'pdf_text_ms_per_resume': round(pdf_text_sec * 1000 / len(paths), 3),
+            'stages': {},
+        }
+        for name, func in stages.items():
+            per_pass = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                for text in texts:
+                    func(text)
+                per_pass.append(time.perf_counter() - started)
+            results['stages'][name] = {
+                'us_per_resume': round(statistics.median(per_pass) * 1e6 / len(texts), 1),
+                'resumes_per_sec': round(len(texts) / statistics.median(per_pass), 1),
+            }
+        results['peak_rss_mb'] = peak_rss_mb()
+        return results
+
+    def run_in_subprocess(self, nlp_profile, paths, options):
+        proc = subprocess.run(
+            [sys.executable, str(Path(settings.BASE_DIR) / 'manage.py'), 'bench_resume_parser',
+             '--nlp-profile', nlp_profile, '--repeat', str(options['repeat']), '--json',
+             *[str(path) for path in paths]],
+            capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            raise CommandError(f"Benchmark for profile {nlp_profile} failed:\n{proc.stderr[-2000:]}")
+        # Libraries may print warnings before the JSON document
+        return json.loads(proc.stdout[proc.stdout.index('{'):])
+
+    def write_comparison(self, results):
+        self.stdout.write(f"{'profile':<10} {'pipeline':<24} {'load ms':>8} {'contact us':>11} {'parse us':>10} {'peak RSS MB':>12}")
+        for profile, r in results.items():
+            pipeline = ','.join(r['nlp_pipeline']) if r['nlp_pipeline'] else '-'
+            self.stdout.write(
+                f"{profile:<10} {pipeline[:24]:<24} {r['nlp_load_ms']:>8.1f} "
+                f"{r['stages']['contact']['us_per_resume']:>11.1f} {r['stages']['parse_text']['us_per_resume']:>10.1f} "
+                f"{r['peak_rss_mb'] if r['peak_rss_mb'] is not None else '-':>12}"
+            )
+
+    def parse_text(self, parser):
+        """Everything parse_resume does after the PDF has been read."""
+        def run(text):
+            sections = segment_sections(text)
+            parser.extract_contact_info(text)
+            parser.extract_skills(text)
+            _, work, internships = parser.extract_experience(text, sections)
+            parser.extract_education(text, sections)
+            parser.extract_summary(text, sections)
+            parser.calculate_experience_metrics(work, internships)
+        return run
@@ -0,0 +1,87 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Loads settings, every app and the full URLConf (and so every view module),
+# which is what a web worker does before serving its first request.
+STARTUP_SCRIPT = (
+    "import django; django.setup(); "
+    "from django.urls import get_resolver; get_resolver().url_patterns"
+)
+
+# Dependencies that must only be imported when they are first used
+HEAVY_MODULES = ['spacy', 'PyPDF2', 'fitz', 'pymupdf', 'numpy']
+
+
+def parse_importtime(stderr):
+    """Return ``[(module, self_us, cumulative_us, depth), ...]`` from ``-X importtime`` output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+            self_us, cumulative_us = int(self_us), int(cumulative_us)
+        except ValueError:
+            continue  # the header line
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), self_us, cumulative_us, depth))
+    return rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure cold-start import time of the project in a fresh interpreter "
+        "(python -X importtime) and fail if it is over budget or if a heavy "
+        "optional dependency is imported at startup."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--budget-ms', type=float, default=getattr(settings, 'STARTUP_IMPORT_BUDGET_MS', 800),
+            help='Maximum total import time in milliseconds',
+        )
+        parser.add_argument('--top', type=int, default=10, help='Number of slowest top-level imports to show')
+        parser.add_argument('--json', action='store_true', help='Emit results as JSON')
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'smarthire.settings'))
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', STARTUP_SCRIPT],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            raise CommandError(f"Startup failed:\n{proc.stderr[-2000:]}")
+
+        rows = parse_importtime(proc.stderr)
+        top_level = [row for row in rows if row[3] == 0]
+        total_ms = sum(row[2] for row in top_level) / 1000
+        imported = {row[0] for row in rows}
+        heavy = [name for name in HEAVY_MODULES if name in imported]
+        slowest = sorted(top_level, key=lambda row: row[2], reverse=True)[:options['top']]
+
+        results = {
+            'total_import_ms': round(total_ms, 1),
+            'budget_ms': options['budget_ms'],
+            'modules_imported': len(rows),
+            'heavy_modules_imported': heavy,
+            'slowest': [{'module': name, 'cumulative_ms': round(cum / 1000, 1)} for name, _, cum, _ in slowest],
+        }
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+        else:
+            self.stdout.write(f"Imported {len(rows)} modules in {total_ms:.1f} ms (budget {options['budget_ms']:.0f} ms)")
+            for entry in results['slowest']:
+                self.stdout.write(f"  {entry['cumulative_ms']:>8.1f} ms  {entry['module']}")
+
+        if heavy:
+            raise CommandError(f"Heavy modules imported at startup: {', '.join(heavy)}")
+        if total_ms > options['budget_ms']:
+            raise CommandError(f"Startup import time {total_ms:.1f} ms is over the {options['budget_ms']:.0f} ms budget")
+        if not options['json']:
+            self.stdout.write(self.style.SUCCESS("Startup import time is within budget."))
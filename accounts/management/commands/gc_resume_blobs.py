@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from accounts.models import DeveloperProfile, SignupDraft
+from accounts.storage import BLOB_DIR, collect_garbage
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete resume blobs that no developer profile or signup draft references, "
+        "along with partial uploads left by interrupted requests."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-age-minutes', type=int, default=60,
+            help='Keep files newer than this, so uploads still being attached to a draft are not collected',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be deleted without deleting it')
+
+    def handle(self, *args, **options):
+        referenced = set()
+        for model in (DeveloperProfile, SignupDraft):
+            names = model.objects.filter(resume__startswith=f'{BLOB_DIR}/').values_list('resume', flat=True)
+            referenced.update(names.iterator(chunk_size=2000))
+
+        deleted, freed = collect_garbage(
+            referenced, min_age_seconds=options['min_age_minutes'] * 60, dry_run=options['dry_run'],
+        )
+        verb = "Would delete" if options['dry_run'] else "Deleted"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {deleted} unreferenced resume files ({freed / 2**20:.1f} MB); {len(referenced)} in use."
+        ))
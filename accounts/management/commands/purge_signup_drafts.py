@@ -0,0 +1,19 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from accounts.models import SignupDraft
+
+
+class Command(BaseCommand):
+    help = "Delete signup drafts left by abandoned signups (run gc_resume_blobs afterwards to free their files)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=24, help='Delete drafts older than this many hours')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        count, _ = SignupDraft.objects.filter(created_at__lt=cutoff).delete()
+
+        self.stdout.write(self.style.SUCCESS(f"Deleted {count} signup drafts older than {options['hours']} hours."))
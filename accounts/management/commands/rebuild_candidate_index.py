@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from accounts.models import DeveloperProfile
+from accounts.search import get_candidate_index
+
+
+class Command(BaseCommand):
+    help = "Re-index every developer profile in the recruiter candidate search index."
+
+    def handle(self, *args, **options):
+        index = get_candidate_index()
+        seen = set()
+        profiles = DeveloperProfile.objects.select_related('parsed_resume')
+        for profile in profiles.iterator(chunk_size=1000):
+            record = getattr(profile, 'parsed_resume', None)
+            index.index_profile(profile, resume=record.as_parsed_data() if record else None)
+            seen.add(profile.pk)
+
+        stale = index.indexed_ids() - seen
+        for profile_id in stale:
+            index.remove_profile(profile_id)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {len(seen)} developer profiles, removed {len(stale)} stale entries."
+        ))
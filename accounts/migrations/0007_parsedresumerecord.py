@@ -0,0 +1,34 @@
+# Generated by Django 5.1.1 on 2026-10-19 09:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_developerprofile_skills_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ParsedResumeRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('technical_skills', models.JSONField(blank=True, default=list)),
+                ('soft_skills', models.JSONField(blank=True, default=list)),
+                ('work_experience', models.JSONField(blank=True, default=list)),
+                ('internship_experience', models.JSONField(blank=True, default=list)),
+                ('education', models.JSONField(blank=True, default=list)),
+                ('contact_info', models.JSONField(blank=True, default=dict)),
+                ('certifications', models.JSONField(blank=True, default=list)),
+                ('projects', models.JSONField(blank=True, default=list)),
+                ('languages', models.JSONField(blank=True, default=list)),
+                ('summary', models.TextField(blank=True)),
+                ('years_of_experience', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('total_internship_months', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('parsed_at', models.DateTimeField(auto_now=True)),
+                ('profile', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='parsed_resume', to='accounts.developerprofile')),
+            ],
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_parsedresumerecord'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SignupDraft',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resume_path', models.CharField(blank=True, max_length=500)),
+                ('resume_name', models.CharField(blank=True, max_length=255)),
+                ('parsed_resume', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+    ]
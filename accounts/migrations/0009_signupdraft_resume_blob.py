@@ -0,0 +1,26 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_signupdraft'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='signupdraft',
+            name='resume_name',
+        ),
+        migrations.RemoveField(
+            model_name='signupdraft',
+            name='resume_path',
+        ),
+        migrations.AddField(
+            model_name='signupdraft',
+            name='resume',
+            field=models.FileField(blank=True, max_length=255, upload_to=''),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:55
+
+from django.db import migrations, models
+
+
+def locate_existing(apps, schema_editor):
+    """Resolve the place of every existing location, one UPDATE per distinct location"""
+    from jobs.geo import location_fields
+    DeveloperProfile = apps.get_model('accounts', 'DeveloperProfile')
+    locations = DeveloperProfile.objects.exclude(location=None).values_list('location', flat=True).distinct()
+    for location in list(locations):
+        DeveloperProfile.objects.filter(location=location).update(**location_fields(location))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_signupdraft_resume_blob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='developerprofile',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='developerprofile',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='developerprofile',
+            name='place_id',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.RunPython(locate_existing, migrations.RunPython.noop),
+    ]
@@ -3,6 +3,7 @@ from django.contrib.auth.models import AbstractUser
 from django.utils.translation import gettext_lazy as _
 from .managers import CustomUserManager
 from django.conf import settings
+from jobs.geo import LocatedModel
 
 
 
@@ -25,7 +26,7 @@ class User(AbstractUser):
         return self.email
 
 
-class DeveloperProfile(models.Model):
+class DeveloperProfile(LocatedModel):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     username = models.CharField(max_length=100)
     phone = models.CharField(max_length=15)
@@ -41,7 +42,78 @@ class DeveloperProfile(models.Model):
 
     def __str__(self):
         return self.username
-    
+
+
+class ParsedResumeRecord(models.Model):
+    """Structured resume parser output for a developer, saved at signup"""
+    profile = models.OneToOneField(DeveloperProfile, on_delete=models.CASCADE, related_name='parsed_resume')
+    technical_skills = models.JSONField(default=list, blank=True)
+    soft_skills = models.JSONField(default=list, blank=True)
+    work_experience = models.JSONField(default=list, blank=True)
+    internship_experience = models.JSONField(default=list, blank=True)
+    education = models.JSONField(default=list, blank=True)
+    contact_info = models.JSONField(default=dict, blank=True)
+    certifications = models.JSONField(default=list, blank=True)
+    projects = models.JSONField(default=list, blank=True)
+    languages = models.JSONField(default=list, blank=True)
+    summary = models.TextField(blank=True)
+    # Null when the resume had no entries to measure, so matching can fall
+    # back to the self-reported experience instead of assuming zero
+    years_of_experience = models.PositiveSmallIntegerField(null=True, blank=True)
+    total_internship_months = models.PositiveSmallIntegerField(null=True, blank=True)
+    parsed_at = models.DateTimeField(auto_now=True)
+
+    LIST_FIELDS = (
+        'technical_skills', 'soft_skills', 'work_experience', 'internship_experience',
+        'education', 'certifications', 'projects', 'languages',
+    )
+
+    @classmethod
+    def from_parsed_data(cls, profile, data):
+        """Build an unsaved record from ParsedResume.to_dict() output, as kept in a SignupDraft"""
+        record = cls(profile=profile)
+        for field in cls.LIST_FIELDS:
+            setattr(record, field, data.get(field) or [])
+        record.contact_info = data.get('contact_info') or {}
+        record.summary = data.get('summary') or ''
+        if record.work_experience:
+            record.years_of_experience = data.get('years_of_experience') or 0
+        if record.internship_experience:
+            record.total_internship_months = data.get('total_internship_months') or 0
+        return record
+
+    def as_parsed_data(self):
+        """The record in ParsedResume.to_dict() shape"""
+        data = {field: getattr(self, field) for field in self.LIST_FIELDS}
+        data.update({
+            'skills': self.profile.skills or [],
+            'contact_info': self.contact_info,
+            'summary': self.summary,
+            'years_of_experience': self.years_of_experience,
+            'total_internship_months': self.total_internship_months,
+        })
+        return data
+
+    def __str__(self):
+        return f"Parsed resume for {self.profile}"
+
+
+class SignupDraft(models.Model):
+    """Uploaded resume and its parsed data for a developer signup in progress.
+
+    The session only holds the draft's id, so the parsed payload is not
+    re-serialised into the session on every signup step. The resume points at
+    a content-addressed blob (accounts.storage) that may be shared, so deleting
+    a draft leaves the file for gc_resume_blobs.
+    """
+    resume = models.FileField(max_length=255, blank=True)
+    parsed_resume = models.JSONField(default=dict, blank=True)  # ParsedResume.to_dict()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"Signup draft {self.pk}"
+
+
 class RecruiterProfile(models.Model):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     username = models.CharField(max_length=50)
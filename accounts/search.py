@@ -0,0 +1,330 @@
+"""
+Candidate search for recruiters.
+
+Developer profiles and the text of their parsed resumes are indexed in an
+embedded SQLite FTS5 database that lives next to the main database
+(``settings.CANDIDATE_INDEX_PATH``), so search works without an external
+service whichever backend the main database uses. The index is updated
+incrementally when a profile is saved (see ``accounts.signals``) and can be
+rebuilt with ``python manage.py rebuild_candidate_index``.
+
+Queries support quoted phrases, ``AND`` / ``OR`` / ``NOT``, ``-term``,
+parentheses and field filters (``skills:python``, ``location:"new york"``).
+"""
+
+import re
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+# FTS column -> bm25() weight
+COLUMN_WEIGHTS = {
+    'title': 6.0,
+    'skills': 5.0,
+    'location': 3.0,
+    'summary': 1.5,
+    'resume': 1.0,
+}
+
+FIELD_ALIASES = {
+    'title': 'title',
+    'skill': 'skills',
+    'skills': 'skills',
+    'location': 'location',
+    'loc': 'location',
+    'summary': 'summary',
+    'resume': 'resume',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS candidate (
+    profile_id INTEGER PRIMARY KEY,
+    location TEXT NOT NULL DEFAULT '',
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS candidate_location ON candidate(location);
+
+CREATE TABLE IF NOT EXISTS candidate_skill (
+    profile_id INTEGER NOT NULL,
+    skill TEXT NOT NULL,
+    PRIMARY KEY (skill, profile_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS candidate_skill_profile ON candidate_skill(profile_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS candidate_fts USING fts5(
+    title, skills, location, summary, resume,
+    tokenize='porter unicode61 remove_diacritics 2'
+);
+"""
+
+# Snippet markers that cannot occur in indexed text; swapped for <mark>
+# after the snippet has been HTML-escaped.
+_MARK_OPEN = '\x02'
+_MARK_CLOSE = '\x03'
+
+_QUERY_TOKEN_RE = re.compile(
+    r'''
+    (?P<lparen>\()
+    | (?P<rparen>\))
+    | (?P<neg>-)?(?:(?P<field>[A-Za-z]+):)?(?:"(?P<phrase>[^"]*)"?|(?P<word>[^\s()"]+))
+    ''',
+    re.VERBOSE,
+)
+_OPERATORS = {'AND', 'OR', 'NOT'}
+
+
+def _fts_phrase(text):
+    return '"' + text.replace('"', '') + '"'
+
+
+def build_candidate_query(text):
+    """
+    Translate recruiter query syntax into a valid FTS5 expression.
+
+    Unknown or dangling syntax is dropped rather than raising, so any input
+    produces either a query or ``None``.
+    """
+    parts = []
+    skip_next = False
+
+    def last_is_operand():
+        return bool(parts) and parts[-1] not in _OPERATORS and parts[-1] != '('
+
+    for m in _QUERY_TOKEN_RE.finditer(text or ''):
+        if m.group('lparen'):
+            if last_is_operand():
+                parts.append('AND')
+            parts.append('(')
+            continue
+        if m.group('rparen'):
+            while parts and parts[-1] in _OPERATORS:
+                parts.pop()
+            if parts and parts[-1] == '(':
+                parts.pop()
+            elif parts.count('(') > parts.count(')'):
+                parts.append(')')
+            continue
+
+        word = m.group('word')
+        if word is not None and not m.group('field') and not m.group('neg') and word in _OPERATORS:
+            if word == 'NOT' and parts and parts[-1] in ('AND', 'OR'):
+                parts[-1] = 'NOT'
+            elif last_is_operand():
+                parts.append(word)
+            elif word == 'NOT':
+                # FTS5 NOT is binary; a leading exclusion has nothing to
+                # exclude from, so drop the excluded term instead of
+                # searching for it.
+                skip_next = True
+            continue
+
+        term = m.group('phrase') if m.group('phrase') is not None else word
+        if not term or not term.strip():
+            continue
+        if skip_next:
+            skip_next = False
+            continue
+        operand = _fts_phrase(term)
+        field = FIELD_ALIASES.get((m.group('field') or '').lower())
+        if field:
+            operand = f'{field} : {operand}'
+        elif m.group('field'):
+            # Unknown field prefix (e.g. a URL scheme): search the whole token
+            operand = _fts_phrase(f"{m.group('field')}:{term}")
+
+        if m.group('neg'):
+            if not last_is_operand():
+                continue  # leading exclusion, see NOT above
+            parts.append('NOT')
+        elif last_is_operand():
+            parts.append('AND')
+        parts.append(operand)
+
+    while parts and (parts[-1] in _OPERATORS or parts[-1] == '('):
+        parts.pop()
+    parts.extend(')' * (parts.count('(') - parts.count(')')))
+    return ' '.join(parts) or None
+
+
+def resume_search_text(parsed):
+    """Flatten parsed resume data (as stored by the signup flow) into indexable text."""
+    if not parsed:
+        return ''
+    chunks = [parsed.get('summary') or parsed.get('extracted_summary') or '']
+    for key in ('work_experience', 'internship_experience'):
+        for exp in parsed.get(key) or []:
+            chunks.extend([
+                exp.get('job_title') or '',
+                exp.get('company') or '',
+                exp.get('description') or '',
+                ' '.join(exp.get('responsibilities') or []),
+            ])
+    for edu in parsed.get('education') or []:
+        chunks.extend([edu.get('degree') or '', edu.get('institution') or '', edu.get('field_of_study') or ''])
+    for key in ('technical_skills', 'soft_skills', 'certifications', 'projects', 'languages'):
+        chunks.extend(parsed.get(key) or [])
+    return '\n'.join(chunk for chunk in chunks if chunk)
+
+
+class CandidateIndex:
+    """Embedded FTS5 index of developer profiles, one SQLite connection per thread."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._local = threading.local()
+
+    @property
+    def conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=20)
+            if self.path != ':memory:':
+                conn.execute('PRAGMA journal_mode = wal')
+                conn.execute('PRAGMA synchronous = normal')
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def index_profile(self, profile, resume=None):
+        """
+        Add or replace a profile. ``resume`` is parsed resume data; when it is
+        ``None`` the resume text already in the index is kept.
+        """
+        skills = [str(s).strip().lower() for s in (profile.skills or []) if str(s).strip()]
+        skills = list(dict.fromkeys(skills))
+        location = (profile.location or '').strip()
+
+        conn = self.conn
+        with conn:
+            if resume is None:
+                row = conn.execute(
+                    'SELECT resume FROM candidate_fts WHERE rowid = ?', (profile.pk,)
+                ).fetchone()
+                resume_text = row[0] if row else ''
+            else:
+                resume_text = resume_search_text(resume)
+
+            conn.execute('DELETE FROM candidate_fts WHERE rowid = ?', (profile.pk,))
+            conn.execute(
+                'INSERT INTO candidate_fts(rowid, title, skills, location, summary, resume) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (profile.pk, profile.title or '', ', '.join(skills), location,
+                 profile.summary or '', resume_text),
+            )
+            conn.execute(
+                'INSERT OR REPLACE INTO candidate(profile_id, location, updated_at) VALUES (?, ?, ?)',
+                (profile.pk, location, time.time()),
+            )
+            conn.execute('DELETE FROM candidate_skill WHERE profile_id = ?', (profile.pk,))
+            conn.executemany(
+                'INSERT INTO candidate_skill(profile_id, skill) VALUES (?, ?)',
+                [(profile.pk, skill) for skill in skills],
+            )
+
+    def remove_profile(self, profile_id):
+        conn = self.conn
+        with conn:
+            conn.execute('DELETE FROM candidate_fts WHERE rowid = ?', (profile_id,))
+            conn.execute('DELETE FROM candidate WHERE profile_id = ?', (profile_id,))
+            conn.execute('DELETE FROM candidate_skill WHERE profile_id = ?', (profile_id,))
+
+    def indexed_ids(self):
+        return {row[0] for row in self.conn.execute('SELECT profile_id FROM candidate')}
+
+    def search(self, query='', skill=None, location=None, limit=20, offset=0, facet_limit=15):
+        """
+        Return ``{'total', 'results', 'facets'}`` for a query.
+
+        ``results`` is a list of ``{'profile_id', 'score', 'snippet'}`` ordered
+        by relevance; ``facets`` holds ``(value, count)`` pairs for skills and
+        locations over the whole matching set (not just the returned page).
+        """
+        fts_query = build_candidate_query(query)
+
+        # The filtered hit set, shared by the page, the total and the facets
+        if fts_query:
+            weights = ', '.join(str(w) for w in COLUMN_WEIGHTS.values())
+            hits_sql = (
+                f'SELECT rowid AS profile_id, bm25(candidate_fts, {weights}) AS rank '
+                'FROM candidate_fts WHERE candidate_fts MATCH ?'
+            )
+            params = [fts_query]
+        else:
+            hits_sql = 'SELECT profile_id, -updated_at AS rank FROM candidate'
+            params = []
+        filters = []
+        if skill:
+            filters.append('profile_id IN (SELECT profile_id FROM candidate_skill WHERE skill = ?)')
+            params.append(skill.strip().lower())
+        if location:
+            filters.append('profile_id IN (SELECT profile_id FROM candidate WHERE location = ? COLLATE NOCASE)')
+            params.append(location.strip())
+        where = f" WHERE {' AND '.join(filters)}" if filters else ''
+        cte = f'WITH hits AS (SELECT profile_id, rank FROM ({hits_sql}){where})'
+
+        conn = self.conn
+        try:
+            total = conn.execute(f'{cte} SELECT COUNT(*) FROM hits', params).fetchone()[0]
+            rows = conn.execute(
+                f'{cte} SELECT profile_id, rank FROM hits ORDER BY rank LIMIT ? OFFSET ?',
+                params + [limit, offset],
+            ).fetchall()
+            skill_facets = conn.execute(
+                f'{cte} SELECT skill, COUNT(*) AS n FROM candidate_skill '
+                'WHERE profile_id IN (SELECT profile_id FROM hits) '
+                'GROUP BY skill ORDER BY n DESC, skill LIMIT ?',
+                params + [facet_limit],
+            ).fetchall()
+            location_facets = conn.execute(
+                f"{cte} SELECT location, COUNT(*) AS n FROM candidate "
+                "WHERE location != '' AND profile_id IN (SELECT profile_id FROM hits) "
+                'GROUP BY location COLLATE NOCASE ORDER BY n DESC, location LIMIT ?',
+                params + [facet_limit],
+            ).fetchall()
+            snippets = {}
+            if fts_query and rows:
+                # Highlighting is only worth computing for the page being shown
+                page_ids = [pid for pid, _ in rows]
+                snippets = dict(conn.execute(
+                    f"SELECT rowid, snippet(candidate_fts, -1, '{_MARK_OPEN}', '{_MARK_CLOSE}', ' … ', 16) "
+                    f"FROM candidate_fts WHERE candidate_fts MATCH ? "
+                    f"AND rowid IN ({', '.join('?' * len(page_ids))})",
+                    [fts_query] + page_ids,
+                ).fetchall())
+        except sqlite3.OperationalError:
+            # Should not happen for queries from build_candidate_query, but a
+            # malformed query must never turn into a server error.
+            return {'total': 0, 'results': [], 'facets': {'skills': [], 'locations': []}}
+
+        return {
+            'total': total,
+            'results': [
+                {'profile_id': pid, 'score': -rank, 'snippet': _render_snippet(snippets.get(pid))}
+                for pid, rank in rows
+            ],
+            'facets': {'skills': skill_facets, 'locations': location_facets},
+        }
+
+
+def _render_snippet(snippet):
+    if not snippet:
+        return ''
+    html = escape(snippet).replace(_MARK_OPEN, '<mark>').replace(_MARK_CLOSE, '</mark>')
+    return mark_safe(html)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_candidate_index():
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = CandidateIndex(settings.CANDIDATE_INDEX_PATH)
+    return _index
@@ -0,0 +1,42 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from jobs.text_similarity import PROFILE, refresh_vectors, remove_vectors
+
+from .models import DeveloperProfile, ParsedResumeRecord
+from .search import get_candidate_index
+
+
+@receiver(post_save, sender=DeveloperProfile)
+def index_developer_profile(sender, instance, **kwargs):
+    """Keep the candidate search index in step with profile edits."""
+    transaction.on_commit(lambda: get_candidate_index().index_profile(instance))
+
+
+@receiver(post_delete, sender=DeveloperProfile)
+def unindex_developer_profile(sender, instance, **kwargs):
+    profile_id = instance.pk
+    transaction.on_commit(lambda: get_candidate_index().remove_profile(profile_id))
+
+
+@receiver(post_save, sender=DeveloperProfile)
+def vectorise_developer_profile(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Refresh the profile's description-similarity vector when its title, summary or skills may have changed."""
+    if raw or (update_fields is not None and not {'title', 'summary', 'skills'} & set(update_fields)):
+        return
+    transaction.on_commit(lambda: refresh_vectors(PROFILE, [instance]))
+
+
+@receiver(post_delete, sender=DeveloperProfile)
+def remove_developer_profile_vector(sender, instance, **kwargs):
+    profile_id = instance.pk
+    transaction.on_commit(lambda: remove_vectors(PROFILE, [profile_id]))
+
+
+@receiver(post_save, sender=ParsedResumeRecord)
+def index_parsed_resume(sender, instance, **kwargs):
+    """Add the resume text to the profile's index entry."""
+    transaction.on_commit(
+        lambda: get_candidate_index().index_profile(instance.profile, resume=instance.as_parsed_data())
+    )
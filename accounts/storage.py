@@ -0,0 +1,98 @@
+"""
+Content-addressed storage for uploaded resumes.
+
+An upload is hashed (SHA-256) while it is streamed to disk, then stored once
+under ``resumes/blobs/<first two hex digits>/<digest><ext>``, where ext is
+the upload's extension if it is one of RESUME_EXTENSIONS. Identical
+uploads share a single file, and the returned storage name can be assigned
+straight to a FileField, so the bytes are never copied a second time.
+
+Blobs are never deleted when a draft or profile goes away, since another one
+may point at the same file; ``manage.py gc_resume_blobs`` removes the ones
+nothing references any more. This works on the local filesystem storage
+(MEDIA_ROOT), which the parser also needs to read the file.
+"""
+import hashlib
+import os
+import tempfile
+import time
+
+from django.core.files.storage import default_storage
+
+BLOB_DIR = 'resumes/blobs'
+PARTIAL_SUFFIX = '.part'
+
+# Extensions kept on a blob's name; any other is dropped, so the name always
+# fits the 100 characters of DeveloperProfile.resume
+RESUME_EXTENSIONS = ('.pdf', '.doc', '.docx')
+
+
+def blob_name(digest, filename):
+    """Storage name for a blob with the given hex digest, keeping the upload's extension if it is a resume's"""
+    ext = os.path.splitext(filename or '')[1].lower()
+    if ext not in RESUME_EXTENSIONS:
+        ext = ''
+    return f'{BLOB_DIR}/{digest[:2]}/{digest}{ext}'
+
+
+def store_upload(uploaded_file, storage=default_storage):
+    """Stream an uploaded file into blob storage and return its storage name"""
+    blob_root = storage.path(BLOB_DIR)
+    os.makedirs(blob_root, exist_ok=True)
+
+    # Write to a private partial file in the same directory tree, so the
+    # final rename is atomic and a half-written blob is never visible.
+    fd, partial_path = tempfile.mkstemp(dir=blob_root, suffix=PARTIAL_SUFFIX)
+    try:
+        sha256 = hashlib.sha256()
+        with os.fdopen(fd, 'wb') as destination:
+            for chunk in uploaded_file.chunks():
+                sha256.update(chunk)
+                destination.write(chunk)
+
+        name = blob_name(sha256.hexdigest(), uploaded_file.name)
+        path = storage.path(name)
+        if os.path.exists(path):
+            os.remove(partial_path)  # same content already stored
+            # Reused blobs count as fresh, so garbage collection leaves them
+            # alone until the draft referencing them is saved
+            os.utime(path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(partial_path, path)
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+    return name
+
+
+def iter_blobs(storage=default_storage):
+    """Yield ``(name, size, modified_timestamp)`` for every stored blob and partial upload"""
+    blob_root = storage.path(BLOB_DIR)
+    for dirpath, _, filenames in os.walk(blob_root):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            stat = os.stat(path)
+            name = os.path.relpath(path, storage.path('')).replace(os.sep, '/')
+            yield name, stat.st_size, stat.st_mtime
+
+
+def collect_garbage(referenced, min_age_seconds=3600, dry_run=False, storage=default_storage):
+    """
+    Delete blobs (and abandoned partial uploads) not in ``referenced``.
+
+    Files younger than ``min_age_seconds`` are kept, so an upload that is
+    stored but not yet attached to its signup draft is not collected.
+    Returns ``(files_deleted, bytes_freed)``.
+    """
+    cutoff = time.time() - min_age_seconds
+    deleted = freed = 0
+    for name, size, modified in list(iter_blobs(storage)):
+        if name in referenced or modified > cutoff:
+            continue
+        if not dry_run:
+            storage.delete(name)
+        deleted += 1
+        freed += size
+    return deleted, freed
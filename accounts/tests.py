@@ -1,3 +1,19 @@
-from django.test import TestCase
+from django.test import SimpleTestCase
 
-# Create your tests here.
+from .models import DeveloperProfile
+from .storage import blob_name
+
+DIGEST = 'ab' * 32
+
+
+class BlobNameTests(SimpleTestCase):
+    def test_keeps_resume_extensions(self):
+        self.assertEqual(blob_name(DIGEST, 'My CV.PDF'), f'resumes/blobs/ab/{DIGEST}.pdf')
+        self.assertEqual(blob_name(DIGEST, 'cv.docx'), f'resumes/blobs/ab/{DIGEST}.docx')
+
+    def test_drops_other_extensions(self):
+        max_length = DeveloperProfile._meta.get_field('resume').max_length
+        for filename in ('cv', 'cv.exe', 'cv.' + 'x' * 200):
+            name = blob_name(DIGEST, filename)
+            self.assertEqual(name, f'resumes/blobs/ab/{DIGEST}')
+            self.assertLessEqual(len(name), max_length)
@@ -1,18 +1,86 @@
+import asyncio
+import inspect
+import logging
+import time
+from functools import lru_cache, wraps
+
 import requests
+from django.conf import settings
 
-def get_github_data(username):
-    user_url = f'https://api.github.com/users/{username}'
-    repos_url = f'https://api.github.com/users/{username}/repos?per_page=100'
+from smarthire import metrics
 
-    user_res = requests.get(user_url)
-    repos_res = requests.get(repos_url)
+logger = logging.getLogger(__name__)
 
-    if user_res.status_code != 200 or repos_res.status_code != 200:
-        return {}
+EXTERNAL_API_SECONDS = metrics.histogram(
+    'smarthire_external_api_seconds', 'Time spent in calls to external APIs', ['api'],
+)
+EXTERNAL_API_ERRORS = metrics.counter(
+    'smarthire_external_api_errors', 'External API calls that raised an exception', ['api'],
+)
+
+BROWSER_HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+
+def external_api(api):
+    """Time calls to an external API and count the ones that raise (sync or async)"""
+    def decorator(func):
+        errors = EXTERNAL_API_ERRORS.labels(api=api)
+
+        if inspect.iscoroutinefunction(func):
+            seconds = EXTERNAL_API_SECONDS.labels(api=api)
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                except Exception:
+                    errors.inc()
+                    raise
+                finally:
+                    seconds.observe(time.perf_counter() - started)
+            return async_wrapper
+
+        timed_func = metrics.timed(EXTERNAL_API_SECONDS, api=api)(func)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return timed_func(*args, **kwargs)
+            except Exception:
+                errors.inc()
+                raise
+        return wrapper
+    return decorator
+
+
+@lru_cache(maxsize=None)
+def _ssl_context():
+    import httpx
+
+    # Loading the CA bundle takes ~40ms, far more than the client itself
+    return httpx.create_ssl_context()
+
+
+def external_api_client():
+    """
+    httpx.AsyncClient for the async (aget_*) helpers. Use one per request with
+    ``async with``: calls to the same host then share a keep-alive connection.
+    """
+    import httpx  # only the async views need it
+
+    return httpx.AsyncClient(
+        timeout=settings.EXTERNAL_API_TIMEOUT, headers=BROWSER_HEADERS, verify=_ssl_context(),
+    )
+
+
+# ---------- GitHub ----------
+def github_urls(username):
+    base = settings.GITHUB_API_URL.rstrip('/')
+    return f'{base}/users/{username}', f'{base}/users/{username}/repos?per_page=100'
 
-    user_json = user_res.json()
-    repos = repos_res.json()
 
+def summarize_github(user_json, repos):
     # Sort repos by stars (fallback: updated date)
     repos_sorted = sorted(
         repos,
@@ -54,55 +122,100 @@ def get_github_data(username):
         'top_repositories': top_repositories,
     }
 
-import requests
 
-def get_leetcode_data(username):
-    # --- GraphQL for profile, stats, categories ---
-    graphql_url = 'https://leetcode.com/graphql'
-    graphql_query = {
-        "query": """
-        query getUserProfile($username: String!) {
-          matchedUser(username: $username) {
-            submitStats {
-              acSubmissionNum {
-                difficulty
-                count
-              }
-            }
-            profile {
-              ranking
-              reputation
-            }
-            tagProblemCounts {
-              advanced {
-                tagName
-                problemsSolved
-              }
-              intermediate {
-                tagName
-                problemsSolved
-              }
-              fundamental {
-                tagName
-                problemsSolved
-              }
-            }
-          }
-        }
-        """,
-        "variables": {"username": username}
+@external_api('github')
+def get_github_data(username):
+    user_url, repos_url = github_urls(username)
+
+    user_res = requests.get(user_url, timeout=settings.EXTERNAL_API_TIMEOUT)
+    repos_res = requests.get(repos_url, timeout=settings.EXTERNAL_API_TIMEOUT)
+
+    if user_res.status_code != 200 or repos_res.status_code != 200:
+        return {}
+
+    return summarize_github(user_res.json(), repos_res.json())
+
+
+@external_api('github')
+async def aget_github_data(username, client):
+    """get_github_data on an httpx.AsyncClient; the two requests run concurrently"""
+    user_url, repos_url = github_urls(username)
+
+    user_res, repos_res = await asyncio.gather(client.get(user_url), client.get(repos_url))
+
+    if user_res.status_code != 200 or repos_res.status_code != 200:
+        return {}
+
+    return summarize_github(user_res.json(), repos_res.json())
+
+
+# ---------- LeetCode ----------
+LEETCODE_PROFILE_QUERY = """
+query getUserProfile($username: String!) {
+  matchedUser(username: $username) {
+    submitStats {
+      acSubmissionNum {
+        difficulty
+        count
+      }
     }
+    profile {
+      ranking
+      reputation
+    }
+    tagProblemCounts {
+      advanced {
+        tagName
+        problemsSolved
+      }
+      intermediate {
+        tagName
+        problemsSolved
+      }
+      fundamental {
+        tagName
+        problemsSolved
+      }
+    }
+  }
+}
+"""
+
+
+def leetcode_submissions_url(username):
+    return f"{settings.LEETCODE_SUBMISSIONS_API_URL.rstrip('/')}/user/{username}/submissions?limit=20"
+
 
-    res = requests.post(graphql_url, json=graphql_query, headers={"User-Agent": "Mozilla/5.0"})
+def leetcode_matched_user(res, username):
+    """The matchedUser object of a profile query response, or None"""
     if res.status_code != 200:
-        print("GraphQL error:", res.text[:200])
-        return {}
+        logger.warning("LeetCode GraphQL error: %s", res.text[:200])
+        return None
 
     data = res.json().get('data', {}).get('matchedUser')
     if not data:
-        print(f"⚠️ No matchedUser found for {username}")
-        return {}
+        logger.warning("No LeetCode matchedUser found for %s", username)
+        return None
+    return data
+
+
+def leetcode_recent_submissions(res):
+    """Latest 10 submissions from the submissions API response (or the exception it raised)"""
+    if isinstance(res, Exception):
+        logger.warning("Error fetching LeetCode submissions: %s", res)
+        return []
+    if res.status_code != 200:
+        logger.warning("LeetCode submissions API failed: %s", res.status_code)
+        return []
+    try:
+        # The API directly returns a list, no "submission" key
+        return res.json()[:10]
+    except Exception as e:
+        logger.warning("Error fetching LeetCode submissions: %s", e)
+        return []
 
+
+def summarize_leetcode(data, recent_subs):
     # ✅ Submissions stats
     submissions = data['submitStats']['acSubmissionNum']
     stats = {}
@@ -127,22 +240,6 @@ def get_leetcode_data(username):
         for c in (data.get("tagProblemCounts") or {}).get(section, []):
             categories.append({"tag": c["tagName"], "solved": c["problemsSolved"]})
 
-    # --- External API for recent submissions ---
-    recent_subs = []
-    try:
-      api_url = f"https://leetcode-api-pied.vercel.app/user/{username}/submissions?limit=20"
-      subs_res = requests.get(api_url, headers={"Accept": "application/json", "User-Agent": "Mozilla/5.0"})
-    
-      if subs_res.status_code == 200:
-        subs_json = subs_res.json()
-        # The API directly returns a list, no "submission" key
-        recent_subs = subs_json[:10]  # top 10
-      else:
-        print("⚠️ Submissions API failed:", subs_res.status_code)
-    except Exception as e:
-      print("⚠️ Error fetching submissions:", e)
-
-
     return {
         # original fields (signup use)
         'easy': stats.get('easy', 0),
@@ -160,14 +257,57 @@ def get_leetcode_data(username):
     }
 
 
+@external_api('leetcode')
+def get_leetcode_data(username):
+    # --- GraphQL for profile, stats, categories ---
+    query = {"query": LEETCODE_PROFILE_QUERY, "variables": {"username": username}}
+    res = requests.post(
+        settings.LEETCODE_GRAPHQL_URL, json=query, headers=BROWSER_HEADERS, timeout=settings.EXTERNAL_API_TIMEOUT,
+    )
+    data = leetcode_matched_user(res, username)
+    if not data:
+        return {}
+
+    # --- External API for recent submissions ---
+    try:
+        subs_res = requests.get(
+            leetcode_submissions_url(username),
+            headers={"Accept": "application/json", **BROWSER_HEADERS},
+            timeout=settings.EXTERNAL_API_TIMEOUT,
+        )
+    except Exception as e:
+        subs_res = e
+
+    return summarize_leetcode(data, leetcode_recent_submissions(subs_res))
+
+
+@external_api('leetcode')
+async def aget_leetcode_data(username, client):
+    """get_leetcode_data on an httpx.AsyncClient; profile and submissions are fetched concurrently"""
+    query = {"query": LEETCODE_PROFILE_QUERY, "variables": {"username": username}}
+    res, subs_res = await asyncio.gather(
+        client.post(settings.LEETCODE_GRAPHQL_URL, json=query),
+        client.get(leetcode_submissions_url(username), headers={"Accept": "application/json"}),
+        return_exceptions=True,
+    )
+    if isinstance(res, Exception):
+        raise res
+    data = leetcode_matched_user(res, username)
+    if not data:
+        return {}
+
+    return summarize_leetcode(data, leetcode_recent_submissions(subs_res))
+
+
 import re
-import fitz  # PyMuPDF
 
 TECH_KEYWORDS = ["python", "java", "c++", "c#", "django", "flask", "react", "node.js",
                  "sql", "postgresql", "mongodb", "html", "css", "javascript", "aws",
                  "docker", "kubernetes", "git"]
 
 def extract_text_from_pdf(path):
+    import fitz  # PyMuPDF, imported on first use as it is slow to load
+
     text = ""
     doc = fitz.open(path)
     for page in doc:
@@ -1,36 +1,50 @@
+import asyncio
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect
 from django.contrib.auth import authenticate, login, logout
 from .models import User
 from django.contrib import messages
 from django.contrib.auth import get_user_model
-from .models import DeveloperProfile
-from django.core.files import File
+from .models import DeveloperProfile, ParsedResumeRecord, SignupDraft
 from django.conf import settings
-import os
 import requests
-from .utils import get_github_data, get_leetcode_data  # import above functions
+from .utils import aget_github_data, aget_leetcode_data, external_api_client
 import re
 from django.db import transaction
 from .models import RecruiterProfile
+from .storage import store_upload
 from .utils import extract_skills_from_resume
-from resume import ResumeParser  # Import the resume parser
+from resume import get_resume_parser  # Import the resume parser
+from smarthire.profiling import span
+import logging
 
 # password for developer Password123#
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
 
 def developer_signup(request):
     return render(request,'developer/signup_1.html')
 
-# Helper: Store file temporarily
-def handle_uploaded_file(f):
-    tmp_dir = os.path.join(settings.MEDIA_ROOT, 'tmp')
-    os.makedirs(tmp_dir, exist_ok=True)
-    tmp_path = os.path.join(tmp_dir, f.name)
-    with open(tmp_path, 'wb+') as destination:
-        for chunk in f.chunks():
-            destination.write(chunk)
-    return tmp_path
+# Helper: Current signup draft, or None. Only loaded by the step that uses it.
+def get_signup_draft(request):
+    draft_id = request.session.get('signup_draft_id')
+    if not draft_id:
+        return None
+    return SignupDraft.objects.filter(pk=draft_id).first()
+
+# Helper: Async get_signup_draft, for the async signup review step
+async def aget_signup_draft(request):
+    draft_id = await request.session.aget('signup_draft_id')
+    if not draft_id:
+        return None
+    return await SignupDraft.objects.filter(pk=draft_id).afirst()
+
+# Helper: Drop the current signup draft (its resume blob is left for gc_resume_blobs)
+def discard_signup_draft(request):
+    draft_id = request.session.pop('signup_draft_id', None)
+    if draft_id:
+        SignupDraft.objects.filter(pk=draft_id).delete()
 
 def signup_step1(request):
     if request.method == 'POST':
@@ -57,79 +71,26 @@ def signup_step1(request):
         # Store resume file temporarily and parse it
         resume_file = request.FILES.get('resume')
         if resume_file:
-            tmp_path = handle_uploaded_file(resume_file)
-            request.session['resume_path'] = tmp_path
-            request.session['resume_name'] = resume_file.name
-            
+            discard_signup_draft(request)  # from an earlier attempt
+            # Stored once under its content hash; the profile reuses this file
+            draft = SignupDraft(resume=store_upload(resume_file))
+
             # Parse the resume immediately after upload
             try:
-                parser = ResumeParser()
-                parsed_resume = parser.parse_resume(tmp_path)
-                
-                # Store parsed data in session
-                request.session['parsed_resume_data'] = {
-                    'skills': parsed_resume.skills or [],
-                    'technical_skills': parsed_resume.technical_skills or [],
-                    'soft_skills': parsed_resume.soft_skills or [],
-                    'work_experience': [
-                        {
-                            'job_title': exp.job_title,
-                            'company': exp.company,
-                            'duration': exp.duration,
-                            'start_date': exp.start_date,
-                            'end_date': exp.end_date,
-                            'description': exp.description,
-                            'responsibilities': exp.responsibilities or [],
-                            'experience_type': exp.experience_type,
-                            'location': exp.location,
-                            'is_current': exp.is_current
-                        } for exp in (parsed_resume.work_experience or [])
-                    ],
-                    'internship_experience': [
-                        {
-                            'job_title': exp.job_title,
-                            'company': exp.company,
-                            'duration': exp.duration,
-                            'start_date': exp.start_date,
-                            'end_date': exp.end_date,
-                            'description': exp.description,
-                            'responsibilities': exp.responsibilities or [],
-                            'experience_type': exp.experience_type,
-                            'location': exp.location,
-                            'is_current': exp.is_current
-                        } for exp in (parsed_resume.internship_experience or [])
-                    ],
-                    'education': [
-                        {
-                            'degree': edu.degree,
-                            'institution': edu.institution,
-                            'year': edu.year,
-                            'gpa': edu.gpa,
-                            'field_of_study': edu.field_of_study
-                        } for edu in (parsed_resume.education or [])
-                    ],
-                    'years_of_experience': parsed_resume.years_of_experience or 0,
-                    'total_internship_months': parsed_resume.total_internship_months or 0,
-                    'contact_info': {
-                        'name': parsed_resume.contact_info.name,
-                        'email': parsed_resume.contact_info.email,
-                        'phone': parsed_resume.contact_info.phone,
-                        'address': parsed_resume.contact_info.address,
-                        'linkedin': parsed_resume.contact_info.linkedin,
-                        'github': parsed_resume.contact_info.github,
-                        'website': parsed_resume.contact_info.website
-                    },
-                    'extracted_summary': parsed_resume.summary,
-                    'certifications': parsed_resume.certifications or [],
-                    'projects': parsed_resume.projects or [],
-                    'languages': parsed_resume.languages or []
-                }
-                
+                with span('parser'):
+                    parser = get_resume_parser(settings.RESUME_PARSER_NLP_PROFILE)
+                    parsed_resume = parser.parse_resume(draft.resume.path)
+
+                # Keep the parsed data in the draft; the session only references it
+                draft.parsed_resume = parsed_resume.to_dict()
+
                 messages.success(request, "Resume parsed successfully! Review the extracted information in the next steps.")
-                
+
             except Exception as e:
                 messages.warning(request, f"Resume uploaded but parsing failed: {str(e)}. You can still continue with manual entry.")
-                request.session['parsed_resume_data'] = {}
+
+            draft.save()
+            request.session['signup_draft_id'] = draft.pk
 
         request.session.modified = True
         return redirect('signup_step2')
@@ -195,11 +156,76 @@ def extract_leetcode_username(url):
         return match.group(1)
     return None
 
-def signup_step3(request):
+# Helper: Create the developer account from the signup session and draft (step 3 POST)
+def create_developer_account(request):
     signup_data = request.session.get('signup_data', {})
-    parsed_resume_data = request.session.get('parsed_resume_data', {})
-    resume_name = request.session.get('resume_name', None)
-    resume_path = request.session.get('resume_path', None)
+    draft = get_signup_draft(request)
+    parsed_resume_data = draft.parsed_resume if draft else {}
+    github_url = signup_data.get('github_url')
+    leetcode_url = signup_data.get('leetcode_url')
+
+    # Check if email exists
+    if User.objects.filter(email=signup_data['email']).exists():
+        messages.error(request, "Email already registered. Please log in.")
+        return redirect('signup_step1')
+
+    try:
+        with transaction.atomic():
+            # Create user
+            user = User.objects.create_user(
+                email=signup_data['email'],
+                password=signup_data['password'],
+                user_type='developer'
+            )
+
+            # Prepare enhanced profile data with parsed resume information
+            profile_data = {
+                'user': user,
+                'username': signup_data['username'],
+                'phone': signup_data.get('phone') or parsed_resume_data.get('contact_info', {}).get('phone', ''),
+                'location': signup_data['location'],
+                'title': signup_data['title'],
+                'experience': signup_data['experience'],
+                'salary': signup_data.get('salary'),
+                'summary': signup_data.get('summary') or parsed_resume_data.get('summary') or '',
+                'github_url': github_url,
+                'leetcode_url': leetcode_url,
+                'skills': parsed_resume_data.get('skills', [])
+            }
+
+            # Point the profile at the already stored resume blob, if any
+            if draft and draft.resume:
+                profile_data['resume'] = draft.resume.name
+
+            profile = DeveloperProfile.objects.create(**profile_data)
+
+            # Keep the full parser output (experience, education, years...)
+            if parsed_resume_data:
+                ParsedResumeRecord.from_parsed_data(profile, parsed_resume_data).save()
+
+            # Auto-login
+            login(request, user)
+
+            # Cleanup session and draft
+            request.session.pop('signup_data', None)
+            discard_signup_draft(request)
+
+            messages.success(request, "Account created successfully with parsed resume data!")
+            return redirect('developer:dashboard')
+            
+    except Exception as e:
+        messages.error(request, f"Error creating account: {str(e)}")
+        return redirect('signup_step1')
+
+
+# Async, so that a worker is not blocked while GitHub and LeetCode are queried
+async def signup_step3(request):
+    if request.method == 'POST':
+        return await sync_to_async(create_developer_account)(request)
+
+    signup_data = await request.session.aget('signup_data', {})
+    draft = await aget_signup_draft(request)
+    parsed_resume_data = draft.parsed_resume if draft else {}
 
     # Fetch URLs from session
     github_url = signup_data.get('github_url')
@@ -209,73 +235,17 @@ def signup_step3(request):
     github_username = extract_github_username(github_url) if github_url else None
     leetcode_username = extract_leetcode_username(leetcode_url) if leetcode_url else None
 
-    # Fetch GitHub and LeetCode data
-    github_data = get_github_data(github_username) if github_username else {}
-    leetcode_data = get_leetcode_data(leetcode_username) if leetcode_username else {}
+    # Fetch GitHub and LeetCode data concurrently
+    async def nothing():
+        return {}
 
-    if request.method == 'POST':
-        # Check if email exists
-        if User.objects.filter(email=signup_data['email']).exists():
-            messages.error(request, "Email already registered. Please log in.")
-            return redirect('signup_step1')
-
-        try:
-            with transaction.atomic():
-                # Create user
-                user = User.objects.create_user(
-                    email=signup_data['email'],
-                    password=signup_data['password'],
-                    user_type='developer'
-                )
-
-                # Prepare enhanced profile data with parsed resume information
-                profile_data = {
-                    'user': user,
-                    'username': signup_data['username'],
-                    'phone': signup_data.get('phone') or parsed_resume_data.get('contact_info', {}).get('phone', ''),
-                    'location': signup_data['location'],
-                    'title': signup_data['title'],
-                    'experience': signup_data['experience'],
-                    'salary': signup_data.get('salary'),
-                    'summary': signup_data.get('summary') or parsed_resume_data.get('extracted_summary', ''),
-                    'github_url': github_url,
-                    'leetcode_url': leetcode_url,
-                    'skills': parsed_resume_data.get('skills', [])
-                }
-
-                # Create profile with resume file if available
-                if resume_path and os.path.exists(resume_path):
-                    with open(resume_path, 'rb') as f:
-                        profile = DeveloperProfile.objects.create(**profile_data)
-                        profile.resume.save(resume_name, File(f), save=True)
-                else:
-                    profile = DeveloperProfile.objects.create(**profile_data)
-
-                # Store additional parsed data in profile's extended fields (if you have them)
-                # You might want to add these fields to your DeveloperProfile model:
-                # - parsed_work_experience (JSONField)
-                # - parsed_education (JSONField)
-                # - years_of_experience (IntegerField)
-                # - total_internship_months (IntegerField)
-                
-                # Auto-login
-                login(request, user)
-
-                # Cleanup session and temp file
-                request.session.pop('signup_data', None)
-                request.session.pop('resume_name', None)
-                request.session.pop('resume_path', None)
-                request.session.pop('parsed_resume_data', None)
-                
-                if resume_path and os.path.exists(resume_path):
-                    os.remove(resume_path)
-
-                messages.success(request, "Account created successfully with parsed resume data!")
-                return redirect('developer:dashboard')
-                
-        except Exception as e:
-            messages.error(request, f"Error creating account: {str(e)}")
-            return redirect('signup_step1')
+    async with external_api_client() as client:
+        results = await asyncio.gather(
+            aget_github_data(github_username, client) if github_username else nothing(),
+            aget_leetcode_data(leetcode_username, client) if leetcode_username else nothing(),
+            return_exceptions=True,
+        )
+    github_data, leetcode_data = [{} if isinstance(result, Exception) else result for result in results]
 
     # Merge signup data with parsed resume data for display
     display_data = signup_data.copy()
@@ -284,10 +254,10 @@ def signup_step3(request):
         # Enhance display data with parsed information
         if not display_data.get('phone') and contact_info.get('phone'):
             display_data['suggested_phone'] = contact_info['phone']
-        if not display_data.get('summary') and parsed_resume_data.get('extracted_summary'):
-            display_data['suggested_summary'] = parsed_resume_data['extracted_summary']
+        if not display_data.get('summary') and parsed_resume_data.get('summary'):
+            display_data['suggested_summary'] = parsed_resume_data['summary']
 
-    return render(request, 'developer/signup_3.html', {
+    return await sync_to_async(render)(request, 'developer/signup_3.html', {
         'data': display_data,
         'github_data': github_data,
         'leetcode_data': leetcode_data,
@@ -304,7 +274,7 @@ def developer_login(request):
         email = request.POST.get('email')
         password = request.POST.get('password')
 
-        print(f"Login attempt - Email: {email}")
+        logger.debug("Login attempt - Email: %s", email)
 
         user = authenticate(request, email=email, password=password)
 
@@ -317,7 +287,7 @@ def developer_login(request):
             #     if profile.resume and not profile.skills:
             #         # If skills are empty, try to parse resume again
             #         resume_path = profile.resume.path
-            #         parser = ResumeParser()
+            #         parser = get_resume_parser(settings.RESUME_PARSER_NLP_PROFILE)
             #         parsed_resume = parser.parse_resume(resume_path)
                     
             #         # Update profile with parsed skills
@@ -360,7 +330,7 @@ def recruiter_signup1(request):
             user_type='recruiter'
         )
         
-        print(user)
+        logger.debug("Created recruiter user %s", user)
         # Generate unique username for RecruiterProfile
         base_username = f"{first_name.lower()}.{last_name.lower()}"
         username = base_username
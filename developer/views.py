@@ -1,15 +1,22 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.shortcuts import render, get_object_or_404, redirect
+from django.shortcuts import render, get_object_or_404, aget_object_or_404, redirect
 from django.http import JsonResponse
 from django.contrib import messages
 from django.views.decorators.http import require_POST
 from accounts.models import DeveloperProfile
-from accounts.utils import get_github_data, get_leetcode_data
+from accounts.utils import aget_github_data, aget_leetcode_data, external_api, external_api_client
+from jobs.services import record_application
 from jobs.models import Job, Application
 from jobs.views import JobMatchingAI  # Import the AI matching system
+from smarthire.routers import use_replica
 import re
+import asyncio
+import logging
 from datetime import datetime
-import requests
+
+logger = logging.getLogger(__name__)
 
 
 # ---------- Helpers ----------
@@ -44,22 +51,31 @@ def coerce_date(s):
             continue
     return s
 
-def get_leetcode_rating(username):
-    url = 'https://leetcode.com/graphql'
-    query = {
-        "query": """
-        query getContestRating($username: String!) {
-          userContestRanking(username: $username) {
-            rating
-            globalRanking
-            topPercentage
-          }
-        }
-        """,
-        "variables": {"username": username}
-    }
+LEETCODE_RATING_QUERY = """
+query getContestRating($username: String!) {
+  userContestRanking(username: $username) {
+    rating
+    globalRanking
+    topPercentage
+  }
+}
+"""
+
+LEETCODE_DIFFICULTY_QUERY = """
+query getQuestionDetail($titleSlug: String!) {
+  question(titleSlug: $titleSlug) {
+    difficulty
+  }
+}
+"""
+
+@external_api('leetcode_rating')
+async def aget_leetcode_rating(username, client):
+    if not username:
+        return {}
+    query = {"query": LEETCODE_RATING_QUERY, "variables": {"username": username}}
 
-    res = requests.post(url, json=query)
+    res = await client.post(settings.LEETCODE_GRAPHQL_URL, json=query)
     if res.status_code != 200:
         return {}
 
@@ -73,20 +89,11 @@ def get_leetcode_rating(username):
         "top_percent": rating_data.get("topPercentage", 0)
     }
 
-def get_problem_difficulty(title_slug):
-    url = "https://leetcode.com/graphql"
-    query = {
-        "query": """
-        query getQuestionDetail($titleSlug: String!) {
-          question(titleSlug: $titleSlug) {
-            difficulty
-          }
-        }
-        """,
-        "variables": {"titleSlug": title_slug}
-    }
+@external_api('leetcode_problem')
+async def aget_problem_difficulty(title_slug, client):
+    query = {"query": LEETCODE_DIFFICULTY_QUERY, "variables": {"titleSlug": title_slug}}
 
-    res = requests.post(url, json=query, headers={"User-Agent": "Mozilla/5.0"})
+    res = await client.post(settings.LEETCODE_GRAPHQL_URL, json=query)
     if res.status_code != 200:
         return "Easy"  # fallback
 
@@ -96,6 +103,22 @@ def get_problem_difficulty(title_slug):
 
     return data.get("difficulty", "Easy")
 
+async def fetch_profile_data(client, gh_username, lc_username):
+    """
+    Raw GitHub data, LeetCode data and LeetCode contest rating, fetched
+    concurrently. An API that is not linked or fails gives {}.
+    """
+    async def nothing():
+        return {}
+
+    results = await asyncio.gather(
+        aget_github_data(gh_username, client) if gh_username else nothing(),
+        aget_leetcode_data(lc_username, client) if lc_username else nothing(),
+        aget_leetcode_rating(lc_username, client),
+        return_exceptions=True,
+    )
+    return [{} if isinstance(result, Exception) else result for result in results]
+
 
 # ---------- Normalizers ----------
 def build_github_view_model(raw, username):
@@ -144,7 +167,7 @@ def build_github_view_model(raw, username):
         "activity_label": gh_label,
     }
 
-def build_leetcode_view_model(raw, username):
+def build_leetcode_view_model(raw, username, rating_info=None):
     raw = raw or {}
 
     total = raw.get("total_problems_solved", raw.get("totalSolved", 0))
@@ -152,10 +175,8 @@ def build_leetcode_view_model(raw, username):
     medium = raw.get("medium_solved", raw.get("medium", 0))
     hard = raw.get("hard_solved", raw.get("hard", 0))
 
-    
-    # ✅ fetch rating separately
-    rating_info = get_leetcode_rating(username)
-    rating = int(rating_info.get("rating", 0))
+    # ✅ contest rating, fetched separately (aget_leetcode_rating)
+    rating = int((rating_info or {}).get("rating", 0))
 
     solved_progress = pct(total, 3000)  # ~3000 total problems
     rating_progress = pct(rating, 3000)
@@ -182,32 +203,35 @@ def build_leetcode_view_model(raw, username):
 
 
 # ---------- Dashboard View ----------
+# Async, so that a worker is not blocked while the GitHub and LeetCode calls
+# are in flight; ORM access and template rendering go through sync_to_async.
 @login_required
-def dashboard(request):
-    profile = get_object_or_404(DeveloperProfile, user=request.user)
+@use_replica
+async def dashboard(request):
+    user = await request.auser()
+    profile = await aget_object_or_404(DeveloperProfile, user=user)
 
     gh_username = extract_github_username(profile.github_url)
     lc_username = extract_leetcode_username(profile.leetcode_url)
-    print(lc_username)
 
-    try:
-        gh_raw = get_github_data(gh_username) if gh_username else {}
-    except Exception:
-        gh_raw = {}
+    async with external_api_client() as client:
+        gh_raw, lc_raw, rating_info = await fetch_profile_data(client, gh_username, lc_username)
+        leetcode_data = build_leetcode_view_model(lc_raw, lc_username, rating_info)
 
-    try:
-        lc_raw = get_leetcode_data(lc_username) if lc_username else {}
-        print(lc_raw)
-    except Exception:
-        lc_raw = {}
+        # Difficulty of the latest 5 submissions, looked up concurrently
+        latest_subs = leetcode_data.get("recent_submissions", [])[:5]
+        difficulties = await asyncio.gather(
+            *(aget_problem_difficulty(sub["titleSlug"], client) for sub in latest_subs),
+            return_exceptions=True,
+        )
 
     github_data = build_github_view_model(gh_raw, gh_username)
-    leetcode_data = build_leetcode_view_model(lc_raw, lc_username)
 
     # Preprocess recent submissions (latest 5)
     recent_subs = []
-    for sub in leetcode_data.get("recent_submissions", [])[:5]:
-        difficulty = get_problem_difficulty(sub["titleSlug"])  # fetch difficulty dynamically
+    for sub, difficulty in zip(latest_subs, difficulties):
+        if isinstance(difficulty, Exception):
+            difficulty = "Easy"  # same fallback as a failed lookup
 
         difficulty_badge = {
             "chip": difficulty,
@@ -229,7 +253,7 @@ def dashboard(request):
     leetcode_data["recent_submissions"] = recent_subs
 
     # Preprocess categories: sort by problems solved and take top 10
-    total_solved = leetcode_data.get("total_problems_solved", 1)
+    total_solved = leetcode_data.get("total_problems_solved") or 1
     categories = sorted(
         leetcode_data.get("categories", []),
         key=lambda x: x["solved"],
@@ -260,7 +284,7 @@ def dashboard(request):
         "leetcode_performance_label": leetcode_data["performance_label"],
         "code_quality_label": "Good",  # placeholder
     }
-    return render(request, "developer/dashboard_1.html", context)
+    return await sync_to_async(render)(request, "developer/dashboard_1.html", context)
 
 
 # ---------- Job Application Views ----------
@@ -296,11 +320,7 @@ def apply_to_job(request, job_id):
     
     # Create new application
     try:
-        application = Application.objects.create(
-            job=job, 
-            developer=request.user,
-            status='applied'  # Set initial status
-        )
+        application = record_application(job, request.user)
         
         if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
             return JsonResponse({
@@ -316,7 +336,7 @@ def apply_to_job(request, job_id):
         return redirect("developer:applications")
         
     except Exception as e:
-        print(f"Error creating application: {e}")  # Debug log
+        logger.exception("Error creating application: %s", e)
         if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
             return JsonResponse({
                 'success': False, 
@@ -327,24 +347,54 @@ def apply_to_job(request, job_id):
 
 
 @login_required
-def my_applications(request):
+async def my_applications(request):
     """Display user's job applications with real AI-powered analysis"""
-    
+    user = await request.auser()
+
     # Get user profile for AI analysis
     try:
-        profile = DeveloperProfile.objects.get(user=request.user)
+        profile = await DeveloperProfile.objects.select_related('parsed_resume').aget(user=user)
     except DeveloperProfile.DoesNotExist:
-        return render(request, 'developer/application.html', {
+        return await sync_to_async(render)(request, 'developer/application.html', {
             'applications': [],
             'total_applications': 0,
             'under_review': 0,
             'avg_match_score': 0,
             'technical_score': 0,
         })
-    
+
+    # GitHub and LeetCode data is the same for every application, so it is
+    # fetched once, concurrently, before the matching loop
+    gh_username = extract_github_username(profile.github_url)
+    lc_username = extract_leetcode_username(profile.leetcode_url)
+
+    async with external_api_client() as client:
+        gh_raw, lc_raw, rating_info = await fetch_profile_data(client, gh_username, lc_username)
+
+    github_data = build_github_view_model(gh_raw, gh_username)
+    leetcode_data = build_leetcode_view_model(lc_raw, lc_username, rating_info)
+
+    # Calculate profile scores based on real data
+    profile_scores = {
+        'code_quality': min(100, github_data['score'] + 10),  # GitHub score + bonus
+        'activity_level': github_data['contributions_progress'],
+        'project_complexity': min(100, github_data['repos_progress'] + 15),
+        'problem_solving': leetcode_data['solved_progress'],
+        'algorithmic_thinking': leetcode_data['rating_progress'],
+    }
+
+    # Ensure all scores are integers
+    for key in profile_scores:
+        profile_scores[key] = int(profile_scores[key])
+
+    return await sync_to_async(render_applications)(request, user, profile, profile_scores)
+
+
+# Helper: Score each application and render the page (ORM and matching are synchronous)
+def render_applications(request, user, profile, profile_scores):
     # Get user's applications
     applications = Application.objects.filter(
-        developer=request.user
+        developer=user
     ).select_related('job', 'job__recruiter').order_by('-applied_at')
     
     # Initialize AI matching system
@@ -377,37 +427,6 @@ def my_applications(request):
         total_match_scores.append(overall_score)
         technical_scores.append(skill_score)
         
-        # Calculate profile analysis scores based on GitHub and LeetCode data
-        gh_username = extract_github_username(profile.github_url)
-        lc_username = extract_leetcode_username(profile.leetcode_url)
-        
-        # Get GitHub data for profile analysis
-        try:
-            gh_raw = get_github_data(gh_username) if gh_username else {}
-        except:
-            gh_raw = {}
-        
-        try:
-            lc_raw = get_leetcode_data(lc_username) if lc_username else {}
-        except:
-            lc_raw = {}
-        
-        github_data = build_github_view_model(gh_raw, gh_username)
-        leetcode_data = build_leetcode_view_model(lc_raw, lc_username)
-        
-        # Calculate profile scores based on real data
-        profile_scores = {
-            'code_quality': min(100, github_data['score'] + 10),  # GitHub score + bonus
-            'activity_level': github_data['contributions_progress'],
-            'project_complexity': min(100, github_data['repos_progress'] + 15),
-            'problem_solving': leetcode_data['solved_progress'],
-            'algorithmic_thinking': leetcode_data['rating_progress'],
-        }
-        
-        # Ensure all scores are integers
-        for key in profile_scores:
-            profile_scores[key] = int(profile_scores[key])
-        
         processed_applications.append({
             'application': app,
             'company_name': company_name,
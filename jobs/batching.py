@@ -0,0 +1,17 @@
+"""
+Batches of ids for ``IN (...)`` queries.
+
+SQLite limits the number of bound parameters in one statement, so code
+that filters or writes by a list of ids of any length splits it into
+batches of QUERY_BATCH_SIZE.
+"""
+
+# Ids per IN (...) query, below SQLite's bound-parameter limit
+QUERY_BATCH_SIZE = 500
+
+
+def batches(items, size=QUERY_BATCH_SIZE):
+    """Lists of at most ``size`` consecutive items"""
+    items = list(items)
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
@@ -0,0 +1,263 @@
+"""
+Near-duplicate job postings.
+
+A job's title, description and requirements are cut into word shingles
+(SHINGLE_SIZE words in a row) and summarised by a MinHash signature of
+NUM_PERM values: the share of positions where two signatures agree
+estimates the Jaccard similarity of the shingle sets. The signature is cut
+into BANDS bands whose hashes are stored in JobBucket, an indexed table, so
+the jobs that may be duplicates of one are those sharing a bucket with it;
+they are then compared on their full signatures.
+
+Published jobs of the same recruiter and place whose similarity reaches
+DUPLICATE_THRESHOLD form a cluster. Its oldest job is the representative
+and every other member points to it with Job.duplicate_of, so find_jobs
+scores one job per cluster. A job posted again for another city is not a
+duplicate: it is another opening. Clusters are updated when a job is saved
+or deleted (jobs.signals); ``python manage.py dedupe_jobs`` recomputes them
+from scratch, for writes that skipped save() and to split clusters whose
+jobs were edited apart.
+"""
+import hashlib
+
+from django.db import router, transaction
+from django.db.models import Q
+
+from .batching import QUERY_BATCH_SIZE, batches
+from .models import Job, JobBucket
+from .text_similarity import TOKEN_RE
+
+SHINGLE_SIZE = 3
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS  # a pair shares a bucket with probability 1 - (1 - s**ROWS)**BANDS
+
+DUPLICATE_THRESHOLD = 0.8
+
+# Jobs sharing a bucket that are compared with a saved job
+MAX_CANDIDATES = 200
+
+# Seed of the MinHash permutations; changing it invalidates every stored bucket
+MINHASH_SEED = 20240917
+
+DEDUPE_FIELDS = ('recruiter', 'title', 'description', 'requirements', 'status', 'place_id', 'duplicate_of')
+
+
+def shingles(job):
+    """64-bit hashes of the job's word shingles (its words, if it has fewer than SHINGLE_SIZE)"""
+    requirements = sorted({str(skill).strip().lower() for skill in job.requirements or []})
+    text = '\n'.join(filter(None, [job.title, job.description, ' '.join(requirements)])).lower()
+    words = TOKEN_RE.findall(text)
+    size = min(SHINGLE_SIZE, len(words))
+    return {
+        int.from_bytes(hashlib.blake2b(' '.join(words[i:i + size]).encode('utf-8'), digest_size=8).digest(), 'little')
+        for i in range(len(words) - size + 1)
+    } if words else set()
+
+
+_PERMUTATIONS = None
+
+
+def _permutations():
+    """``(a, b)`` uint64 arrays of the multiply-shift hash functions, a odd"""
+    global _PERMUTATIONS
+    if _PERMUTATIONS is None:
+        import numpy as np
+
+        rng = np.random.default_rng(MINHASH_SEED)
+        a = rng.integers(0, 2 ** 64, NUM_PERM, dtype=np.uint64, endpoint=False) | np.uint64(1)
+        b = rng.integers(0, 2 ** 64, NUM_PERM, dtype=np.uint64, endpoint=False)
+        _PERMUTATIONS = (a, b)
+    return _PERMUTATIONS
+
+
+def signature(job):
+    """The job's MinHash signature (NUM_PERM uint32), or None if it has no words"""
+    import numpy as np
+
+    hashes = shingles(job)
+    if not hashes:
+        return None
+    a, b = _permutations()
+    x = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+    return ((a[:, None] * x + b[:, None]) >> np.uint64(32)).astype(np.uint32).min(axis=1)
+
+
+def bucket_keys(minhash):
+    """Signed 64-bit hash of each band of a signature, the band number included"""
+    bands = minhash.astype('<u4').reshape(BANDS, ROWS)
+    return [
+        int.from_bytes(hashlib.blake2b(bytes([band]) + bands[band].tobytes(), digest_size=8).digest(), 'little',
+                       signed=True)
+        for band in range(BANDS)
+    ]
+
+
+def similarity(minhash_a, minhash_b):
+    """Estimated Jaccard similarity of two jobs' shingles"""
+    return float((minhash_a == minhash_b).mean())
+
+
+def _store_buckets(job_id, keys, using):
+    stored = list(JobBucket.objects.using(using).filter(job_id=job_id).order_by('band').values_list('key', flat=True))
+    if stored != keys:
+        JobBucket.objects.using(using).filter(job_id=job_id).delete()
+        JobBucket.objects.using(using).bulk_create(
+            [JobBucket(job_id=job_id, band=band, key=key) for band, key in enumerate(keys)]
+        )
+
+
+def find_duplicates(job, minhash=None, using=None):
+    """
+    ``[(job, similarity)]`` of the published jobs of the same recruiter and
+    place that are near-duplicates of a job, most similar first.
+    """
+    minhash = signature(job) if minhash is None else minhash
+    if minhash is None:
+        return []
+    candidate_ids = list(
+        JobBucket.objects.using(using)
+        .filter(key__in=bucket_keys(minhash), job__recruiter_id=job.recruiter_id, job__place_id=job.place_id,
+                job__status='published')
+        .exclude(job_id=job.pk).values_list('job_id', flat=True).distinct()[:MAX_CANDIDATES]
+    )
+    matches = []
+    for candidate in Job.objects.using(using).filter(pk__in=candidate_ids).only(*DEDUPE_FIELDS):
+        candidate_minhash = signature(candidate)
+        if candidate_minhash is not None:
+            score = similarity(minhash, candidate_minhash)
+            if score >= DUPLICATE_THRESHOLD:
+                matches.append((candidate, score))
+    matches.sort(key=lambda match: (-match[1], match[0].pk))
+    return matches
+
+
+def promote(job_ids, using=None):
+    """Make the oldest of the given jobs the representative of the others (their cluster lost its own)"""
+    job_ids = sorted(set(job_ids))
+    if not job_ids:
+        return
+    jobs = Job.objects.using(using or router.db_for_write(Job))
+    jobs.filter(pk=job_ids[0]).update(duplicate_of=None)
+    jobs.filter(pk__in=job_ids[1:]).update(duplicate_of=job_ids[0])
+
+
+def update_duplicates(jobs, using=None):
+    """
+    Store the buckets of the given jobs and attach each published one to
+    the cluster of its near-duplicates, merging clusters it bridges. A job
+    that is no longer published leaves its cluster, handing it on to the
+    oldest remaining member if it was the representative.
+    """
+    db = using or router.db_for_write(Job)
+    for job in jobs:
+        with transaction.atomic(using=db):
+            current = Job.objects.using(db).select_for_update().filter(pk=job.pk).only(*DEDUPE_FIELDS).first()
+            if current is None:
+                continue  # deleted meanwhile
+            minhash = signature(current)
+            _store_buckets(job.pk, bucket_keys(minhash) if minhash is not None else [], db)
+            if current.status != 'published' or minhash is None:
+                if current.duplicate_of_id is not None:
+                    Job.objects.using(db).filter(pk=job.pk).update(duplicate_of=None)
+                else:
+                    promote(Job.objects.using(db).filter(duplicate_of=job.pk).values_list('pk', flat=True), db)
+                job.duplicate_of_id = None
+                continue
+
+            roots = {match.duplicate_of_id or match.pk for match, _ in find_duplicates(current, minhash, db)}
+            if not roots:
+                if current.duplicate_of_id is not None:
+                    Job.objects.using(db).filter(pk=job.pk).update(duplicate_of=None)
+                job.duplicate_of_id = None
+                continue
+            roots.add(job.pk)
+            representative = min(roots)
+            others = roots - {representative}
+            Job.objects.using(db).filter(Q(pk__in=others) | Q(duplicate_of__in=others)).update(
+                duplicate_of=representative,
+            )
+            Job.objects.using(db).filter(pk=representative).update(duplicate_of=None)
+            job.duplicate_of_id = None if job.pk == representative else representative
+
+
+def expected_clusters(using=None):
+    """
+    ``{job id: representative id or None}`` for every job, computed from
+    scratch, and the bucket keys of each job: ``(clusters, keys)``.
+    """
+    signatures, keys, groups = {}, {}, {}
+    jobs = Job.objects.using(using).only(*DEDUPE_FIELDS).order_by('pk')
+    for job in jobs.iterator(chunk_size=2000):
+        minhash = signature(job)
+        keys[job.pk] = bucket_keys(minhash) if minhash is not None else []
+        if job.status == 'published' and minhash is not None:
+            signatures[job.pk] = minhash
+            groups.setdefault((job.recruiter_id, job.place_id), []).append(job.pk)
+
+    # Union-find over the pairs that share a bucket and are similar enough
+    parent = {job_id: job_id for job_id in signatures}
+
+    def find(job_id):
+        while parent[job_id] != job_id:
+            parent[job_id] = parent[parent[job_id]]
+            job_id = parent[job_id]
+        return job_id
+
+    for job_ids in groups.values():
+        buckets = {}
+        for job_id in job_ids:
+            for key in keys[job_id]:
+                buckets.setdefault(key, []).append(job_id)
+        for bucket in buckets.values():
+            bucket = bucket[:MAX_CANDIDATES]
+            for i, job_id in enumerate(bucket):
+                for other in bucket[i + 1:]:
+                    a, b = find(job_id), find(other)
+                    if a != b and similarity(signatures[job_id], signatures[other]) >= DUPLICATE_THRESHOLD:
+                        parent[max(a, b)] = min(a, b)
+
+    clusters = {job_id: None for job_id in keys}
+    for job_id in signatures:
+        root = find(job_id)
+        clusters[job_id] = None if root == job_id else root
+    return clusters, keys
+
+
+def rebuild_duplicates(using=None, dry_run=False):
+    """
+    Recompute every job's buckets and cluster. Returns ``{'jobs',
+    'duplicates', 'changed', 'buckets_changed'}``: jobs examined, jobs that
+    are duplicates, jobs whose duplicate_of changes and jobs whose buckets
+    change. With ``dry_run`` nothing is written.
+    """
+    db = using or router.db_for_write(Job)
+    clusters, keys = expected_clusters(using=db)
+    stored_keys = {}
+    for job_id, band, key in JobBucket.objects.using(db).order_by('job_id', 'band').values_list('job_id', 'band', 'key'):
+        stored_keys.setdefault(job_id, []).append(key)
+    current = dict(Job.objects.using(db).values_list('pk', 'duplicate_of'))
+    changed = [job_id for job_id, root in clusters.items() if current.get(job_id) != root]
+    stale = [job_id for job_id in keys if stored_keys.get(job_id, []) != keys[job_id]]
+
+    if not dry_run:
+        with transaction.atomic(using=db):
+            for batch in batches(stale):
+                JobBucket.objects.using(db).filter(job_id__in=batch).delete()
+                JobBucket.objects.using(db).bulk_create(
+                    [JobBucket(job_id=job_id, band=band, key=key)
+                     for job_id in batch for band, key in enumerate(keys[job_id])],
+                    batch_size=QUERY_BATCH_SIZE,
+                )
+            by_root = {}
+            for job_id in changed:
+                by_root.setdefault(clusters[job_id], []).append(job_id)
+            for root, job_ids in by_root.items():
+                for batch in batches(job_ids):
+                    Job.objects.using(db).filter(pk__in=batch).update(duplicate_of=root)
+    return {
+        'jobs': len(clusters),
+        'duplicates': sum(root is not None for root in clusters.values()),
+        'changed': len(changed),
+        'buckets_changed': len(stale),
+    }
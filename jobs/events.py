@@ -0,0 +1,193 @@
+"""
+Live application events for recruiters, streamed by
+recruiter.views.application_events as Server-Sent Events.
+
+The application services (jobs.services) call publish_application_event,
+which hands the event to the in-process BROKER once the transaction commits.
+Subscribers are the open event streams of this process: each one is an
+asyncio queue on the event loop serving it.
+
+The broker only reaches streams in the same process, so every stream also
+polls the database (ApplicationPoller, over Application.updated_at) every
+APPLICATION_EVENTS_POLL_SECONDS. Changes found that way were made by another
+worker, or dropped by a full queue, and carry no previous status, so the
+poller follows them with a ``counts`` snapshot the page can reset its
+counters from.
+"""
+import asyncio
+import json
+import threading
+from datetime import datetime, timedelta
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+
+from .models import Application, ApplicationCounter
+
+# Events a slow stream may have queued before newer ones are dropped (and
+# then picked up by the next poll)
+QUEUE_SIZE = 100
+
+# How far back each poll looks again, for rows that were saved before an
+# earlier poll but committed after it
+POLL_OVERLAP = timedelta(seconds=5)
+
+
+def application_event(application, old_status=None):
+    """Event for a new application (no old_status) or a status change"""
+    return {
+        'type': 'application_created' if old_status is None else 'status_changed',
+        'application_id': application.pk,
+        'job_id': application.job_id,
+        'status': application.status,
+        'old_status': old_status,
+        'updated_at': application.updated_at.isoformat(),
+    }
+
+
+def publish_application_event(application, old_status=None, recruiter_id=None):
+    """Announce a new application or a status change once the current transaction commits"""
+    if recruiter_id is None:
+        recruiter_id = application.job.recruiter_id
+    event = application_event(application, old_status)
+    transaction.on_commit(lambda: BROKER.publish(recruiter_id, event))
+
+
+class _Subscription:
+    __slots__ = ('loop', 'queue')
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.queue = asyncio.Queue(QUEUE_SIZE)
+
+    def put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            pass
+
+
+class ApplicationEventBroker:
+    """In-process pub/sub of application events, keyed by recruiter id"""
+
+    def __init__(self):
+        self._subscriptions = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, recruiter_id):
+        """A subscription whose ``queue`` receives the recruiter's events; call from the event loop"""
+        subscription = _Subscription(asyncio.get_running_loop())
+        with self._lock:
+            self._subscriptions.setdefault(recruiter_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, recruiter_id, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(recruiter_id)
+            if subscriptions:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[recruiter_id]
+
+    def publish(self, recruiter_id, event):
+        """Queue the event for the recruiter's streams; safe to call from any thread"""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(recruiter_id, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, event)
+            except RuntimeError:
+                pass  # the stream's event loop has already closed
+
+
+BROKER = ApplicationEventBroker()
+
+
+class ApplicationPoller:
+    """Finds a recruiter's application changes since a point in time that the stream has not sent yet"""
+
+    def __init__(self, recruiter_id, since):
+        self.recruiter_id = recruiter_id
+        self.since = since
+        self.sent = set()  # (application id, updated_at) within the overlap window
+
+    def mark_sent(self, event):
+        self.sent.add((event['application_id'], datetime.fromisoformat(event['updated_at'])))
+
+    def poll(self):
+        """Events for unsent changes, followed by a counts snapshot if there were any"""
+        changed = list(
+            Application.objects.filter(job__recruiter_id=self.recruiter_id, updated_at__gt=self.since - POLL_OVERLAP)
+            .only('id', 'job', 'status', 'updated_at')
+            .order_by('updated_at')
+        )
+        events = []
+        for application in changed:
+            key = (application.pk, application.updated_at)
+            if key in self.sent:
+                continue
+            self.sent.add(key)
+            events.append({
+                'type': 'application_changed',
+                'application_id': application.pk,
+                'job_id': application.job_id,
+                'status': application.status,
+                'updated_at': application.updated_at.isoformat(),
+            })
+        if changed:
+            self.since = max(self.since, changed[-1].updated_at)
+            horizon = self.since - POLL_OVERLAP
+            self.sent = {key for key in self.sent if key[1] >= horizon}
+        if events:
+            events.append(self.counts())
+        return events
+
+    def counts(self):
+        """Application counts of the recruiter, in total and per job, by status (from ApplicationCounter)"""
+        snapshot = {'type': 'counts', 'total': 0, 'statuses': {}, 'jobs': {}}
+        for counter in ApplicationCounter.objects.filter(recruiter_id=self.recruiter_id):
+            counts = {'total': counter.total, 'statuses': counter.as_dict()}
+            if counter.job_id is None:
+                snapshot.update(counts)
+            else:
+                snapshot['jobs'][str(counter.job_id)] = counts
+        return snapshot
+
+
+def format_sse(event, event_id=None):
+    """One Server-Sent Events message; the event type becomes the SSE event name"""
+    lines = [f"event: {event['type']}"]
+    if event_id:
+        lines.append(f'id: {event_id}')
+    lines.append(f'data: {json.dumps(event)}')
+    return '\n'.join(lines) + '\n\n'
+
+
+def retry_and_ready(poller, retry_seconds):
+    """Opening of a stream: the browser's reconnect delay and a ``ready`` event whose id resumes it"""
+    return f'retry: {int(retry_seconds * 1000)}\n\n' + format_sse({'type': 'ready'}, poller.since.isoformat())
+
+
+async def event_stream(recruiter_id, poller, poll_seconds):
+    """
+    Async iterator of SSE messages for a StreamingHttpResponse: broker events
+    as they arrive, poll results every ``poll_seconds`` (a keep-alive comment
+    when there are none). The subscription ends when the client disconnects.
+    """
+    subscription = BROKER.subscribe(recruiter_id)
+    try:
+        yield retry_and_ready(poller, poll_seconds)
+        loop = asyncio.get_running_loop()
+        next_poll = loop.time() + poll_seconds
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), max(0, next_poll - loop.time()))
+            except asyncio.TimeoutError:
+                events = await sync_to_async(poller.poll)()
+                yield ''.join(format_sse(e, e.get('updated_at')) for e in events) or ': keep-alive\n\n'
+                next_poll = loop.time() + poll_seconds
+            else:
+                poller.mark_sent(event)
+                yield format_sse(event, event['updated_at'])
+    finally:
+        BROKER.unsubscribe(recruiter_id, subscription)
@@ -0,0 +1,196 @@
+"""
+Offline location normalisation and distances.
+
+Free-text locations ("Bengaluru", "Bangalore, India", "SF Bay Area") are
+resolved against a bundled gazetteer (data/gazetteer.csv: cities with
+coordinates and aliases, plus countries) into a canonical place id. Job
+and DeveloperProfile store the result on save (LocatedModel), so matching
+compares place ids and cached distances instead of strings, and "within X
+km" searches are a latitude/longitude range query on an index
+(bounding_box_q) refined with haversine_km.
+"""
+import csv
+import math
+import re
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from django.db import models
+from django.db.models import Q
+
+GAZETTEER_PATH = Path(__file__).resolve().parent / 'data' / 'gazetteer.csv'
+
+REMOTE = 'remote'
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+# Aliases this short ("la", "sf", "uk") only match a whole comma-separated
+# part of a location, never a word inside a longer name
+MIN_WORD_ALIAS_LENGTH = 4
+
+# Longest alias, in words, looked for inside a part
+MAX_ALIAS_WORDS = 4
+
+PLACE_FIELDS = ('place_id', 'latitude', 'longitude')
+
+
+@dataclass(frozen=True, slots=True)
+class Place:
+    id: str
+    kind: str  # 'city' or 'country'
+    name: str
+    country: str
+    latitude: float = None
+    longitude: float = None
+
+
+def normalize(text):
+    """Lowercase ASCII words: accents removed, punctuation other than separators dropped"""
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode().lower()
+    text = re.sub(r"[.'’]", '', text)
+    return re.sub(r'[^a-z0-9,/;|()\-]+', ' ', text).strip()
+
+
+@lru_cache(maxsize=None)
+def gazetteer():
+    """``(places by id, place by alias)`` from the bundled CSV, loaded once"""
+    places, aliases = {}, {}
+    with open(GAZETTEER_PATH, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            place = Place(
+                id=row['id'], kind=row['kind'], name=row['name'], country=row['country'],
+                latitude=float(row['latitude']) if row['latitude'] else None,
+                longitude=float(row['longitude']) if row['longitude'] else None,
+            )
+            places[place.id] = place
+            for alias in [row['name'], *row['aliases'].split('|')]:
+                alias = normalize(alias)
+                if alias:
+                    # Cities are listed after countries and win a shared alias ("singapore")
+                    aliases[alias] = place
+    return places, aliases
+
+
+def get_place(place_id):
+    """The gazetteer entry for a stored place id, or None (unknown, empty or 'remote')"""
+    return gazetteer()[0].get(place_id) if place_id else None
+
+
+@lru_cache(maxsize=4096)
+def resolve(text):
+    """
+    The Place a free-text location refers to, or None. A city wins over a
+    country unless they disagree ("Cambridge, Massachusetts" is the United
+    States, not Cambridge in England).
+    """
+    if not text:
+        return None
+    _, aliases = gazetteer()
+    cities, countries = [], []
+    for part in re.split(r'[,/;|()]+|\s-\s', normalize(text)):
+        part = ' '.join(part.replace('-', ' ').split())
+        if not part:
+            continue
+        matches = [aliases[part]] if part in aliases else _word_matches(part, aliases)
+        for place in matches:
+            (cities if place.kind == 'city' else countries).append(place)
+
+    if countries:
+        for city in cities:
+            if city.country == countries[0].country:
+                return city
+        return countries[0]
+    return cities[0] if cities else None
+
+
+def _word_matches(part, aliases):
+    """Aliases found inside a part, longest first, without overlapping"""
+    words = part.split()
+    used = [False] * len(words)
+    matches = []
+    for n in range(min(MAX_ALIAS_WORDS, len(words)), 0, -1):
+        for i in range(len(words) - n + 1):
+            if any(used[i:i + n]):
+                continue
+            phrase = ' '.join(words[i:i + n])
+            place = aliases.get(phrase) if len(phrase) >= MIN_WORD_ALIAS_LENGTH else None
+            if place is not None:
+                matches.append(place)
+                used[i:i + n] = [True] * n
+    return matches
+
+
+def is_remote(text):
+    return bool(text) and re.search(r'\bremote\b', text.lower()) is not None
+
+
+def location_fields(text):
+    """
+    ``{'place_id', 'latitude', 'longitude'}`` to store for a location;
+    coordinates only for cities. Anything mentioning remote work ("Remote -
+    India") is stored as REMOTE, which matches every location.
+    """
+    place = None if is_remote(text) else resolve(text)
+    if place is None:
+        return {'place_id': REMOTE if is_remote(text) else '', 'latitude': None, 'longitude': None}
+    return {'place_id': place.id, 'latitude': place.latitude, 'longitude': place.longitude}
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in kilometres"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+@lru_cache(maxsize=65536)
+def place_distance_km(place_id_a, place_id_b):
+    """Distance between two cities by place id, or None if either has no coordinates"""
+    a, b = get_place(place_id_a), get_place(place_id_b)
+    if a is None or b is None or a.latitude is None or b.latitude is None:
+        return None
+    return haversine_km(a.latitude, a.longitude, b.latitude, b.longitude)
+
+
+def bounding_box_q(latitude, longitude, km, prefix=''):
+    """
+    Q matching rows whose ``latitude``/``longitude`` fall inside the box
+    around a circle of ``km`` (a superset of the circle; refine with
+    haversine_km). Handles the poles and the 180th meridian.
+    """
+    dlat = km / KM_PER_DEGREE
+    min_lat, max_lat = latitude - dlat, latitude + dlat
+    q = Q(**{f'{prefix}latitude__gte': max(min_lat, -90.0), f'{prefix}latitude__lte': min(max_lat, 90.0)})
+    if min_lat <= -90 or max_lat >= 90:
+        return q  # the circle covers a pole: every longitude
+    dlon = dlat / math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    if dlon >= 180:
+        return q
+    west, east = longitude - dlon, longitude + dlon
+    if west < -180:
+        return q & (Q(**{f'{prefix}longitude__gte': west + 360}) | Q(**{f'{prefix}longitude__lte': east}))
+    if east > 180:
+        return q & (Q(**{f'{prefix}longitude__gte': west}) | Q(**{f'{prefix}longitude__lte': east - 360}))
+    return q & Q(**{f'{prefix}longitude__gte': west, f'{prefix}longitude__lte': east})
+
+
+class LocatedModel(models.Model):
+    """Abstract model with a free-text ``location`` resolved to a place and coordinates on save"""
+    place_id = models.CharField(max_length=64, blank=True, default='')
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'location' in update_fields:
+            for field, value in location_fields(self.location).items():
+                setattr(self, field, value)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, *PLACE_FIELDS}
+        super().save(*args, **kwargs)
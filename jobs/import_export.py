@@ -0,0 +1,324 @@
+"""
+Bulk job import and streaming exports.
+
+Imports read CSV (with a header row) or JSON Lines from a binary stream one
+row at a time. Each row is validated on its own, so a bad row is reported
+and skipped without stopping the import. Valid rows are upserted in batches
+with one ``INSERT ... ON CONFLICT (recruiter_id, external_id) DO UPDATE``,
+so importing the same file twice updates the jobs instead of duplicating
+them. An update changes only the columns the file has; the defaults below
+apply to new jobs. bulk_create skips Job.save() and its signals, so the
+description vectors and duplicate clusters of each batch's jobs are
+updated once it commits.
+Columns:
+
+    external_id (required), title (required), department, job_type, location,
+    salary_min, salary_max, description, requirements, benefits, status
+
+requirements and benefits are JSON arrays in JSON Lines; in CSV they are
+either a JSON array or values separated by ``|``.
+
+Exports are generators of CSV or JSON Lines text for a
+StreamingHttpResponse. They read rows with ``.iterator(chunk_size=...)``,
+so memory use does not grow with the number of rows.
+"""
+import csv
+import io
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from . import dedupe, text_similarity
+from .geo import PLACE_FIELDS, location_fields
+from .models import JOB_TYPE_CHOICES, STATUS_CHOICES, Job
+
+FORMATS = ('csv', 'jsonl')
+
+IMPORT_FIELDS = [
+    'external_id', 'title', 'department', 'job_type', 'location', 'salary_min', 'salary_max',
+    'description', 'requirements', 'benefits', 'status',
+]
+
+LIST_SEPARATOR = '|'
+
+# Rows upserted per INSERT statement
+IMPORT_BATCH_SIZE = 500
+
+# Errors listed in an import result; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+# Rows fetched from the database per round trip while exporting
+EXPORT_CHUNK_SIZE = 2000
+
+# (column, ORM lookup) pairs of each export
+JOB_EXPORT_COLUMNS = [('id', 'id'), *((field, field) for field in IMPORT_FIELDS), ('created_at', 'created_at')]
+APPLICATION_EXPORT_COLUMNS = [
+    ('id', 'id'),
+    ('job_id', 'job_id'),
+    ('job_external_id', 'job__external_id'),
+    ('job_title', 'job__title'),
+    ('developer_email', 'developer__email'),
+    ('status', 'status'),
+    ('applied_at', 'applied_at'),
+    ('updated_at', 'updated_at'),
+    ('notes', 'notes'),
+]
+
+JOB_TYPES = [value for value, _ in JOB_TYPE_CHOICES]
+JOB_STATUSES = [value for value, _ in STATUS_CHOICES]
+
+
+def detect_format(filename, default=None):
+    """'csv' or 'jsonl' from a file name's extension, else ``default``"""
+    name = (filename or '').lower()
+    if name.endswith('.csv'):
+        return 'csv'
+    if name.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    return default
+
+
+def read_rows(stream, fmt):
+    """
+    Yield ``(line number, row dict, error)`` for each record of a binary
+    stream; exactly one of row and error is set. Raises ValueError if the
+    stream cannot be read from the start (not UTF-8, CSV columns missing);
+    if that happens further in, the last item is the error and reading stops.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    line = 0
+    try:
+        if fmt == 'csv':
+            reader = csv.DictReader(text)
+            if reader.fieldnames is None:
+                return
+            missing = {'external_id', 'title'} - set(reader.fieldnames)
+            if missing:
+                raise ValueError(f"Missing CSV columns: {', '.join(sorted(missing))}")
+            for row in reader:
+                line = reader.line_num
+                if None in row:
+                    yield line, None, "More values than columns"
+                else:
+                    yield line, row, None
+        else:
+            for line, record in enumerate(text, 1):
+                if not record.strip():
+                    continue
+                try:
+                    row = json.loads(record)
+                except json.JSONDecodeError as e:
+                    yield line, None, f"Invalid JSON: {e.msg}"
+                else:
+                    yield line, row, None
+    except (UnicodeDecodeError, csv.Error) as e:
+        message = "The file is not UTF-8 text" if isinstance(e, UnicodeDecodeError) else f"Invalid CSV: {e}"
+        if not line:
+            raise ValueError(message)
+        yield line + 1, None, f"{message}; stopped reading here"
+    finally:
+        text.detach()  # leave the caller's stream open
+
+
+def clean_row(row):
+    """The Job field values of one import row; raises ValueError naming the first bad column"""
+    if not isinstance(row, dict):
+        raise ValueError("Expected an object")
+    fields = {
+        'external_id': _text(row, 'external_id', 255, required=True),
+        'title': _text(row, 'title', 255, required=True),
+        'department': _text(row, 'department', 255),
+        'job_type': _choice(row, 'job_type', JOB_TYPES, 'full-time'),
+        'location': _text(row, 'location', 255),
+        'salary_min': _salary(row, 'salary_min'),
+        'salary_max': _salary(row, 'salary_max'),
+        'description': _text(row, 'description'),
+        'requirements': _list(row, 'requirements'),
+        'benefits': _list(row, 'benefits'),
+        'status': _choice(row, 'status', JOB_STATUSES, 'draft'),
+    }
+    if fields['salary_min'] is not None and fields['salary_max'] is not None \
+            and fields['salary_min'] > fields['salary_max']:
+        raise ValueError("salary_min is greater than salary_max")
+    fields.update(location_fields(fields['location']))
+    return fields
+
+
+def update_fields(columns):
+    """
+    The Job fields an import row with these columns changes on a job that
+    already exists (bulk_create skips Job.save(), so the place resolved by
+    clean_row is written along with its location)
+    """
+    fields = [field for field in IMPORT_FIELDS[1:] if field in columns]
+    if 'location' in columns:
+        fields.extend(PLACE_FIELDS)
+    return fields
+
+
+def import_jobs(recruiter, stream, fmt, batch_size=IMPORT_BATCH_SIZE, dry_run=False):
+    """
+    Validate and upsert the jobs of a CSV or JSON Lines stream for the
+    recruiter. Each batch is committed on its own. With ``dry_run`` nothing
+    is written, but rows are validated and matched against existing jobs.
+
+    Returns ``{'rows', 'created', 'updated', 'skipped', 'errors',
+    'error_count'}``; errors are ``{'line', 'message'}`` (the first
+    MAX_REPORTED_ERRORS of them). A row repeating an external_id earlier in
+    the same batch replaces it and is not counted again. A row updates only
+    the fields of its own columns (the CSV header, or the keys of a JSON
+    Lines record), so a batch ends where the columns change.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt}")
+    result = {'rows': 0, 'created': 0, 'updated': 0, 'skipped': 0, 'errors': [], 'error_count': 0}
+
+    def error(line, message):
+        result['skipped'] += 1
+        result['error_count'] += 1
+        if len(result['errors']) < MAX_REPORTED_ERRORS:
+            result['errors'].append({'line': line, 'message': message})
+
+    batch, fields_updated = {}, None
+    for line, row, problem in read_rows(stream, fmt):
+        result['rows'] += 1
+        if problem is None:
+            try:
+                fields = clean_row(row)
+            except ValueError as e:
+                problem = str(e)
+        if problem is not None:
+            error(line, problem)
+            continue
+        row_fields = update_fields(row)
+        if batch and row_fields != fields_updated:
+            _upsert(recruiter, batch, fields_updated, result, dry_run)
+            batch = {}
+        fields_updated = row_fields
+        batch[fields['external_id']] = fields
+        if len(batch) >= batch_size:
+            _upsert(recruiter, batch, fields_updated, result, dry_run)
+            batch = {}
+    if batch:
+        _upsert(recruiter, batch, fields_updated, result, dry_run)
+    return result
+
+
+def _upsert(recruiter, batch, fields_updated, result, dry_run):
+    with transaction.atomic():
+        existing = set(
+            Job.objects.filter(recruiter=recruiter, external_id__in=list(batch))
+            .values_list('external_id', flat=True)
+        )
+        if not dry_run:
+            Job.objects.bulk_create(
+                [Job(recruiter=recruiter, **fields) for fields in batch.values()],
+                update_conflicts=True,
+                unique_fields=['recruiter', 'external_id'],
+                update_fields=fields_updated,
+            )
+            external_ids = list(batch)
+            transaction.on_commit(lambda: _after_import(recruiter, external_ids))
+    result['updated'] += len(existing)
+    result['created'] += len(batch) - len(existing)
+
+
+def _after_import(recruiter, external_ids):
+    """What the Job signals do on save, for a committed batch of imported jobs"""
+    # Read back rather than reuse the batch: an update leaves the columns missing from the file as they were
+    jobs = list(Job.objects.filter(recruiter=recruiter, external_id__in=external_ids))
+    text_similarity.refresh_vectors(text_similarity.JOB, jobs)
+    dedupe.update_duplicates(jobs)
+
+
+def export_rows(queryset, columns, fmt):
+    """Yield the queryset's rows as CSV or JSON Lines text, one chunk per database fetch"""
+    names = [name for name, _ in columns]
+    rows = queryset.values_list(*(lookup for _, lookup in columns)).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    buffer = io.StringIO()
+    if fmt == 'csv':
+        writer = csv.writer(buffer)
+        writer.writerow(names)
+        write = lambda row: writer.writerow([_csv_value(value) for value in row])
+    else:
+        write = lambda row: buffer.write(json.dumps(dict(zip(names, row)), cls=DjangoJSONEncoder) + '\n')
+
+    for n, row in enumerate(rows, 1):
+        write(row)
+        if n % EXPORT_CHUNK_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, list):
+        return LIST_SEPARATOR.join(str(item) for item in value)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def _value(row, name):
+    value = row.get(name)
+    if isinstance(value, str):
+        value = value.strip()
+    return None if value in ('', None) else value
+
+
+def _text(row, name, max_length=None, required=False):
+    value = _value(row, name)
+    if value is None:
+        if required:
+            raise ValueError(f"{name} is required")
+        return None
+    if not isinstance(value, (str, int, float)) or isinstance(value, bool):
+        raise ValueError(f"{name} must be text")
+    value = str(value)
+    if max_length and len(value) > max_length:
+        raise ValueError(f"{name} is longer than {max_length} characters")
+    return value
+
+
+def _choice(row, name, choices, default):
+    value = _value(row, name)
+    if value is None:
+        return default
+    value = str(value).lower()
+    if value not in choices:
+        raise ValueError(f"{name} must be one of {', '.join(choices)}")
+    return value
+
+
+def _salary(row, name):
+    value = _value(row, name)
+    if value is None:
+        return None
+    try:
+        number = int(str(value).replace(',', ''))
+    except ValueError:
+        raise ValueError(f"{name} must be a whole number")
+    if number < 0:
+        raise ValueError(f"{name} must not be negative")
+    return number
+
+
+def _list(row, name):
+    value = _value(row, name)
+    if value is None:
+        return []
+    if isinstance(value, str):
+        if value.startswith('['):
+            try:
+                value = json.loads(value)
+            except json.JSONDecodeError:
+                raise ValueError(f"{name} is not a valid JSON array")
+        else:
+            value = value.split(LIST_SEPARATOR)
+    if not isinstance(value, list) or not all(isinstance(item, (str, int, float)) for item in value):
+        raise ValueError(f"{name} must be a list of text values")
+    return [str(item).strip() for item in value if str(item).strip()]
@@ -0,0 +1,137 @@
+import json
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections
+
+from accounts.models import User
+from jobs.models import Application, Job
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark concurrent job applications against a scratch SQLite database, "
+        "once with SQLite defaults and once with the tuned connection settings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8, help='Number of writer threads')
+        parser.add_argument('--writes', type=int, default=200, help='Applications per thread')
+        parser.add_argument('--json', action='store_true', help='Emit results as JSON')
+
+    def handle(self, *args, **options):
+        n_threads = options['threads']
+        n_writes = options['writes']
+        tuned = settings.DATABASES['default']
+
+        profiles = {
+            'baseline': {'OPTIONS': {}, 'PRAGMAS': {}, 'CONN_MAX_AGE': 0},
+            'tuned': {
+                'OPTIONS': dict(tuned.get('OPTIONS', {})) if tuned['ENGINE'].endswith('sqlite3') else {},
+                'PRAGMAS': tuned.get('PRAGMAS') or {},
+                'CONN_MAX_AGE': tuned.get('CONN_MAX_AGE', 0),
+            },
+        }
+
+        results = {}
+        for name, overrides in profiles.items():
+            results[name] = self.run_profile(name, overrides, n_threads, n_writes)
+
+        baseline_rate = results['baseline']['applications_per_sec']
+        results['speedup'] = (
+            round(results['tuned']['applications_per_sec'] / baseline_rate, 2) if baseline_rate else None
+        )
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(f"{n_threads} writer threads x {n_writes} applications each")
+        for name in profiles:
+            r = results[name]
+            self.stdout.write(
+                f"{name:<9} {r['applications_per_sec']:>9.1f} apps/sec  "
+                f"elapsed {r['elapsed_sec']:.2f}s  errors {r['errors']}  "
+                f"pragmas {r['pragmas'] or '-'}"
+            )
+        self.stdout.write(f"speedup   {results['speedup']}x")
+
+    def run_profile(self, name, overrides, n_threads, n_writes):
+        alias = f'bench_{name}'
+        tmp_dir = tempfile.mkdtemp(prefix='smarthire-bench-')
+        connections.settings[alias] = {
+            **connections['default'].settings_dict,
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': str(Path(tmp_dir) / 'bench.sqlite3'),
+            'USER': '',
+            'PASSWORD': '',
+            'HOST': '',
+            'PORT': '',
+            **overrides,
+        }
+        try:
+            call_command('migrate', database=alias, verbosity=0)
+            job_ids, developer_ids = self.seed(alias, n_threads, n_writes)
+
+            errors = []
+            barrier = threading.Barrier(n_threads + 1)
+
+            def writer(developer_id):
+                barrier.wait()
+                try:
+                    for job_id in job_ids:
+                        # Same read-then-write pattern as developer.views.apply_to_job
+                        try:
+                            if not Application.objects.using(alias).filter(
+                                job_id=job_id, developer_id=developer_id
+                            ).exists():
+                                Application.objects.using(alias).create(
+                                    job_id=job_id, developer_id=developer_id, status='applied'
+                                )
+                        except OperationalError as e:
+                            errors.append(str(e))
+                finally:
+                    connections[alias].close()
+
+            threads = [threading.Thread(target=writer, args=(dev_id,)) for dev_id in developer_ids]
+            for t in threads:
+                t.start()
+            barrier.wait()
+            start = time.perf_counter()
+            for t in threads:
+                t.join()
+            elapsed = time.perf_counter() - start
+
+            created = Application.objects.using(alias).count()
+            return {
+                'applications': created,
+                'elapsed_sec': round(elapsed, 4),
+                'applications_per_sec': round(created / elapsed, 1) if elapsed else 0.0,
+                'errors': len(errors),
+                'pragmas': connections.settings[alias]['PRAGMAS'],
+            }
+        finally:
+            connections[alias].close()
+            del connections[alias]
+            del connections.settings[alias]
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def seed(self, alias, n_developers, n_jobs):
+        recruiter = User.objects.db_manager(alias).create_user(
+            email='bench-recruiter@example.com', user_type='recruiter'
+        )
+        developers = User.objects.using(alias).bulk_create([
+            User(email=f'bench-dev-{i}@example.com', user_type='developer', password='!')
+            for i in range(n_developers)
+        ])
+        jobs = Job.objects.using(alias).bulk_create([
+            Job(recruiter=recruiter, title=f'Bench Job {i}', status='published')
+            for i in range(n_jobs)
+        ])
+        return [j.id for j in jobs], [d.id for d in developers]
@@ -0,0 +1,99 @@
+import json
+import statistics
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.similarity_index import (
+    BANDS, MIN_SIMILARITY, SIGNATURE_BITS, SIGNATURE_WORDS, SignatureIndex, estimated_similarity, hamming, write_index,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the similar jobs / similar candidates index on synthetic signatures: groups "
+        "of near-duplicate items around random centres, indexed in a temporary directory. "
+        "Reports build time, lookup latency and recall of the top 10 against an exact scan, "
+        "of all of them and of those similar enough to be shown (MIN_SIMILARITY)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--items', type=int, default=1_000_000, help='Number of indexed items')
+        parser.add_argument('--groups', type=int, default=50_000, help='Groups of similar items')
+        parser.add_argument('--recent', type=int, default=1000, help='Items saved since the build')
+        parser.add_argument('--queries', type=int, default=200, help='Lookups measured')
+        parser.add_argument('--seed', type=int, default=7, help='Random seed')
+        parser.add_argument('--json', action='store_true', help='Emit results as JSON')
+
+    def handle(self, *args, **options):
+        import numpy as np
+
+        rng = np.random.default_rng(options['seed'])
+        n_items, n_queries = options['items'], options['queries']
+
+        # Each item is its group's centre with 5-30% of the bits flipped
+        # (estimated similarity 0.99 down to 0.59 with the centre)
+        centres = rng.integers(0, 2, size=(options['groups'], SIGNATURE_BITS), dtype=np.uint8)
+        signatures = np.empty((n_items, SIGNATURE_WORDS), dtype=np.uint64)
+        for start in range(0, n_items, 100_000):
+            size = min(100_000, n_items - start)
+            bits = centres[rng.integers(0, len(centres), size)]
+            flip = rng.random((size, SIGNATURE_BITS)) < rng.uniform(0.05, 0.3, (size, 1))
+            signatures[start:start + size] = np.packbits(bits ^ flip, axis=1).view(np.uint64)
+        ids = np.arange(1, n_items + 1, dtype=np.int64)
+        recent_rows = rng.choice(n_items, options['recent'], replace=False)
+        recent = (ids[recent_rows], signatures[recent_rows])
+        results = {'items': n_items, 'groups': options['groups'], 'recent': options['recent']}
+
+        with tempfile.TemporaryDirectory() as directory:
+            started = time.perf_counter()
+            write_index(directory, 'bench', ids, signatures)
+            results['build_sec'] = round(time.perf_counter() - started, 2)
+
+            index = SignatureIndex(directory, 'bench')
+            index.snapshot()
+            query_rows = rng.choice(n_items, n_queries, replace=False)
+            latencies, hits, exact_ms = [], 0, []
+            shown, shown_hits = 0, 0
+            for row in query_rows.tolist():
+                started = time.perf_counter()
+                found = index.search(signatures[row], 10, exclude={int(ids[row])}, recent=recent)
+                latencies.append((time.perf_counter() - started) * 1000)
+
+                started = time.perf_counter()
+                distances = hamming(signatures, signatures[row])
+                distances[row] = SIGNATURE_BITS + 1
+                nearest = np.argpartition(distances, 10)[:10]
+                exact_ms.append((time.perf_counter() - started) * 1000)
+                # Ties at the 10th distance count as found
+                cutoff = distances[nearest].max()
+                found_rows = {pk - 1 for pk, _ in found}
+                hits += sum(1 for i in found_rows if distances[i] <= cutoff)
+                wanted = [i for i in nearest.tolist() if estimated_similarity(distances[i]) >= MIN_SIMILARITY]
+                shown += len(wanted)
+                shown_hits += len(found_rows & set(wanted))
+            latencies.sort()
+
+        results['p50_ms'] = round(statistics.median(latencies), 2)
+        results['p99_ms'] = round(latencies[int(len(latencies) * 0.99) - 1 if len(latencies) >= 100 else -1], 2)
+        results['exact_scan_ms'] = round(statistics.median(exact_ms), 2)
+        results['recall_at_10'] = round(hits / (10 * n_queries), 3)
+        results['recall_above_min_similarity'] = round(shown_hits / shown, 3) if shown else None
+        results['index_mb'] = round(
+            (signatures.nbytes + ids.nbytes + n_items * BANDS * (2 + 4)) / 1e6, 1,
+        )
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(
+            f"{n_items} items in {options['groups']} groups, {options['recent']} saved since the build "
+            f"({results['index_mb']} MB of index files)"
+        )
+        self.stdout.write(f"build          {results['build_sec']:.2f}s")
+        self.stdout.write(f"lookup p50     {results['p50_ms']:.2f} ms")
+        self.stdout.write(f"lookup p99     {results['p99_ms']:.2f} ms")
+        self.stdout.write(f"exact scan     {results['exact_scan_ms']:.2f} ms")
+        self.stdout.write(f"recall@10      {results['recall_at_10']:.3f}")
+        self.stdout.write(f"  shown ones   {results['recall_above_min_similarity']}")
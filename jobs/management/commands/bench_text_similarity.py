@@ -0,0 +1,133 @@
+import json
+import math
+import random
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+from jobs.management.commands.seed_bench import COMMON_SKILLS, ROLES
+from jobs.text_similarity import JobVectorIndex, tokenize
+
+FILLER_WORDS = 20_000
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark description similarity on synthetic job descriptions held in memory: "
+        "vectorising, building the TF-IDF matrix, refreshing it after edits and scoring a "
+        "profile against every job, compared with a pure-Python cosine loop."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=100_000, help='Number of synthetic jobs')
+        parser.add_argument('--words', type=int, default=120, help='Words per job description')
+        parser.add_argument('--queries', type=int, default=20, help='Profiles scored per measurement')
+        parser.add_argument('--subset', type=int, default=200, help='Jobs scored per query in the subset run')
+        parser.add_argument('--seed', type=int, default=7, help='Random seed')
+        parser.add_argument('--json', action='store_true', help='Emit results as JSON')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        n_jobs, n_queries = options['jobs'], options['queries']
+        skills = sorted({skill for _, role_skills in ROLES.values() for skill in role_skills} | set(COMMON_SKILLS))
+        filler = [f'word{i}' for i in range(FILLER_WORDS)]
+        # Zipf-like word frequencies, as in real text
+        filler_weights = [1 / (rank + 1) for rank in range(FILLER_WORDS)]
+
+        def text(n_words):
+            words = rng.choices(filler, filler_weights, k=n_words) + rng.sample(skills, 6)
+            return ' '.join(words)
+
+        texts = [text(options['words']) for _ in range(n_jobs)]
+        queries = [text(options['words'] // 2) for _ in range(n_queries)]
+        results = {'jobs': n_jobs}
+
+        # Vectorise: term counts per document, ids from an in-memory vocabulary
+        started = time.perf_counter()
+        vocabulary, documents, job_counts = {}, {}, Counter()
+        for job_id, job_text in enumerate(texts, 1):
+            counts = Counter(tokenize(job_text))
+            pairs = sorted((vocabulary.setdefault(term, len(vocabulary) + 1), n) for term, n in counts.items())
+            documents[job_id] = pairs
+            job_counts.update(term_id for term_id, _ in pairs)
+        results['vectorise_sec'] = round(time.perf_counter() - started, 3)
+        results['vocabulary'] = len(vocabulary)
+        results['nonzeros'] = sum(len(pairs) for pairs in documents.values())
+
+        import numpy as np
+
+        arrays = {
+            job_id: (np.array([t for t, _ in pairs], np.uint32), np.array([n for _, n in pairs], np.uint16))
+            for job_id, pairs in documents.items()
+        }
+        df = np.zeros(len(vocabulary) + 1, np.int64)
+        for term_id, n in job_counts.items():
+            df[term_id] = n
+        index = JobVectorIndex()
+        started = time.perf_counter()
+        index.build(arrays, df)
+        results['build_sec'] = round(time.perf_counter() - started, 3)
+        results['matrix_mb'] = round(sum(a.nbytes for a in index.matrix) / 1e6, 1)
+
+        # An edit to 1% of the jobs: adjust df by the terms they gained or
+        # lost, then rebuild the matrix (what JobVectorIndex.refresh does)
+        started = time.perf_counter()
+        for job_id in rng.sample(range(1, n_jobs + 1), max(1, n_jobs // 100)):
+            counts = Counter(tokenize(text(options['words'])))
+            pairs = sorted((vocabulary.setdefault(term, len(vocabulary) + 1), n) for term, n in counts.items())
+            old, new = set(arrays[job_id][0].tolist()), {term_id for term_id, _ in pairs}
+            if max(new) >= len(df):
+                df = np.concatenate([df, np.zeros(max(new) + 1 - len(df), np.int64)])
+            df[list(new - old)] += 1
+            df[list(old - new)] -= 1
+            arrays[job_id] = (np.array([t for t, _ in pairs], np.uint32), np.array([n for _, n in pairs], np.uint16))
+        index.build(arrays, df)
+        results['refresh_1pct_sec'] = round(time.perf_counter() - started, 3)
+
+        query_vectors = []
+        for query_text in queries:
+            counts = Counter(tokenize(query_text))
+            query_vectors.append(([vocabulary.get(term, -1) for term in counts], list(counts.values())))
+
+        started = time.perf_counter()
+        for query in query_vectors:
+            scores = index.similarities(query)
+        results['query_all_ms'] = round((time.perf_counter() - started) / n_queries * 1000, 2)
+
+        subset = rng.sample(range(1, n_jobs + 1), min(options['subset'], n_jobs))
+        started = time.perf_counter()
+        for query in query_vectors:
+            index.similarities(query, subset)
+        results['query_subset_ms'] = round((time.perf_counter() - started) / n_queries * 1000, 3)
+
+        # Baseline: the same cosine over dict vectors in pure Python, one query
+        _, _, _, _, idf = index.matrix
+        started = time.perf_counter()
+        query = dict(zip(*query_vectors[-1]))
+        q_weights = {t: (1 + math.log(n)) * float(idf[t]) for t, n in query.items() if 0 <= t < len(idf)}
+        q_norm = math.sqrt(sum(w * w for w in q_weights.values()))
+        baseline = {}
+        for job_id, (term_ids, counts) in arrays.items():
+            weights = {t: (1 + math.log(n)) * float(idf[t]) for t, n in zip(term_ids.tolist(), counts.tolist())}
+            norm = math.sqrt(sum(w * w for w in weights.values()))
+            baseline[job_id] = sum(w * weights.get(t, 0.0) for t, w in q_weights.items()) / (norm * q_norm or 1)
+        results['python_loop_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        worst = max(abs(baseline[job_id] - scores[job_id]) for job_id in baseline)
+        results['max_abs_difference'] = float(f'{worst:.2e}')
+        results['speedup'] = round(results['python_loop_ms'] / results['query_all_ms'], 1)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(
+            f"{n_jobs} jobs, {results['vocabulary']} terms, {results['nonzeros']} non-zeros "
+            f"({results['matrix_mb']} MB matrix)"
+        )
+        self.stdout.write(f"vectorise         {results['vectorise_sec']:.2f}s")
+        self.stdout.write(f"build matrix      {results['build_sec']:.2f}s")
+        self.stdout.write(f"refresh 1% edits  {results['refresh_1pct_sec']:.2f}s")
+        self.stdout.write(f"score all jobs    {results['query_all_ms']:.2f} ms/profile")
+        self.stdout.write(f"score {len(subset)} jobs    {results['query_subset_ms']:.3f} ms/profile")
+        self.stdout.write(f"python loop       {results['python_loop_ms']:.1f} ms/profile")
+        self.stdout.write(f"speedup           {results['speedup']}x (max difference {results['max_abs_difference']})")
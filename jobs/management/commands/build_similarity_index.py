@@ -0,0 +1,33 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.similarity_index import build_index
+from jobs.text_similarity import JOB, PROFILE
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the memory-mapped similar jobs / similar candidates index from the signatures "
+        "stored with the text vectors. Signatures saved since the last build are found without "
+        "it, so running this regularly only keeps lookups fast."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kind', choices=[JOB, PROFILE], action='append', dest='kinds',
+                            help='Only jobs or only profiles (repeatable)')
+        parser.add_argument('--json', action='store_true', help='Emit results as JSON')
+
+    def handle(self, *args, **options):
+        results = {}
+        for kind in options['kinds'] or [JOB, PROFILE]:
+            started = time.perf_counter()
+            count = build_index(kind)
+            results[kind] = {'items': count, 'seconds': round(time.perf_counter() - started, 2)}
+        if options['json']:
+            self.stdout.write(json.dumps(results))
+            return
+        for kind, result in results.items():
+            self.stdout.write(f"{kind}: {result['items']} items indexed in {result['seconds']:.2f}s")
+        self.stdout.write(self.style.SUCCESS("Similarity index built."))
@@ -0,0 +1,39 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from jobs.dedupe import rebuild_duplicates
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the near-duplicate clusters of all jobs (MinHash buckets and duplicate_of) "
+        "from scratch, for jobs written without save() (bulk imports) and clusters whose jobs "
+        "were edited apart. Use --check to only report what would change."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help='Report changes without writing them')
+        parser.add_argument('--json', action='store_true', help='Emit results as JSON')
+
+    def handle(self, *args, **options):
+        result = rebuild_duplicates(dry_run=options['check'])
+        if options['json']:
+            self.stdout.write(json.dumps(result))
+            return
+        self.stdout.write(
+            f"{result['jobs']} jobs, {result['duplicates']} near-duplicates of another published job"
+        )
+        if options['check']:
+            if result['changed'] or result['buckets_changed']:
+                self.stdout.write(
+                    f"{result['changed']} clusters out of date, {result['buckets_changed']} jobs with stale buckets"
+                )
+                self.stdout.write(self.style.WARNING("Duplicate clusters are out of date."))
+            else:
+                self.stdout.write(self.style.SUCCESS("Duplicate clusters are up to date."))
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"Duplicate clusters rebuilt; {result['changed']} jobs changed cluster, "
+            f"{result['buckets_changed']} jobs re-bucketed."
+        ))
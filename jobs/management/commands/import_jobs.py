@@ -0,0 +1,55 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import User
+from jobs.import_export import FORMATS, IMPORT_BATCH_SIZE, detect_format, import_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Create or update a recruiter's jobs from a CSV or JSON Lines file, keyed by external_id. "
+        "The file is read row by row and upserted in batches; invalid rows are reported and skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV or JSON Lines file, or - for standard input")
+        parser.add_argument('--recruiter', required=True, help='Email of the recruiter the jobs belong to')
+        parser.add_argument('--format', choices=FORMATS, help='Defaults to the file extension')
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE, help='Rows per upsert')
+        parser.add_argument('--dry-run', action='store_true', help='Validate without writing anything')
+        parser.add_argument('--json', action='store_true', help='Emit the result as JSON')
+
+    def handle(self, *args, **options):
+        recruiter = User.objects.filter(email=options['recruiter'], user_type='recruiter').first()
+        if recruiter is None:
+            raise CommandError(f"No recruiter with email {options['recruiter']}.")
+        path = options['path']
+        fmt = options['format'] or detect_format(path)
+        if fmt is None:
+            raise CommandError("Cannot tell the format from the file name; pass --format.")
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        try:
+            if path == '-':
+                result = import_jobs(recruiter, sys.stdin.buffer, fmt, options['batch_size'], options['dry_run'])
+            else:
+                with open(path, 'rb') as stream:
+                    result = import_jobs(recruiter, stream, fmt, options['batch_size'], options['dry_run'])
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        if options['json']:
+            self.stdout.write(json.dumps(result, indent=2))
+            return
+        for error in result['errors']:
+            self.stdout.write(f"line {error['line']}: {error['message']}")
+        if result['error_count'] > len(result['errors']):
+            self.stdout.write(f"... and {result['error_count'] - len(result['errors'])} more errors")
+        verb = 'Would create' if options['dry_run'] else 'Created'
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {result['created']} jobs and {'would update' if options['dry_run'] else 'updated'} "
+            f"{result['updated']} from {result['rows']} rows ({result['skipped']} skipped)."
+        ))
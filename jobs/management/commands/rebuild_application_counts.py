@@ -0,0 +1,57 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from jobs.models import ApplicationCounter
+from jobs.services import expected_counters, rebuild_application_counts
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the per-job and per-recruiter application status counters from the "
+        "applications. Use --check to only report counters that have drifted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recruiter', type=int, action='append', dest='recruiters',
+                            help='Only this recruiter id (repeatable)')
+        parser.add_argument('--check', action='store_true', help='Report drift without changing anything')
+        parser.add_argument('--json', action='store_true', help='Emit results as JSON')
+
+    def handle(self, *args, **options):
+        recruiter_ids = options['recruiters']
+        if options['check']:
+            drift = self.drift(recruiter_ids)
+            if options['json']:
+                self.stdout.write(json.dumps({'drifted': drift}, indent=2))
+            elif drift:
+                for row in drift:
+                    self.stdout.write(
+                        f"recruiter {row['recruiter_id']} job {row['job_id'] or 'all'}: "
+                        f"stored {row['stored']} expected {row['expected']}"
+                    )
+                self.stdout.write(self.style.WARNING(f"{len(drift)} counters have drifted."))
+            else:
+                self.stdout.write(self.style.SUCCESS("All application counters are up to date."))
+            return
+
+        written = rebuild_application_counts(recruiter_ids)
+        if options['json']:
+            self.stdout.write(json.dumps({'counters': written}))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} application counters."))
+
+    def drift(self, recruiter_ids):
+        expected = expected_counters(recruiter_ids)
+        stored = ApplicationCounter.objects.all()
+        if recruiter_ids is not None:
+            stored = stored.filter(recruiter_id__in=recruiter_ids)
+        stored = {(counter.recruiter_id, counter.job_id): counter for counter in stored}
+
+        drift = []
+        for key in sorted(expected.keys() | stored.keys(), key=lambda k: (k[0], k[1] or 0)):
+            want = expected[key].as_dict() if key in expected else dict.fromkeys(stored[key].as_dict(), 0)
+            have = stored[key].as_dict() if key in stored else dict.fromkeys(want, 0)
+            if want != have:
+                drift.append({'recruiter_id': key[0], 'job_id': key[1], 'stored': have, 'expected': want})
+        return drift
@@ -0,0 +1,58 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from jobs.text_similarity import (
+    JOB, PROFILE, job_count_drift, orphaned_vectors, rebuild_job_counts, refresh_all_vectors, stale_vectors,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Vectorise the jobs and developer profiles whose text changed without save() "
+        "(bulk_create, update()) for description similarity, remove the vectors of deleted "
+        "ones and recount term document frequencies. Use --check to only report what is out of date."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kind', choices=[JOB, PROFILE], action='append', dest='kinds',
+                            help='Only jobs or only profiles (repeatable)')
+        parser.add_argument('--check', action='store_true', help='Report stale vectors without changing anything')
+        parser.add_argument('--json', action='store_true', help='Emit results as JSON')
+
+    def handle(self, *args, **options):
+        kinds = options['kinds'] or [JOB, PROFILE]
+        if options['check']:
+            results = {
+                kind: {'stale': stale_vectors(kind), 'orphaned': len(orphaned_vectors(kind))} for kind in kinds
+            }
+            results['job_count_drift'] = len(job_count_drift())
+            up_to_date = not results['job_count_drift'] and not any(
+                results[kind]['stale'] or results[kind]['orphaned'] for kind in kinds
+            )
+            if options['json']:
+                self.stdout.write(json.dumps(results, indent=2))
+            elif up_to_date:
+                self.stdout.write(self.style.SUCCESS("All text vectors are up to date."))
+            else:
+                for kind in kinds:
+                    self.stdout.write(
+                        f"{kind}: {results[kind]['stale']} stale, {results[kind]['orphaned']} orphaned"
+                    )
+                self.stdout.write(f"terms with a wrong job count: {results['job_count_drift']}")
+                self.stdout.write(self.style.WARNING("Text vectors are out of date."))
+            return
+
+        results = {}
+        for kind in kinds:
+            written, removed = refresh_all_vectors(kind)
+            results[kind] = {'written': written, 'removed': removed}
+        results['job_counts_corrected'] = rebuild_job_counts()
+        if options['json']:
+            self.stdout.write(json.dumps(results))
+            return
+        for kind in kinds:
+            self.stdout.write(f"{kind}: {results[kind]['written']} vectors written, {results[kind]['removed']} removed")
+        self.stdout.write(self.style.SUCCESS(
+            f"Text vectors refreshed; {results['job_counts_corrected']} term job counts corrected."
+        ))
@@ -0,0 +1,194 @@
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from contextlib import ExitStack
+from datetime import datetime, timezone
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from accounts.models import User
+from jobs.models import Application, Job
+
+from .seed_bench import EMAIL_PREFIX
+
+# name: (user kind, URL name, needs a job id)
+TARGETS = {
+    'find_jobs': ('developer', 'jobs:find_jobs', False),
+    'my_applications': ('developer', 'developer:applications', False),
+    'recruiter_dashboard': ('recruiter', 'recruiter:dashboard', False),
+    'all_candidates': ('recruiter', 'recruiter:all_candidates', False),
+    'applications_by_job': ('recruiter', 'recruiter:job_applications', True),
+}
+
+
+def git_revision():
+    try:
+        proc = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR, capture_output=True, text=True,
+        )
+    except OSError:
+        return None
+    return proc.stdout.strip() or None
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the main developer and recruiter pages end to end through the test client: "
+        "latency over several requests, SQL query count and peak Python memory for one request. "
+        "Run seed_bench first for realistic volumes. Save results with --output and compare "
+        "two commits with --compare."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only', action='append', choices=list(TARGETS), help='Benchmark only these pages')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed requests per page')
+        parser.add_argument('--warmup', type=int, default=1, help='Untimed requests per page before timing')
+        parser.add_argument('--developer', help='Developer email (default: first seeded developer)')
+        parser.add_argument('--recruiter', help='Recruiter email (default: first seeded recruiter)')
+        parser.add_argument('--job', type=int, help="Job id for applications_by_job (default: the recruiter's busiest job)")
+        parser.add_argument('--output', help='Also write the JSON results to this file')
+        parser.add_argument('--compare', help='JSON results of an earlier run to compare against')
+        parser.add_argument('--json', action='store_true', help='Emit results as JSON')
+
+    def handle(self, *args, **options):
+        targets = options['only'] or list(TARGETS)
+        users = {
+            'developer': self.pick_user('developer', options['developer']),
+            'recruiter': self.pick_user('recruiter', options['recruiter']),
+        }
+        job_id = options['job']
+        if job_id is None and any(TARGETS[name][2] for name in targets):
+            job = (
+                Job.objects.filter(recruiter=users['recruiter'])
+                .annotate(n_applications=Count('applications'))
+                .order_by('-n_applications').first()
+            )
+            if job is None:
+                raise CommandError(f"{users['recruiter'].email} has no jobs; pass --job.")
+            job_id = job.pk
+
+        results = {
+            'revision': git_revision(),
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connections['default'].vendor,
+            'rows': {
+                'users': User.objects.count(),
+                'jobs': Job.objects.count(),
+                'applications': Application.objects.count(),
+            },
+            'developer': users['developer'].email,
+            'recruiter': users['recruiter'].email,
+            'job_id': job_id,
+            'repeat': options['repeat'],
+            'pages': {},
+        }
+
+        # The test client's host name is only allowed automatically under the test runner
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            clients = {}
+            for kind, user in users.items():
+                clients[kind] = Client()
+                clients[kind].force_login(user)
+            for name in targets:
+                kind, url_name, needs_job = TARGETS[name]
+                url = reverse(url_name, args=[job_id] if needs_job else [])
+                results['pages'][name] = self.measure(clients[kind], url, options['repeat'], options['warmup'])
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+        else:
+            self.write_table(results)
+
+        if options['compare']:
+            with open(options['compare']) as f:
+                self.write_comparison(json.load(f), results)
+
+    def pick_user(self, kind, email):
+        users = User.objects.filter(user_type=kind)
+        if email:
+            user = users.filter(email=email).first()
+            if user is None:
+                raise CommandError(f"No {kind} with email {email}.")
+            return user
+        user = users.filter(email=f'{EMAIL_PREFIX}{kind}-0@example.com').first() or users.order_by('id').first()
+        if user is None:
+            raise CommandError(f"No {kind} accounts found; run seed_bench first.")
+        return user
+
+    def measure(self, client, url, repeat, warmup):
+        for _ in range(warmup):
+            client.get(url)
+
+        latencies = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            response = client.get(url)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code != 200:
+                raise CommandError(f"GET {url} returned {response.status_code}.")
+
+        # Query counting and tracemalloc both slow requests down, so they get
+        # their own untimed requests
+        with ExitStack() as stack:
+            captured = [stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in connections]
+            client.get(url)
+        queries = sum(len(c) for c in captured)
+
+        tracemalloc.start()
+        try:
+            client.get(url)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        latencies.sort()
+        return {
+            'url': url,
+            'median_ms': round(statistics.median(latencies), 2),
+            'p95_ms': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 2),
+            'min_ms': round(latencies[0], 2),
+            'mean_ms': round(statistics.fmean(latencies), 2),
+            'queries': queries,
+            'peak_memory_kb': round(peak / 1024),
+            'response_bytes': len(response.content),
+        }
+
+    def write_table(self, results):
+        rows = results['rows']
+        self.stdout.write(
+            f"revision {results['revision'] or '-'} on {results['database']}: {rows['users']} users, "
+            f"{rows['jobs']} jobs, {rows['applications']} applications; {results['repeat']} requests per page"
+        )
+        self.stdout.write(f"{'page':<20} {'median ms':>10} {'p95 ms':>10} {'queries':>8} {'peak KB':>9}")
+        for name, r in results['pages'].items():
+            self.stdout.write(
+                f"{name:<20} {r['median_ms']:>10.1f} {r['p95_ms']:>10.1f} {r['queries']:>8} {r['peak_memory_kb']:>9}"
+            )
+
+    def write_comparison(self, before, after):
+        self.stdout.write(f"\nCompared with revision {before.get('revision') or '-'}:")
+        for name, r in after['pages'].items():
+            old = before.get('pages', {}).get(name)
+            if not old:
+                continue
+            change = (r['median_ms'] - old['median_ms']) / old['median_ms'] * 100 if old['median_ms'] else 0.0
+            self.stdout.write(
+                f"{name:<20} {old['median_ms']:>10.1f} -> {r['median_ms']:>10.1f} ms ({change:+.1f}%)  "
+                f"queries {old['queries']} -> {r['queries']}  peak KB {old['peak_memory_kb']} -> {r['peak_memory_kb']}"
+            )
@@ -0,0 +1,275 @@
+import asyncio
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.cookies import SimpleCookie
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from accounts.models import DeveloperProfile, User
+from jobs.models import Application, Job
+from jobs.services import rebuild_application_counts
+
+LOADTEST_EMAIL = 'loadtest-developer@example.com'
+LOADTEST_USERNAME = 'loadtest'
+
+PAGES = {
+    'dashboard': 'developer:dashboard',
+    'my_applications': 'developer:applications',
+}
+
+
+class FakeProfileAPI:
+    """
+    Local stand-in for the GitHub API, LeetCode GraphQL and the LeetCode
+    submissions API: a small HTTP/1.1 keep-alive server on its own event loop
+    thread that answers every request with canned JSON after ``latency``
+    seconds.
+    """
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+        self.port = None
+        self._loop = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    @property
+    def base_url(self):
+        return f'http://127.0.0.1:{self.port}'
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, name='fake-profile-api', daemon=True)
+        self._thread.start()
+        if not self._ready.wait(10):
+            raise CommandError("The fake API server did not start.")
+        return self
+
+    def __exit__(self, *exc_info):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        server = self._loop.run_until_complete(asyncio.start_server(self._handle, '127.0.0.1', 0, backlog=1024))
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            server.close()
+            self._loop.close()
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                length = 0
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    if name.strip().lower() == 'content-length':
+                        length = int(value)
+                body = await reader.readexactly(length) if length else b''
+
+                self.calls += 1
+                await asyncio.sleep(self.latency)
+                payload = json.dumps(self.route(method, target.split('?', 1)[0], body)).encode()
+                writer.write(
+                    b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+                    b'Content-Length: %d\r\n\r\n%s' % (len(payload), payload)
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def route(self, method, path, body):
+        if path.startswith('/github/'):
+            if path.endswith('/repos'):
+                return [
+                    {
+                        'name': f'project-{i}', 'html_url': f'https://github.com/example/project-{i}',
+                        'language': ['Python', 'JavaScript', 'Go'][i % 3], 'description': 'Example project',
+                        'stargazers_count': i * 3, 'forks_count': i, 'updated_at': '2024-05-01T12:00:00Z',
+                    }
+                    for i in range(30)
+                ]
+            return {'public_repos': 30, 'followers': 240}
+
+        if path.startswith('/submissions/'):
+            return [
+                {
+                    'title': f'Problem {i}', 'titleSlug': f'problem-{i}', 'runtime': '52 ms',
+                    'memory': '16.4 MB', 'statusDisplay': 'Accepted',
+                }
+                for i in range(20)
+            ]
+
+        query = json.loads(body or b'{}').get('query', '')
+        if 'userContestRanking' in query:
+            return {'data': {'userContestRanking': {'rating': 1750.5, 'globalRanking': 42000, 'topPercentage': 12.3}}}
+        if 'question(' in query:
+            return {'data': {'question': {'difficulty': 'Medium'}}}
+        return {'data': {'matchedUser': {
+            'submitStats': {'acSubmissionNum': [
+                {'difficulty': 'All', 'count': 420}, {'difficulty': 'Easy', 'count': 200},
+                {'difficulty': 'Medium', 'count': 180}, {'difficulty': 'Hard', 'count': 40},
+            ]},
+            'profile': {'ranking': 120000, 'reputation': 10},
+            'tagProblemCounts': {
+                'advanced': [{'tagName': 'Dynamic Programming', 'problemsSolved': 60}],
+                'intermediate': [{'tagName': 'Hash Table', 'problemsSolved': 110}],
+                'fundamental': [{'tagName': 'Array', 'problemsSolved': 210}],
+            },
+        }}}
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test the developer dashboard pages against a local fake GitHub/LeetCode API "
+        "with artificial latency. 'asgi' mode sends all requests concurrently through the "
+        "ASGI handler on one event loop; 'wsgi' mode sends them from a pool of --threads "
+        "threads through the WSGI handler, like a threaded sync server."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page', choices=list(PAGES), default='dashboard')
+        parser.add_argument('--mode', choices=['asgi', 'wsgi', 'both'], default='both')
+        parser.add_argument('--requests', type=int, default=200, help='Total requests per mode')
+        parser.add_argument('--concurrency', type=int, default=50, help='Requests in flight at once (asgi mode)')
+        parser.add_argument('--threads', type=int, default=8, help='Worker threads (wsgi mode)')
+        parser.add_argument('--latency-ms', type=float, default=200, help='Delay the fake API adds to every call')
+        parser.add_argument('--applications', type=int, default=5,
+                            help='Applications to give the load test developer when it is created')
+        parser.add_argument('--json', action='store_true', help='Emit results as JSON')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1:
+            raise CommandError("--requests must be at least 1.")
+        user = self.load_test_user(options['applications'])
+        url = reverse(PAGES[options['page']])
+        modes = ['asgi', 'wsgi'] if options['mode'] == 'both' else [options['mode']]
+
+        results = {
+            'page': options['page'],
+            'url': url,
+            'latency_ms': options['latency_ms'],
+            'requests': options['requests'],
+            'modes': {},
+        }
+        with FakeProfileAPI(options['latency_ms'] / 1000) as api, override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+            GITHUB_API_URL=f'{api.base_url}/github',
+            LEETCODE_GRAPHQL_URL=f'{api.base_url}/graphql',
+            LEETCODE_SUBMISSIONS_API_URL=f'{api.base_url}/submissions',
+        ):
+            for mode in modes:
+                calls_before = api.calls
+                if mode == 'asgi':
+                    result = asyncio.run(self.run_asgi(user, url, options['requests'], options['concurrency']))
+                    result['concurrency'] = options['concurrency']
+                else:
+                    result = self.run_wsgi(user, url, options['requests'], options['threads'])
+                    result['threads'] = options['threads']
+                result['api_calls_per_request'] = round((api.calls - calls_before) / options['requests'], 1)
+                results['modes'][mode] = result
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+        else:
+            self.write_table(results)
+
+    def load_test_user(self, applications):
+        """The developer the pages are loaded as, with GitHub and LeetCode linked"""
+        user = User.objects.filter(email=LOADTEST_EMAIL).first()
+        if user is None:
+            user = User.objects.create_user(email=LOADTEST_EMAIL, password=None, user_type='developer')
+            DeveloperProfile.objects.create(
+                user=user, username=LOADTEST_USERNAME, phone='9000000000', location='Remote',
+                title='Software Engineer', experience='4 years', salary=90000,
+                summary='Account used by run_load_test.', skills=['python', 'django', 'javascript', 'sql'],
+                github_url=f'https://github.com/{LOADTEST_USERNAME}',
+                leetcode_url=f'https://leetcode.com/u/{LOADTEST_USERNAME}/',
+            )
+            jobs = Job.objects.filter(status='published').order_by('-id')[:applications]
+            Application.objects.bulk_create([Application(job=job, developer=user) for job in jobs])
+            rebuild_application_counts({job.recruiter_id for job in jobs})
+        return user
+
+    async def run_asgi(self, user, url, total, concurrency):
+        client = AsyncClient()
+        await client.aforce_login(user)
+        slots = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with slots:
+                started = time.perf_counter()
+                response = await client.get(url)
+                return time.perf_counter() - started, response.status_code
+
+        started = time.perf_counter()
+        outcomes = await asyncio.gather(*(one() for _ in range(total)))
+        return self.summarize(outcomes, time.perf_counter() - started)
+
+    def run_wsgi(self, user, url, total, threads):
+        logged_in = Client()
+        logged_in.force_login(user)
+        local = threading.local()
+
+        def one(_):
+            client = getattr(local, 'client', None)
+            if client is None:
+                client = local.client = Client()
+                client.cookies = SimpleCookie({name: morsel.value for name, morsel in logged_in.cookies.items()})
+            started = time.perf_counter()
+            response = client.get(url)
+            return time.perf_counter() - started, response.status_code
+
+        def finish(_):
+            close_old_connections()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(threads) as pool:
+            outcomes = list(pool.map(one, range(total)))
+            elapsed = time.perf_counter() - started
+            # Worker threads opened their own database connections
+            list(pool.map(finish, range(threads)))
+        return self.summarize(outcomes, elapsed)
+
+    def summarize(self, outcomes, elapsed):
+        latencies = sorted(seconds * 1000 for seconds, _ in outcomes)
+        return {
+            'seconds': round(elapsed, 2),
+            'requests_per_second': round(len(outcomes) / elapsed, 1),
+            'median_ms': round(statistics.median(latencies), 1),
+            'p95_ms': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 1),
+            'errors': sum(1 for _, status in outcomes if status != 200),
+        }
+
+    def write_table(self, results):
+        self.stdout.write(
+            f"{results['page']} ({results['url']}): {results['requests']} requests per mode, "
+            f"fake API latency {results['latency_ms']:g} ms"
+        )
+        self.stdout.write(f"{'mode':<6} {'workers':>8} {'req/s':>8} {'median ms':>10} {'p95 ms':>10} {'API calls':>10} {'errors':>7}")
+        for mode, r in results['modes'].items():
+            workers = r.get('concurrency', r.get('threads'))
+            self.stdout.write(
+                f"{mode:<6} {workers:>8} {r['requests_per_second']:>8.1f} {r['median_ms']:>10.1f} "
+                f"{r['p95_ms']:>10.1f} {r['api_calls_per_request']:>10} {r['errors']:>7}"
+            )
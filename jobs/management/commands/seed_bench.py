@@ -0,0 +1,210 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import DeveloperProfile, RecruiterProfile, User
+from jobs.geo import location_fields
+from jobs.models import Application, Job
+from jobs.dedupe import rebuild_duplicates
+from jobs.services import rebuild_application_counts
+from jobs.text_similarity import JOB, PROFILE, refresh_vectors
+
+# Every generated account uses this prefix, so --clear can find them again
+EMAIL_PREFIX = 'bench-'
+BENCH_PASSWORD = 'BenchPassword123#'
+
+ROLES = {
+    'frontend': (['Frontend Developer', 'UI Engineer', 'React Developer'],
+                 ['javascript', 'typescript', 'react', 'vue', 'angular', 'html', 'css', 'sass', 'bootstrap']),
+    'backend': (['Backend Developer', 'Python Developer', 'Java Engineer'],
+                ['python', 'java', 'django', 'flask', 'spring', 'node.js', 'express', 'postgresql', 'redis']),
+    'fullstack': (['Full Stack Developer', 'Software Engineer', 'Web Developer'],
+                  ['javascript', 'python', 'react', 'node.js', 'django', 'mongodb', 'postgresql', 'git']),
+    'data': (['Data Scientist', 'Data Analyst', 'Machine Learning Engineer'],
+             ['python', 'pandas', 'numpy', 'scikit-learn', 'tensorflow', 'pytorch', 'sql', 'r']),
+    'mobile': (['Mobile Developer', 'Android Developer', 'iOS Developer'],
+               ['react native', 'flutter', 'swift', 'kotlin', 'java', 'objective-c', 'firebase']),
+    'devops': (['DevOps Engineer', 'Site Reliability Engineer', 'Cloud Engineer'],
+               ['docker', 'kubernetes', 'aws', 'jenkins', 'terraform', 'ansible', 'linux', 'azure']),
+}
+COMMON_SKILLS = ['git', 'sql', 'agile', 'rest api', 'communication', 'teamwork', 'problem solving']
+LEVELS = [('Junior', 0, 2), ('', 2, 5), ('Senior', 5, 9), ('Lead', 8, 15)]
+LOCATIONS = ['Mumbai', 'Pune', 'Bangalore', 'Hyderabad', 'Delhi', 'Chennai', 'Remote', 'San Francisco', 'London']
+JOB_TYPES = ['full-time', 'full-time', 'full-time', 'contract', 'part-time', 'internship']
+APPLICATION_STATUSES = ['applied'] * 5 + ['under_review'] * 2 + ['interview', 'hired', 'rejected', 'rejected']
+COMPANIES = ['Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark Industries', 'Wayne Tech', 'Wonka Labs']
+BENEFITS = ['Health insurance', 'Remote work', 'Flexible hours', 'Stock options', 'Learning budget']
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate synthetic developers, recruiters, jobs and applications for benchmarking "
+        "(see run_bench). Rows are written with bulk_create in batches, so model signals do "
+        "not run; use rebuild_candidate_index afterwards if search should cover them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--developers', type=int, default=100_000)
+        parser.add_argument('--recruiters', type=int, default=500)
+        parser.add_argument('--jobs', type=int, default=50_000)
+        parser.add_argument('--applications', type=int, default=1_000_000)
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per INSERT batch')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed, for reproducible data')
+        parser.add_argument('--clear', action='store_true', help='Delete previously generated data first')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        bench_users = User.objects.filter(email__startswith=EMAIL_PREFIX)
+
+        if options['clear']:
+            started = time.perf_counter()
+            deleted, _ = bench_users.delete()
+            self.stdout.write(f"Deleted {deleted} rows of earlier benchmark data in {time.perf_counter() - started:.1f}s")
+        elif bench_users.exists():
+            raise CommandError("Benchmark data already exists; pass --clear to regenerate it.")
+
+        if options['applications'] > options['developers'] * options['jobs']:
+            raise CommandError("More applications requested than developer/job pairs.")
+
+        # Hashing is deliberately slow; do it once and share the hash
+        self.password = make_password(BENCH_PASSWORD)
+
+        self.step('recruiters', self.create_recruiters, options['recruiters'])
+        self.step('developers', self.create_developers, options['developers'])
+        self.step('jobs', self.create_jobs, options['jobs'])
+        self.step('applications', self.create_applications, options['applications'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Benchmark data ready. Log in as {EMAIL_PREFIX}developer-0@example.com or "
+            f"{EMAIL_PREFIX}recruiter-0@example.com with password {BENCH_PASSWORD}."
+        ))
+
+    def step(self, label, func, count):
+        started = time.perf_counter()
+        with transaction.atomic():
+            func(count)
+        elapsed = time.perf_counter() - started
+        rate = count / elapsed if elapsed else 0
+        self.stdout.write(f"Created {count} {label} in {elapsed:.1f}s ({rate:,.0f}/s)")
+
+    def batches(self, count):
+        for start in range(0, count, self.batch_size):
+            yield range(start, min(start + self.batch_size, count))
+
+    def create_users(self, kind, indexes):
+        users = User.objects.bulk_create([
+            User(email=f'{EMAIL_PREFIX}{kind}-{i}@example.com', user_type=kind, password=self.password)
+            for i in indexes
+        ])
+        if users and users[0].pk is None:
+            # Backends that cannot return primary keys from bulk inserts
+            emails = [u.email for u in users]
+            users = list(User.objects.filter(email__in=emails).order_by('id'))
+        return users
+
+    def create_recruiters(self, count):
+        self.recruiter_ids = []
+        for indexes in self.batches(count):
+            users = self.create_users('recruiter', indexes)
+            RecruiterProfile.objects.bulk_create([
+                RecruiterProfile(
+                    user=user, username=f'recruiter{i}', phone='9000000000',
+                    company=f'{self.rng.choice(COMPANIES)} {i}', industry='Technology',
+                )
+                for i, user in zip(indexes, users)
+            ])
+            self.recruiter_ids.extend(user.pk for user in users)
+
+    def create_developers(self, count):
+        rng = self.rng
+        self.developer_ids = []
+        for indexes in self.batches(count):
+            users = self.create_users('developer', indexes)
+            profiles = []
+            for i, user in zip(indexes, users):
+                role = rng.choice(list(ROLES))
+                titles, skills = ROLES[role]
+                level, min_years, max_years = rng.choice(LEVELS)
+                years = rng.randint(min_years, max_years)
+                location = rng.choice(LOCATIONS)
+                profiles.append(DeveloperProfile(
+                    user=user,
+                    username=f'developer{i}',
+                    phone='9000000000',
+                    location=location,
+                    **location_fields(location),  # bulk_create skips save()
+                    title=f'{level} {rng.choice(titles)}'.strip(),
+                    experience=f'{years} years',
+                    salary=rng.randrange(30_000, 200_000, 5000),
+                    summary=f'{role.title()} developer with {years} years of experience.',
+                    skills=rng.sample(skills, rng.randint(3, min(8, len(skills))))
+                    + rng.sample(COMMON_SKILLS, rng.randint(0, 3)),
+                ))
+            DeveloperProfile.objects.bulk_create(profiles)
+            refresh_vectors(PROFILE, profiles)  # bulk_create skips the signal that does this
+            self.developer_ids.extend(user.pk for user in users)
+
+    def create_jobs(self, count):
+        rng = self.rng
+        self.job_ids = []
+        for indexes in self.batches(count):
+            jobs = []
+            for i in indexes:
+                role = rng.choice(list(ROLES))
+                titles, skills = ROLES[role]
+                level, min_years, max_years = rng.choice(LEVELS)
+                title = f'{level} {rng.choice(titles)}'.strip()
+                salary_min = rng.randrange(30_000, 150_000, 5000)
+                location = rng.choice(LOCATIONS)
+                jobs.append(Job(
+                    recruiter_id=rng.choice(self.recruiter_ids),
+                    title=title,
+                    department='Engineering',
+                    job_type=rng.choice(JOB_TYPES),
+                    location=location,
+                    **location_fields(location),
+                    salary_min=salary_min,
+                    salary_max=salary_min + rng.randrange(10_000, 60_000, 5000),
+                    description=(
+                        f'We are hiring a {title} with {min_years}+ years of experience '
+                        f'in {", ".join(skills[:3])}.'
+                    ),
+                    requirements=rng.sample(skills, rng.randint(3, min(6, len(skills)))),
+                    benefits=rng.sample(BENEFITS, 2),
+                    status='published' if rng.random() < 0.9 else 'draft',
+                ))
+            created = Job.objects.bulk_create(jobs)
+            if created and created[0].pk is None:
+                raise CommandError("This database backend does not return primary keys from bulk_create.")
+            refresh_vectors(JOB, created)
+            self.job_ids.extend(job.pk for job in created)
+        rebuild_duplicates()  # and the signal that clusters near-duplicate postings
+
+    def create_applications(self, count):
+        rng = self.rng
+        developer_ids, job_ids = self.developer_ids, self.job_ids
+        # Spread applications evenly over developers; each developer applies
+        # to distinct jobs, which keeps (job, developer) unique.
+        per_developer, extra = divmod(count, len(developer_ids)) if developer_ids else (0, 0)
+        now = timezone.now()
+        batch = []
+        for n, developer_id in enumerate(developer_ids):
+            k = per_developer + (1 if n < extra else 0)
+            for job_id in rng.sample(job_ids, k):
+                batch.append(Application(
+                    job_id=job_id, developer_id=developer_id, status=rng.choice(APPLICATION_STATUSES),
+                    applied_at=now - timedelta(minutes=rng.randrange(90 * 24 * 60)),
+                ))
+            if len(batch) >= self.batch_size:
+                Application.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            Application.objects.bulk_create(batch)
+        # bulk_create bypasses the status counters the dashboards read
+        rebuild_application_counts(self.recruiter_ids)
@@ -0,0 +1,139 @@
+import json
+import math
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from jobs import matching_weights
+from jobs.matching_weights import COMPONENTS
+from jobs.views import JobMatchingAI
+from jobs.weight_tuning import Ranking, coordinate_search, load_outcomes, split_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Tune the job matcher's component and skill weights on past application outcomes "
+        "(hired, interview, rejected): NDCG@k of each job's applicants on training jobs is "
+        "improved by coordinate search, then checked against the current weights on held-out "
+        "jobs. The result is stored as a new version of the weights config and made active "
+        "only if it does at least as well there. Use --activate N to restore a version."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=None, help='Use only the most recent N decided applications')
+        parser.add_argument('--k', type=int, default=10, help='Applicants per job that NDCG counts (default 10)')
+        parser.add_argument('--step', type=float, default=0.05, help='Grid step of the component weights')
+        parser.add_argument('--rounds', type=int, default=3, help='Coordinate search rounds at most')
+        parser.add_argument('--validation', type=float, default=0.2, help='Share of jobs held out (default 0.2)')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the held-out job split')
+        parser.add_argument('--no-skills', action='store_true', help='Tune the component weights only')
+        parser.add_argument('--dry-run', action='store_true', help='Report the tuned weights without storing them')
+        parser.add_argument('--force', action='store_true', help='Store the tuned weights even if held-out NDCG drops')
+        parser.add_argument('--activate', type=int, default=None, metavar='VERSION',
+                            help='Make a stored version the active weights and exit')
+        parser.add_argument('--json', action='store_true', help='Emit results as JSON')
+
+    def handle(self, *args, **options):
+        if options['activate'] is not None:
+            try:
+                config = matching_weights.activate(options['activate'])
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Cannot activate version {options['activate']}: {exc}")
+            self.stdout.write(self.style.SUCCESS(f"Matching weights version {config['version']} is active."))
+            return
+        if not 0 < options['step'] <= 0.5:
+            raise CommandError('--step must be in (0, 0.5].')
+        if not 0 <= options['validation'] < 1:
+            raise CommandError('--validation must be in [0, 1).')
+
+        import numpy as np
+
+        started = time.perf_counter()
+        matcher = JobMatchingAI()
+        features = load_outcomes(matcher, limit=options['limit'])
+        if not len(features):
+            raise CommandError('No applications with an outcome (hired, interview, rejected) to tune on.')
+        loaded = time.perf_counter()
+
+        train_rows, held_out_rows = split_jobs(features, validation=options['validation'], seed=options['seed'])
+        train = Ranking(features, train_rows, k=options['k'])
+        held_out = Ranking(features, held_out_rows, k=options['k'])
+        current_weights = np.array([matcher.weights[component] for component in COMPONENTS], dtype=np.float64)
+        current_skills = np.array(
+            [matcher.skill_weights[category][skill] for category, skill in features.skill_keys], dtype=np.float64,
+        )
+        weights, skills, _, evaluations = coordinate_search(
+            features, train, current_weights, current_skills,
+            step=options['step'], rounds=options['rounds'], tune_skills=not options['no_skills'],
+        )
+        current_scores = features.scores(current_weights, current_skills)
+        tuned_scores = features.scores(weights, skills)
+
+        tuned_weights = {component: round(float(value), 4) for component, value in zip(COMPONENTS, weights)}
+        tuned_skills = {}
+        for (category, skill), value, before in zip(features.skill_keys, skills, current_skills):
+            if value != before:
+                tuned_skills.setdefault(category, {})[skill] = round(float(value), 4)
+        result = {
+            'applications': len(features),
+            'ranked_jobs': {'train': train.job_count, 'held_out': held_out.job_count},
+            'k': options['k'],
+            'current': {'train': train.evaluate(current_scores), 'held_out': held_out.evaluate(current_scores)},
+            'tuned': {'train': train.evaluate(tuned_scores), 'held_out': held_out.evaluate(tuned_scores)},
+            'weights': tuned_weights,
+            'skill_weights': tuned_skills,
+            'evaluations': evaluations,
+            'load_seconds': round(loaded - started, 2),
+            'search_seconds': round(time.perf_counter() - loaded, 2),
+            'version': None,
+        }
+        changed = tuned_skills or any(
+            not math.isclose(tuned_weights[component], matcher.weights[component], abs_tol=1e-4)
+            for component in COMPONENTS
+        )
+        improved = result['tuned']['held_out']['ndcg'] >= result['current']['held_out']['ndcg']
+        if changed and not options['dry_run'] and (improved or options['force']):
+            result['version'] = matching_weights.save({
+                'created_at': timezone.now().isoformat(),
+                'weights': tuned_weights,
+                'skill_weights': {
+                    category: {**skills, **tuned_skills.get(category, {})}
+                    for category, skills in matcher.skill_weights.items()
+                },
+                'metrics': {key: result[key] for key in ('applications', 'ranked_jobs', 'k', 'current', 'tuned')},
+            })
+
+        if options['json']:
+            self.stdout.write(json.dumps(result))
+            return
+        self.stdout.write(
+            f"{result['applications']} decided applications, {train.job_count} training and "
+            f"{held_out.job_count} held-out jobs with mixed outcomes; {evaluations} weight settings "
+            f"tried in {result['search_seconds']}s (scoring took {result['load_seconds']}s)"
+        )
+        for name in ('current', 'tuned'):
+            self.stdout.write(
+                f"{name:>8}: NDCG@{options['k']} {_format(result[name]['train']['ndcg'])} train / "
+                f"{_format(result[name]['held_out']['ndcg'])} held out, "
+                f"AUC {_format(result[name]['train']['auc'])} / {_format(result[name]['held_out']['auc'])}"
+            )
+        self.stdout.write('weights: ' + ', '.join(f'{component} {value:.2f}' for component, value in tuned_weights.items()))
+        for category, skills in sorted(tuned_skills.items()):
+            self.stdout.write(
+                f"{category} skills: " + ', '.join(f'{skill} {value:.2f}' for skill, value in sorted(skills.items()))
+            )
+        if result['version'] is not None:
+            self.stdout.write(self.style.SUCCESS(f"Matching weights version {result['version']} is active."))
+        elif not changed:
+            self.stdout.write("The current weights are the best found; nothing stored.")
+        elif options['dry_run']:
+            self.stdout.write("Dry run; weights not stored.")
+        else:
+            self.stdout.write(self.style.WARNING(
+                "Tuned weights do worse on held-out jobs; not stored (use --force to store them anyway)."
+            ))
+
+
+def _format(value):
+    return 'n/a' if math.isnan(value) else f'{value:.4f}'
@@ -0,0 +1,124 @@
+"""
+Versioned weights of the job matcher (jobs.views.JobMatchingAI).
+
+``python manage.py tune_matching_weights`` fits the weight of each score
+component and the per-category skill weights to past application outcomes
+(jobs.weight_tuning). Each result is written to
+settings.MATCHING_WEIGHTS_DIR as ``v<N>.json``:
+
+    {"version": N, "created_at": ..., "weights": {"skills": ..., ...},
+     "skill_weights": {"frontend": {"react": ...}, ...}, "metrics": {...}}
+
+and ``current.json``, a copy of the active version, is replaced
+atomically. Every JobMatchingAI overlays the active version on its
+built-in weights; processes pick up a new one on the next matcher they
+create. Without a config the built-in weights apply, and an older version
+is restored with ``tune_matching_weights --activate N``.
+"""
+import json
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+COMPONENTS = ('skills', 'experience', 'location', 'salary', 'description')
+
+CURRENT_FILE = 'current.json'
+VERSION_RE = re.compile(r'^v(\d+)\.json$')
+
+_lock = threading.Lock()
+_cache = {'key': None, 'config': None}
+
+
+def weights_dir():
+    return Path(settings.MATCHING_WEIGHTS_DIR)
+
+
+def validate(config):
+    """Raise ValueError unless a config has a valid weight for every component"""
+    weights = config.get('weights')
+    if not isinstance(weights, dict) or set(weights) != set(COMPONENTS):
+        raise ValueError(f"weights must give each of {', '.join(COMPONENTS)}")
+    if any(not isinstance(value, (int, float)) or value < 0 for value in weights.values()):
+        raise ValueError('weights must be non-negative numbers')
+    if not sum(weights.values()) > 0:
+        raise ValueError('weights must not all be zero')
+    for category, skills in (config.get('skill_weights') or {}).items():
+        if not isinstance(skills, dict) or any(
+            not isinstance(value, (int, float)) or value <= 0 for value in skills.values()
+        ):
+            raise ValueError(f'skill weights of {category} must be positive numbers')
+
+
+def load_current():
+    """The active config, or None. Re-read only when current.json changes."""
+    path = weights_dir() / CURRENT_FILE
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        if _cache['key'] == key:
+            return _cache['config']
+        try:
+            config = json.loads(path.read_text())
+            validate(config)
+        except (OSError, ValueError) as exc:
+            logger.warning('Ignoring matching weights %s: %s', path, exc)
+            config = None
+        _cache.update(key=key, config=config)
+        return config
+
+
+def apply(matcher):
+    """Overlay the active config on a matcher's built-in weights"""
+    config = load_current()
+    if config is None:
+        return
+    matcher.weights = dict(config['weights'])
+    for category, skills in (config.get('skill_weights') or {}).items():
+        matcher.skill_weights[category] = {**matcher.skill_weights.get(category, {}), **skills}
+
+
+def versions():
+    """Stored version numbers, ascending"""
+    directory = weights_dir()
+    if not directory.is_dir():
+        return []
+    return sorted(int(match.group(1)) for match in map(VERSION_RE.match, os.listdir(directory)) if match)
+
+
+def read_version(version):
+    return json.loads((weights_dir() / f'v{version}.json').read_text())
+
+
+def save(config):
+    """Store a config as the next version and make it active. Returns the version."""
+    validate(config)
+    directory = weights_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    version = (versions() or [0])[-1] + 1
+    config = {'version': version, **{key: value for key, value in config.items() if key != 'version'}}
+    _write(directory / f'v{version}.json', config)
+    _write(directory / CURRENT_FILE, config)
+    return version
+
+
+def activate(version):
+    """Make a stored version the active one"""
+    config = read_version(version)
+    validate(config)
+    _write(weights_dir() / CURRENT_FILE, config)
+    return config
+
+
+def _write(path, config):
+    temporary = path.with_name(path.name + '.tmp')
+    temporary.write_text(json.dumps(config, indent=2, sort_keys=True) + '\n')
+    os.replace(temporary, path)
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_job_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['updated_at'], name='application_updated_at_idx'),
+        ),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:46
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+STATUSES = ['applied', 'under_review', 'interview', 'hired', 'rejected']
+
+
+def backfill(apps, schema_editor):
+    """
+    Counters from the current applications, and reconstructed history for
+    applications that have none yet: a creation event at applied_at and, if
+    the status has moved on, one change from 'applied' at updated_at.
+    """
+    Application = apps.get_model('jobs', 'Application')
+    ApplicationCounter = apps.get_model('jobs', 'ApplicationCounter')
+    ApplicationEvent = apps.get_model('jobs', 'ApplicationEvent')
+
+    rows = {}
+    for recruiter_id, job_id, status, n in (
+        Application.objects.values_list('job__recruiter_id', 'job_id', 'status').annotate(n=Count('id')).order_by()
+    ):
+        if status not in STATUSES:
+            continue
+        for key in ((recruiter_id, job_id), (recruiter_id, None)):
+            row = rows.get(key)
+            if row is None:
+                row = rows[key] = ApplicationCounter(recruiter_id=key[0], job_id=key[1])
+            setattr(row, status, getattr(row, status) + n)
+    ApplicationCounter.objects.bulk_create(rows.values(), batch_size=1000)
+
+    has_history = set(ApplicationEvent.objects.values_list('application_id', flat=True).distinct())
+    events = []
+    applications = Application.objects.order_by('pk').values_list(
+        'pk', 'job_id', 'developer_id', 'status', 'applied_at', 'updated_at',
+    )
+    for pk, job_id, developer_id, status, applied_at, updated_at in applications.iterator(chunk_size=2000):
+        if pk in has_history:
+            continue
+        events.append(ApplicationEvent(
+            application_id=pk, job_id=job_id, from_status='', to_status='applied',
+            changed_by_id=developer_id, created_at=applied_at,
+        ))
+        if status != 'applied':
+            events.append(ApplicationEvent(
+                application_id=pk, job_id=job_id, from_status='applied', to_status=status, created_at=updated_at,
+            ))
+        if len(events) >= 2000:
+            ApplicationEvent.objects.bulk_create(events)
+            events = []
+    ApplicationEvent.objects.bulk_create(events)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_applicationevent'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='applicationevent',
+            name='from_status',
+            field=models.CharField(blank=True, choices=[('applied', 'Applied'), ('under_review', 'Under Review'), ('interview', 'Interview'), ('hired', 'Hired'), ('rejected', 'Rejected')], max_length=20),
+        ),
+        migrations.CreateModel(
+            name='ApplicationCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('applied', models.IntegerField(default=0)),
+                ('under_review', models.IntegerField(default=0)),
+                ('interview', models.IntegerField(default=0)),
+                ('hired', models.IntegerField(default=0)),
+                ('rejected', models.IntegerField(default=0)),
+                ('job', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='application_counter', to='jobs.job')),
+                ('recruiter', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='application_counters', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(condition=models.Q(('job__isnull', True)), fields=('recruiter',), name='application_counter_recruiter_total')],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def locate_existing(apps, schema_editor):
+    """Resolve the place of every existing location, one UPDATE per distinct location"""
+    from jobs.geo import location_fields
+    Job = apps.get_model('jobs', 'Job')
+    locations = Job.objects.exclude(location=None).values_list('location', flat=True).distinct()
+    for location in list(locations):
+        Job.objects.filter(location=location).update(**location_fields(location))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0008_job_external_id'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='place_id',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['latitude', 'longitude'], name='job_lat_lon_idx'),
+        ),
+        migrations.RunPython(locate_existing, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 5.1.1 on 2026-10-19 11:03
+
+from collections import Counter
+
+from django.db import migrations, models
+
+
+def vectorise_existing(apps, schema_editor):
+    """Vectors of the existing jobs and profiles, and the document frequency of every term"""
+    from jobs.text_similarity import JOB, MAX_TERM_COUNT, PROFILE, pack, text_digest, tokenize
+
+    Term = apps.get_model('jobs', 'Term')
+    TextVector = apps.get_model('jobs', 'TextVector')
+    sources = [
+        (JOB, apps.get_model('jobs', 'Job').objects.values_list('pk', 'title', 'description')),
+        (PROFILE, apps.get_model('accounts', 'DeveloperProfile').objects.values_list('pk', 'title', 'summary')),
+    ]
+    documents, job_counts = [], Counter()
+    for kind, rows in sources:
+        for pk, title, body in rows.iterator(chunk_size=2000):
+            text = '\n'.join(filter(None, [title, body]))
+            counts = Counter(tokenize(text))
+            documents.append((kind, pk, text_digest(text), counts))
+            if kind == JOB:
+                job_counts.update(counts.keys())
+    terms = set().union(*(counts for _, _, _, counts in documents))
+    Term.objects.bulk_create(
+        [Term(text=text, job_count=job_counts[text]) for text in sorted(terms)], batch_size=1000,
+    )
+    vocabulary = dict(Term.objects.values_list('text', 'id'))
+
+    vectors = []
+    for kind, pk, digest, counts in documents:
+        pairs = sorted((vocabulary[term], min(n, MAX_TERM_COUNT)) for term, n in counts.items())
+        vectors.append(TextVector(
+            kind=kind, object_id=pk, digest=digest,
+            term_ids=pack('I', [term_id for term_id, _ in pairs]), counts=pack('H', [n for _, n in pairs]),
+        ))
+    TextVector.objects.bulk_create(vectors, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_developerprofile_place'),
+        ('jobs', '0009_job_place'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Term',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.CharField(max_length=64, unique=True)),
+                ('job_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TextVector',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('job', 'Job'), ('profile', 'Developer profile')], max_length=10)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('digest', models.CharField(max_length=32)),
+                ('term_ids', models.BinaryField()),
+                ('counts', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'updated_at'], name='text_vector_updated_idx')],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='text_vector_object')],
+            },
+        ),
+        migrations.RunPython(vectorise_existing, migrations.RunPython.noop),
+    ]
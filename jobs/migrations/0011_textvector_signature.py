@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-19 11:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_text_vectors'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='textvector',
+            name='signature',
+            field=models.BinaryField(null=True),
+        ),
+    ]
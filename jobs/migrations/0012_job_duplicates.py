@@ -0,0 +1,32 @@
+# Generated by Django 5.1.1 on 2026-10-19 11:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0011_textvector_signature'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='duplicate_of',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicates', to='jobs.job'),
+        ),
+        migrations.CreateModel(
+            name='JobBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField()),
+                ('key', models.BigIntegerField()),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='jobs.job')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['key'], name='job_bucket_key_idx')],
+                'constraints': [models.UniqueConstraint(fields=('job', 'band'), name='job_bucket_band')],
+            },
+        ),
+    ]
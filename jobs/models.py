@@ -1,6 +1,8 @@
 from django.db import models
 from django.conf import settings
 
+from .geo import LocatedModel
+
 JOB_TYPE_CHOICES = [
     ('full-time', 'Full-time'),
     ('part-time', 'Part-time'),
@@ -13,7 +15,7 @@ STATUS_CHOICES = [
     ('published', 'Published'),
 ]
 
-class Job(models.Model):
+class Job(LocatedModel):
     recruiter = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='jobs')
     title = models.CharField(max_length=255)
     department = models.CharField(max_length=255, blank=True, null=True)
@@ -26,6 +28,21 @@ class Job(models.Model):
     benefits = models.JSONField(default=list, blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='draft')
     created_at = models.DateTimeField(auto_now_add=True)
+    # The recruiter's own id for the posting, which bulk imports upsert on
+    external_id = models.CharField(max_length=255, blank=True, null=True)
+    # The oldest published job this one is a near-duplicate of (jobs.dedupe)
+    duplicate_of = models.ForeignKey(
+        'self', on_delete=models.SET_NULL, null=True, blank=True, related_name='duplicates',
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['recruiter', 'external_id'], name='job_recruiter_external_id'),
+        ]
+        indexes = [
+            # "Jobs within X km" range queries (jobs.geo.bounding_box_q)
+            models.Index(fields=['latitude', 'longitude'], name='job_lat_lon_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -56,10 +73,130 @@ class Application(models.Model):
     class Meta:
         unique_together = ('job', 'developer')  # Prevent duplicate applications
         ordering = ['-applied_at']
+        indexes = [
+            # Live recruiter events poll for recently changed applications (jobs.events)
+            models.Index(fields=['updated_at'], name='application_updated_at_idx'),
+        ]
     
     def __str__(self):
         return f"{self.developer.email} - {self.job.title}"
     
     @property
     def days_since_applied(self):
-        return (timezone.now() - self.applied_at).days
\ No newline at end of file
+        return (timezone.now() - self.applied_at).days
+
+
+class ApplicationEvent(models.Model):
+    """Append-only history of application status changes; an empty from_status marks the application itself"""
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='events')
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='application_events')
+    from_status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES, blank=True)
+    to_status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    changed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    notes = models.TextField(blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['application', 'created_at'], name='app_event_application_idx'),
+            models.Index(fields=['job', 'created_at'], name='app_event_job_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.application_id}: {self.from_status} -> {self.to_status}"
+
+
+class ApplicationCounter(models.Model):
+    """
+    Application counts by status, kept up to date by jobs.services in the
+    same transaction as every status change. One row per job, plus one per
+    recruiter (job is NULL) for all of their jobs. Rows are created the first
+    time they are needed; rebuild_application_counts recomputes them.
+    """
+    recruiter = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='application_counters')
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, null=True, blank=True, related_name='application_counter')
+    applied = models.IntegerField(default=0)
+    under_review = models.IntegerField(default=0)
+    interview = models.IntegerField(default=0)
+    hired = models.IntegerField(default=0)
+    rejected = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['recruiter'], condition=models.Q(job__isnull=True), name='application_counter_recruiter_total',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.job_id or 'all jobs'} ({self.recruiter_id}): {self.total}"
+
+    @property
+    def total(self):
+        return sum(self.as_dict().values())
+
+    def as_dict(self):
+        return {status: getattr(self, status) for status, _ in Application.STATUS_CHOICES}
+
+
+class JobBucket(models.Model):
+    """One LSH band of a job's MinHash signature, to look up near-duplicate jobs (jobs.dedupe)"""
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='+')
+    band = models.PositiveSmallIntegerField()
+    key = models.BigIntegerField()  # hash of the band's values and its number
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'band'], name='job_bucket_band'),
+        ]
+        indexes = [
+            models.Index(fields=['key'], name='job_bucket_key_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.job_id} band {self.band}"
+
+
+class Term(models.Model):
+    """Vocabulary of the description similarity vectors (jobs.text_similarity)"""
+    text = models.CharField(max_length=64, unique=True)
+    # Jobs whose vector contains the term (its document frequency), kept up
+    # to date as job vectors are refreshed
+    job_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return self.text
+
+
+class TextVector(models.Model):
+    """
+    Term counts of a job's or developer profile's text, as packed arrays of
+    term ids (uint32, ascending) and counts (uint16). IDF weights are applied
+    when vectors are compared, so a vector only changes with its own text
+    (and its signature with its own text and skills).
+    """
+    KIND_CHOICES = [
+        ('job', 'Job'),
+        ('profile', 'Developer profile'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    digest = models.CharField(max_length=32)  # of the vectorised text, to skip unchanged documents
+    term_ids = models.BinaryField()
+    counts = models.BinaryField()
+    # 256-bit LSH signature of the text and skills (jobs.similarity_index)
+    signature = models.BinaryField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='text_vector_object'),
+        ]
+        indexes = [
+            models.Index(fields=['kind', 'updated_at'], name='text_vector_updated_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id}"
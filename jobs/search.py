@@ -0,0 +1,178 @@
+"""
+Keyword search over jobs.
+
+On SQLite the index is an external-content FTS5 table (``jobs_job_fts``)
+mirroring ``jobs_job`` and kept in sync by triggers; results are ranked
+with BM25. On PostgreSQL the same columns are searched through a GIN
+expression index on a weighted ``tsvector`` and ranked with ``ts_rank_cd``.
+"""
+
+import re
+
+from django.db import connections, router
+from django.db.models import Q
+
+from .models import Job
+
+FTS_TABLE = 'jobs_job_fts'
+
+# bm25() column weights, in FTS column order
+BM25_WEIGHTS = {
+    'title': 10.0,
+    'department': 3.0,
+    'description': 1.0,
+    'requirements': 6.0,
+}
+
+SQLITE_INDEX_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, department, description, requirements,
+        content='jobs_job', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON jobs_job BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, department, description, requirements)
+        VALUES (new.id, new.title, new.department, new.description, new.requirements);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON jobs_job BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, department, description, requirements)
+        VALUES ('delete', old.id, old.title, old.department, old.description, old.requirements);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+    AFTER UPDATE OF title, department, description, requirements ON jobs_job BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, department, description, requirements)
+        VALUES ('delete', old.id, old.title, old.department, old.description, old.requirements);
+        INSERT INTO {FTS_TABLE}(rowid, title, department, description, requirements)
+        VALUES (new.id, new.title, new.department, new.description, new.requirements);
+    END
+    """,
+]
+
+SQLITE_TRIGGERS = [f'{FTS_TABLE}_ai', f'{FTS_TABLE}_ad', f'{FTS_TABLE}_au']
+
+# Must match the expression used by the PostgreSQL index exactly so the
+# planner can use it.
+POSTGRES_SEARCH_VECTOR = (
+    "(setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(requirements::text, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(department, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C'))"
+)
+
+POSTGRES_INDEX_SQL = [
+    f"CREATE INDEX IF NOT EXISTS jobs_job_search_idx ON jobs_job USING GIN ({POSTGRES_SEARCH_VECTOR})",
+]
+
+_TERM_RE = re.compile(r'[^\s"]+')
+
+
+def install_search_index(connection):
+    """Create the search index for ``connection`` if it does not exist yet."""
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'jobs_job'"
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+            for statement in SQLITE_INDEX_SQL:
+                cursor.execute(statement)
+            if not set(SQLITE_TRIGGERS) <= existing:
+                # The triggers were missing (new index, or jobs_job was rebuilt
+                # by a migration), so the index may be stale: rebuild it.
+                cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    elif connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            for statement in POSTGRES_INDEX_SQL:
+                cursor.execute(statement)
+
+
+def repair_search_index(sender, using, **kwargs):
+    """
+    post_migrate receiver re-creating the SQLite triggers after a migration
+    rebuilt ``jobs_job`` (SQLite table remakes drop the table's triggers).
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    if FTS_TABLE in connection.introspection.table_names():
+        install_search_index(connection)
+
+
+def uninstall_search_index(connection):
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            for trigger in SQLITE_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    elif connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute("DROP INDEX IF EXISTS jobs_job_search_idx")
+
+
+def build_fts_query(text):
+    """
+    Turn free text into a safe FTS5 query.
+
+    Every term is quoted so punctuation such as ``c++`` or ``node.js`` cannot
+    be read as query syntax; terms are ANDed and the last one is matched as a
+    prefix so partially typed words still find results.
+    """
+    terms = _TERM_RE.findall(text or '')
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def search_jobs(query, status='published', limit=200):
+    """
+    Return ``[(job_id, relevance), ...]`` for jobs matching ``query``, best first.
+
+    Relevance is positive and only comparable within one result set.
+    """
+    alias = router.db_for_read(Job) or 'default'
+    connection = connections[alias]
+
+    if connection.vendor == 'sqlite':
+        fts_query = build_fts_query(query)
+        if not fts_query:
+            return []
+        weights = ', '.join(str(w) for w in BM25_WEIGHTS.values())
+        sql = f"""
+            SELECT j.id, -bm25({FTS_TABLE}, {weights}) AS relevance
+            FROM {FTS_TABLE}
+            JOIN jobs_job j ON j.id = {FTS_TABLE}.rowid
+            WHERE {FTS_TABLE} MATCH %s AND j.status = %s
+            ORDER BY bm25({FTS_TABLE}, {weights})
+            LIMIT %s
+        """
+        params = [fts_query, status, limit]
+    elif connection.vendor == 'postgresql':
+        if not (query or '').strip():
+            return []
+        sql = f"""
+            SELECT id, ts_rank_cd({POSTGRES_SEARCH_VECTOR}, q) AS relevance
+            FROM jobs_job, websearch_to_tsquery('english', %s) q
+            WHERE {POSTGRES_SEARCH_VECTOR} @@ q AND status = %s
+            ORDER BY relevance DESC
+            LIMIT %s
+        """
+        params = [query, status, limit]
+    else:
+        # No native full-text search: fall back to a substring filter
+        qs = Job.objects.filter(status=status)
+        for term in _TERM_RE.findall(query or ''):
+            qs = qs.filter(Q(title__icontains=term) | Q(description__icontains=term))
+        return [(job_id, 1.0) for job_id in qs.values_list('id', flat=True)[:limit]]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [(row[0], float(row[1])) for row in cursor.fetchall()]
@@ -0,0 +1,215 @@
+"""
+Application status changes that touch several tables at once. Views call
+these instead of saving Application rows themselves.
+
+Every new application and status change is written together with an
+ApplicationEvent history row and the matching ApplicationCounter updates
+(``SET applied = applied + 1`` etc.), in one transaction, so dashboards can
+read the counters instead of counting applications.
+"""
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .events import publish_application_event
+from .models import Application, ApplicationCounter, ApplicationEvent
+
+STATUSES = [value for value, _ in Application.STATUS_CHOICES]
+
+# Applications one bulk request may change
+BULK_STATUS_LIMIT = 1000
+
+
+def record_application(job, developer):
+    """Create an application in the 'applied' status, with its history row and counters"""
+    with transaction.atomic():
+        application = Application.objects.create(job=job, developer=developer, status='applied')
+        ApplicationEvent.objects.create(
+            application=application, job=job, from_status='', to_status='applied',
+            changed_by=developer, created_at=application.applied_at,
+        )
+        adjust_counters(job.recruiter_id, {job.pk: {'applied': 1}})
+        publish_application_event(application, recruiter_id=job.recruiter_id)
+    return application
+
+
+def change_status(application, status, changed_by, notes=''):
+    """
+    Move one application to ``status``; ``application.job`` must belong to
+    the recruiter. The row is locked first, so concurrent changes cannot
+    count the same previous status twice. Notes are saved even when the
+    status stays the same. Returns the previous status.
+    """
+    if status not in STATUSES:
+        raise ValueError(f"Invalid status: {status}")
+    with transaction.atomic():
+        old_status = Application.objects.select_for_update().values_list('status', flat=True).get(pk=application.pk)
+        application.status = status
+        if notes:
+            application.notes = notes
+        application.save(update_fields=['status', 'notes', 'updated_at'])
+        if status != old_status:
+            ApplicationEvent.objects.create(
+                application=application, job_id=application.job_id, from_status=old_status, to_status=status,
+                changed_by=changed_by, notes=notes, created_at=application.updated_at,
+            )
+            adjust_counters(application.job.recruiter_id, {application.job_id: {old_status: -1, status: 1}})
+            publish_application_event(application, old_status, recruiter_id=application.job.recruiter_id)
+    return old_status
+
+
+def bulk_update_status(recruiter, application_ids, status, notes=''):
+    """
+    Move the recruiter's applications to ``status`` in one transaction.
+
+    Ownership is checked with a single query; the applications that change
+    are updated with one ``UPDATE ... WHERE id IN (...)`` and get a history
+    row each, written with bulk_create. Returns one result per distinct id,
+    in request order: ``{'id', 'result', 'old_status'}`` where result is
+    'updated', 'unchanged' (already in that status) or 'not_found' (missing
+    or on another recruiter's job).
+    """
+    if status not in STATUSES:
+        raise ValueError(f"Invalid status: {status}")
+    application_ids = list(dict.fromkeys(application_ids))
+    if len(application_ids) > BULK_STATUS_LIMIT:
+        raise ValueError(f"At most {BULK_STATUS_LIMIT} applications can be updated at once")
+
+    with transaction.atomic():
+        current = {
+            pk: (old_status, job_id)
+            for pk, old_status, job_id in Application.objects.select_for_update()
+            .filter(id__in=application_ids, job__recruiter=recruiter)
+            .values_list('id', 'status', 'job_id')
+        }
+        changed = [pk for pk in application_ids if pk in current and current[pk][0] != status]
+
+        if changed:
+            now = timezone.now()
+            fields = {'status': status, 'updated_at': now}  # update() skips auto_now
+            if notes:
+                fields['notes'] = notes
+            Application.objects.filter(id__in=changed).update(**fields)
+            ApplicationEvent.objects.bulk_create([
+                ApplicationEvent(
+                    application_id=pk, job_id=current[pk][1], from_status=current[pk][0], to_status=status,
+                    changed_by=recruiter, notes=notes, created_at=now,
+                )
+                for pk in changed
+            ])
+            job_deltas = defaultdict(lambda: defaultdict(int))
+            for pk in changed:
+                old_status, job_id = current[pk]
+                job_deltas[job_id][old_status] -= 1
+                job_deltas[job_id][status] += 1
+            adjust_counters(recruiter.pk, job_deltas)
+            for pk in changed:
+                old_status, job_id = current[pk]
+                application = Application(pk=pk, job_id=job_id, status=status, updated_at=now)
+                publish_application_event(application, old_status, recruiter_id=recruiter.pk)
+
+    results = []
+    for pk in application_ids:
+        if pk not in current:
+            results.append({'id': pk, 'result': 'not_found', 'old_status': None})
+        else:
+            old_status = current[pk][0]
+            results.append({
+                'id': pk, 'result': 'unchanged' if old_status == status else 'updated', 'old_status': old_status,
+            })
+    return results
+
+
+def adjust_counters(recruiter_id, job_deltas):
+    """
+    Apply ``{job_id: {status: delta}}`` to the jobs' counters and the
+    recruiter's total row. Call inside the transaction that changed the
+    applications. Jobs are updated in id order to keep lock order stable.
+    """
+    totals = defaultdict(int)
+    for job_id in sorted(job_deltas):
+        _apply_deltas(recruiter_id, job_id, job_deltas[job_id])
+        for status, delta in job_deltas[job_id].items():
+            totals[status] += delta
+    _apply_deltas(recruiter_id, None, totals)
+
+
+def _apply_deltas(recruiter_id, job_id, deltas):
+    changes = {status: F(status) + delta for status, delta in deltas.items() if delta}
+    if not changes:
+        return
+    if job_id is None:
+        rows = ApplicationCounter.objects.filter(recruiter_id=recruiter_id, job__isnull=True)
+    else:
+        rows = ApplicationCounter.objects.filter(job_id=job_id)
+    if rows.update(**changes):
+        return
+    # No row yet: count from the applications, which already include this change
+    try:
+        with transaction.atomic():
+            ApplicationCounter.objects.create(
+                recruiter_id=recruiter_id, job_id=job_id, **count_applications(recruiter_id, job_id),
+            )
+    except IntegrityError:
+        rows.update(**changes)  # created by a concurrent transaction meanwhile
+
+
+def count_applications(recruiter_id, job_id=None):
+    """Live ``{status: count}`` of a job's applications, or of all the recruiter's"""
+    applications = Application.objects.filter(job__recruiter_id=recruiter_id)
+    if job_id is not None:
+        applications = applications.filter(job_id=job_id)
+    counts = dict.fromkeys(STATUSES, 0)
+    for status, n in applications.values_list('status').annotate(n=Count('id')).order_by():
+        if status in counts:
+            counts[status] = n
+    return counts
+
+
+def recruiter_counts(recruiter_id):
+    """The recruiter's ApplicationCounter row for all jobs (an unsaved zero row if there is none)"""
+    counter = ApplicationCounter.objects.filter(recruiter_id=recruiter_id, job__isnull=True).first()
+    return counter or ApplicationCounter(recruiter_id=recruiter_id)
+
+
+def job_counts(job_ids):
+    """``{job_id: ApplicationCounter}`` for the given jobs, with zero rows for jobs that have none"""
+    counters = {counter.job_id: counter for counter in ApplicationCounter.objects.filter(job_id__in=job_ids)}
+    return {job_id: counters.get(job_id) or ApplicationCounter(job_id=job_id) for job_id in job_ids}
+
+
+def expected_counters(recruiter_ids=None):
+    """Unsaved ApplicationCounter rows counted from the applications, keyed by ``(recruiter_id, job_id)``"""
+    applications = Application.objects.all()
+    if recruiter_ids is not None:
+        applications = applications.filter(job__recruiter_id__in=recruiter_ids)
+    rows = {}
+    for recruiter_id, job_id, status, n in (
+        applications.values_list('job__recruiter_id', 'job_id', 'status').annotate(n=Count('id')).order_by()
+    ):
+        if status not in STATUSES:
+            continue
+        for key in ((recruiter_id, job_id), (recruiter_id, None)):
+            row = rows.get(key)
+            if row is None:
+                row = rows[key] = ApplicationCounter(recruiter_id=recruiter_id, job_id=key[1])
+            setattr(row, status, getattr(row, status) + n)
+    return rows
+
+
+def rebuild_application_counts(recruiter_ids=None):
+    """
+    Recompute ApplicationCounter rows from the applications, for the given
+    recruiters or everyone. Needed after applications are written without
+    these services (bulk_create, admin deletes). Returns the rows written.
+    """
+    counters = ApplicationCounter.objects.all()
+    if recruiter_ids is not None:
+        counters = counters.filter(recruiter_id__in=recruiter_ids)
+    with transaction.atomic():
+        rows = expected_counters(recruiter_ids)
+        counters.delete()
+        ApplicationCounter.objects.bulk_create(rows.values(), batch_size=1000)
+    return len(rows)
@@ -0,0 +1,38 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .dedupe import promote, update_duplicates
+from .models import Job
+from .text_similarity import JOB, refresh_vectors, remove_vectors
+
+
+@receiver(post_save, sender=Job)
+def vectorise_job(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Refresh the job's description vector when its title, description or requirements may have changed."""
+    if raw or (update_fields is not None and not {'title', 'description', 'requirements'} & set(update_fields)):
+        return
+    transaction.on_commit(lambda: refresh_vectors(JOB, [instance]))
+
+
+@receiver(post_delete, sender=Job)
+def remove_job_vector(sender, instance, **kwargs):
+    job_id = instance.pk
+    transaction.on_commit(lambda: remove_vectors(JOB, [job_id]))
+
+
+@receiver(post_save, sender=Job)
+def dedupe_job(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Re-cluster the job with its near-duplicates when its text, status or place may have changed."""
+    fields = {'title', 'description', 'requirements', 'status', 'place_id'}
+    if raw or (update_fields is not None and not fields & set(update_fields)):
+        return
+    transaction.on_commit(lambda: update_duplicates([instance]))
+
+
+@receiver(pre_delete, sender=Job)
+def hand_on_duplicates(sender, instance, **kwargs):
+    """A deleted representative's duplicates form a cluster of their own, led by the oldest."""
+    duplicate_ids = list(Job.objects.filter(duplicate_of=instance).values_list('pk', flat=True))
+    if duplicate_ids:
+        transaction.on_commit(lambda: promote(duplicate_ids))
@@ -0,0 +1,312 @@
+"""
+Approximate nearest neighbours for "similar jobs" and "similar candidates".
+
+Each job and developer profile gets a 256-bit signature when its text
+vector is stored (jobs.text_similarity). The signature is a random-hyperplane
+LSH (SimHash) of the item's TF-IDF text weights and its skills. Similar items
+differ in few bits, and the fraction of differing bits estimates the angle
+between their vectors. Hyperplanes are derived from a hash of each feature,
+so there is no projection matrix to store and new terms need no setup.
+
+Lookups split signatures into BANDS bands of BAND_BITS bits. Items that
+share a band with the query are candidates, ranked by Hamming distance over
+the whole signature. For each kind, the bands are kept as sorted arrays in
+.npy files under settings.SIMILARITY_INDEX_DIR. Every process
+memory-maps them (SignatureIndex), and ``python manage.py
+build_similarity_index`` rewrites them. Signatures saved after the last
+build are read from the database and scanned directly, so results stay
+current between builds. Until the first build there are no results.
+"""
+import hashlib
+import json
+import math
+import os
+import shutil
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import TextVector
+
+SIGNATURE_WORDS = 4  # uint64 words: 256 bits
+SIGNATURE_BITS = SIGNATURE_WORDS * 64
+BANDS = 24
+BAND_BITS = 10
+
+# Items read from one bucket, so a huge bucket (many identical items) does
+# not slow every lookup down
+MAX_BUCKET_CANDIDATES = 2000
+
+# Results less similar than this (estimated cosine) are not shown
+MIN_SIMILARITY = 0.3
+
+# Skill features get this bit set, so they never collide with term ids
+SKILL_FEATURE = 1 << 63
+
+# How far back before a build the database is scanned again, for rows saved
+# before the build read them but committed after it
+BUILD_OVERLAP = timedelta(seconds=5)
+
+
+def skill_keys(skills):
+    """Feature keys of a list of skills (case and surrounding space ignored)"""
+    keys = set()
+    for skill in skills or []:
+        skill = str(skill).strip().lower()
+        if skill:
+            keys.add(int.from_bytes(hashlib.blake2b(skill.encode('utf-8'), digest_size=8).digest(), 'little')
+                     | SKILL_FEATURE)
+    return sorted(keys)
+
+
+def _mix(x):
+    """splitmix64 of a uint64 array: a fixed pseudo-random function of each value"""
+    import numpy as np
+
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def signatures(documents):
+    """
+    Signatures of ``[(feature keys, weights), ...]`` as a ``(documents,
+    SIGNATURE_WORDS)`` uint64 array: bit j is set when the weighted sum of
+    the features' ±1 hyperplane coordinates j is positive.
+    """
+    import numpy as np
+
+    lengths = np.array([len(keys) for keys, _ in documents], dtype=np.int64)
+    result = np.zeros((len(documents), SIGNATURE_WORDS), dtype=np.uint64)
+    if not lengths.sum():
+        return result
+    keys = np.concatenate([np.asarray(keys, dtype=np.uint64) for keys, _ in documents])
+    weights = np.concatenate([np.asarray(weights, dtype=np.float32) for _, weights in documents])
+    words = _mix(_mix(keys)[:, None] + np.arange(SIGNATURE_WORDS, dtype=np.uint64))
+    signs = np.unpackbits(words.view(np.uint8), axis=1).astype(np.float32) * 2 - 1
+    contributions = signs * weights[:, None]
+    starts = np.cumsum(lengths) - lengths
+    present = lengths > 0
+    sums = np.add.reduceat(contributions, np.minimum(starts[present], len(keys) - 1), axis=0)
+    bits = np.zeros((len(documents), SIGNATURE_BITS), dtype=np.uint8)
+    bits[present] = sums > 0
+    result[:] = np.packbits(bits, axis=1).view(np.uint64)
+    return result
+
+
+def band_keys(signatures_array):
+    """``(n, BANDS)`` uint16 band values of an ``(n, SIGNATURE_WORDS)`` uint64 signature array"""
+    import numpy as np
+
+    bits = np.unpackbits(np.ascontiguousarray(signatures_array).view(np.uint8), axis=1)[:, :BANDS * BAND_BITS]
+    powers = (1 << np.arange(BAND_BITS - 1, -1, -1)).astype(np.uint16)
+    return (bits.reshape(len(bits), BANDS, BAND_BITS).astype(np.uint16) * powers).sum(axis=2, dtype=np.uint16)
+
+
+def hamming(signatures_array, signature):
+    """Differing bits between each signature and one signature"""
+    import numpy as np
+
+    xor = np.bitwise_xor(signatures_array, signature)
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(xor).sum(axis=1, dtype=np.int64)
+    return np.unpackbits(xor.view(np.uint8), axis=1).sum(axis=1, dtype=np.int64)
+
+
+def estimated_similarity(distance):
+    """Cosine similarity implied by a Hamming distance between signatures"""
+    return math.cos(math.pi * distance / SIGNATURE_BITS)
+
+
+def write_index(directory, kind, ids, signatures_array, built_at=None, chunk_size=100_000):
+    """
+    Write a kind's index files and switch readers to them. The files of a
+    build go into a new directory and the ``<kind>.json`` manifest naming it
+    is replaced atomically; older builds are removed.
+    """
+    import numpy as np
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    generation = f'{kind}-{time.time_ns()}'
+    target = directory / generation
+    target.mkdir()
+
+    ids = np.asarray(ids, dtype=np.int64)
+    order = np.argsort(ids, kind='stable')
+    ids = ids[order]
+    signatures_array = np.asarray(signatures_array, dtype=np.uint64).reshape(len(ids), SIGNATURE_WORDS)[order]
+    bands = np.empty((len(ids), BANDS), dtype=np.uint16)
+    for start in range(0, len(ids), chunk_size):
+        bands[start:start + chunk_size] = band_keys(signatures_array[start:start + chunk_size])
+    positions = np.argsort(bands, axis=0, kind='stable').T.astype(np.int32)
+    keys = np.take_along_axis(bands.T, positions, axis=1)
+
+    np.save(target / 'ids.npy', ids)
+    np.save(target / 'signatures.npy', signatures_array)
+    np.save(target / 'band_keys.npy', np.ascontiguousarray(keys))
+    np.save(target / 'band_positions.npy', np.ascontiguousarray(positions))
+
+    manifest = directory / f'{kind}.json'
+    temporary = directory / f'{kind}.json.tmp'
+    temporary.write_text(json.dumps({
+        'generation': generation, 'count': len(ids), 'built_at': built_at.isoformat() if built_at else None,
+    }))
+    os.replace(temporary, manifest)
+    for old in directory.glob(f'{kind}-*'):
+        if old.name != generation:
+            shutil.rmtree(old, ignore_errors=True)  # still mapped on some platforms; removed by a later build
+    return target
+
+
+class SignatureIndex:
+    """
+    A kind's index files, memory-mapped, reopened when a new build replaces
+    them: ids (ascending) with their signatures, and per band the band values
+    in ascending order with the rows they belong to.
+    """
+
+    def __init__(self, directory, kind):
+        self.manifest = Path(directory) / f'{kind}.json'
+        self._lock = threading.Lock()
+        self._snapshot = None  # (manifest mtime, (built_at, *arrays))
+
+    def snapshot(self):
+        """``(built_at, ids, signatures, band keys, band positions)`` of the current build, or None"""
+        import numpy as np
+
+        try:
+            mtime = self.manifest.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+        if self._snapshot is not None and self._snapshot[0] == mtime:
+            return self._snapshot[1]
+        with self._lock:
+            if self._snapshot is None or self._snapshot[0] != mtime:
+                manifest = json.loads(self.manifest.read_text())
+                files = self.manifest.parent / manifest['generation']
+                built_at = datetime.fromisoformat(manifest['built_at']) if manifest['built_at'] else None
+                # Plain ndarray views of the mappings: indexing np.memmap itself is much slower
+                arrays = tuple(
+                    np.load(files / f'{name}.npy', mmap_mode='r').view(np.ndarray)
+                    for name in ('ids', 'signatures', 'band_keys', 'band_positions')
+                )
+                self._snapshot = (mtime, (built_at, *arrays))
+        return self._snapshot[1]
+
+    def search(self, signature, limit, exclude=(), recent=None):
+        """
+        ``[(id, estimated similarity)]`` of the ``limit`` items nearest to a
+        signature, best first. ``recent`` is ``(ids, signatures)`` saved
+        since the build; they replace the built entries with the same ids.
+        """
+        import numpy as np
+
+        signature = np.asarray(signature, dtype=np.uint64)
+        recent_ids = np.asarray(recent[0] if recent is not None else (), dtype=np.int64)
+        skipped = np.union1d(recent_ids, np.fromiter(exclude, dtype=np.int64))
+        candidate_ids, candidate_signatures = [], []
+        snapshot = self.snapshot()
+        if snapshot is not None and len(snapshot[1]):
+            _, ids, signatures_array, keys, positions = snapshot
+            query = band_keys(signature[None, :])[0]
+            # Rows sharing a band with the query, as a mask so each is read once
+            candidates = np.zeros(len(ids), dtype=bool)
+            for band in range(BANDS):
+                low = np.searchsorted(keys[band], query[band], 'left')
+                high = min(np.searchsorted(keys[band], query[band], 'right'), low + MAX_BUCKET_CANDIDATES)
+                candidates[positions[band, low:high]] = True
+            # Built entries replaced by recent ones, and excluded ids
+            rows = np.minimum(np.searchsorted(ids, skipped), len(ids) - 1)
+            candidates[rows[ids[rows] == skipped]] = False
+            rows = np.flatnonzero(candidates)
+            candidate_ids.append(ids[rows])
+            candidate_signatures.append(signatures_array[rows])
+        if len(recent_ids):
+            keep = ~np.isin(recent_ids, np.fromiter(exclude, dtype=np.int64))
+            candidate_ids.append(recent_ids[keep])
+            candidate_signatures.append(np.asarray(recent[1], dtype=np.uint64).reshape(-1, SIGNATURE_WORDS)[keep])
+        if not candidate_ids:
+            return []
+
+        ids = np.concatenate(candidate_ids)
+        distances = hamming(np.concatenate(candidate_signatures), signature)
+        if len(distances) > limit:
+            nearest = np.argpartition(distances, limit)[:limit]
+        else:
+            nearest = np.arange(len(distances))
+        nearest = nearest[np.lexsort((ids[nearest], distances[nearest]))]
+        return [(int(ids[i]), estimated_similarity(int(distances[i]))) for i in nearest]
+
+
+_INDEXES = {}
+
+
+def get_index(kind):
+    """The process-wide SignatureIndex of a kind, under settings.SIMILARITY_INDEX_DIR"""
+    index = _INDEXES.get(kind)
+    if index is None:
+        index = _INDEXES.setdefault(kind, SignatureIndex(settings.SIMILARITY_INDEX_DIR, kind))
+    return index
+
+
+def similar(kind, object_id, limit=5, using=None):
+    """
+    ``[(object id, estimated similarity)]`` of the jobs or profiles most
+    like the given one, best first, above MIN_SIMILARITY. Ids may belong to
+    items deleted since the last build; callers load the objects anyway.
+    Empty until build_similarity_index has been run, rather than scanning
+    every signature in the database on each lookup.
+    """
+    import numpy as np
+
+    vectors = TextVector.objects.using(using).filter(kind=kind)
+    signature = vectors.filter(object_id=object_id).values_list('signature', flat=True).first()
+    if not signature:
+        return []
+    index = get_index(kind)
+    snapshot = index.snapshot()
+    if snapshot is None:
+        return []
+    recent = None
+    if snapshot[0] is not None:  # builds without a timestamp (benchmarks) have nothing to catch up on
+        rows = list(
+            vectors.exclude(signature=None).filter(updated_at__gte=snapshot[0] - BUILD_OVERLAP)
+            .values_list('object_id', 'signature')
+        )
+        recent = (
+            np.array([object_id for object_id, _ in rows], dtype=np.int64),
+            np.frombuffer(b''.join(bytes(data) for _, data in rows), dtype='<u8').reshape(-1, SIGNATURE_WORDS),
+        )
+    results = index.search(np.frombuffer(bytes(signature), dtype='<u8'), limit, exclude={object_id}, recent=recent)
+    return [(pk, similarity) for pk, similarity in results if similarity >= MIN_SIMILARITY]
+
+
+def build_index(kind, using=None):
+    """Write a kind's index from the signatures in the database; returns the number of items"""
+    import numpy as np
+
+    vectors = TextVector.objects.using(using).filter(kind=kind)
+    # Lookups rescan the rows saved up to BUILD_OVERLAP before the build, so
+    # let the rows of a bulk write just before it (refresh_text_vectors) age
+    # out of that window instead of rescanning them until the next build
+    latest = vectors.aggregate(latest=Max('updated_at'))['latest']
+    built_at = timezone.now()
+    if latest is not None and latest > built_at - BUILD_OVERLAP:
+        time.sleep((latest + BUILD_OVERLAP - built_at).total_seconds())
+        built_at = timezone.now()
+    ids, chunks = [], []
+    for object_id, data in vectors.exclude(signature=None).values_list('object_id', 'signature').iterator(
+        chunk_size=5000,
+    ):
+        ids.append(object_id)
+        chunks.append(bytes(data))
+    signatures_array = np.frombuffer(b''.join(chunks), dtype='<u8').reshape(-1, SIGNATURE_WORDS)
+    write_index(settings.SIMILARITY_INDEX_DIR, kind, ids, signatures_array, built_at=built_at)
+    return len(ids)
@@ -1,3 +1,211 @@
+import io
+
 from django.test import TestCase
 
-# Create your tests here.
+from accounts.models import User
+
+from .import_export import import_jobs
+from .models import ApplicationCounter, ApplicationEvent, Job, JobBucket, TextVector
+from .services import bulk_update_status, change_status, rebuild_application_counts, record_application
+from .text_similarity import JOB
+
+
+def make_user(email, user_type):
+    return User.objects.create_user(email=email, password='password', user_type=user_type)
+
+
+def make_job(recruiter, title='Backend Developer', **fields):
+    return Job.objects.create(recruiter=recruiter, title=title, status='published', **fields)
+
+
+def stored_counters():
+    """``{(recruiter_id, job_id): {status: count}}`` of the ApplicationCounter rows"""
+    return {
+        (counter.recruiter_id, counter.job_id): counter.as_dict()
+        for counter in ApplicationCounter.objects.all()
+    }
+
+
+class BulkUpdateStatusTests(TestCase):
+    def setUp(self):
+        self.recruiter = make_user('recruiter@example.com', 'recruiter')
+        self.other_recruiter = make_user('other@example.com', 'recruiter')
+        self.developer = make_user('developer@example.com', 'developer')
+        self.own = record_application(make_job(self.recruiter), self.developer)
+        self.foreign = record_application(make_job(self.other_recruiter), self.developer)
+
+    def test_refuses_applications_on_another_recruiters_job(self):
+        results = bulk_update_status(self.recruiter, [self.foreign.pk, self.own.pk], 'interview')
+
+        self.assertEqual(results, [
+            {'id': self.foreign.pk, 'result': 'not_found', 'old_status': None},
+            {'id': self.own.pk, 'result': 'updated', 'old_status': 'applied'},
+        ])
+        self.foreign.refresh_from_db()
+        self.own.refresh_from_db()
+        self.assertEqual(self.foreign.status, 'applied')
+        self.assertEqual(self.own.status, 'interview')
+        self.assertFalse(ApplicationEvent.objects.filter(application=self.foreign, to_status='interview').exists())
+
+    def test_reports_applications_already_in_the_status(self):
+        bulk_update_status(self.recruiter, [self.own.pk], 'rejected')
+
+        results = bulk_update_status(self.recruiter, [self.own.pk, self.own.pk], 'rejected')
+
+        self.assertEqual(results, [{'id': self.own.pk, 'result': 'unchanged', 'old_status': 'rejected'}])
+        self.assertEqual(ApplicationEvent.objects.filter(application=self.own, to_status='rejected').count(), 1)
+
+
+class ApplicationCounterTests(TestCase):
+    def setUp(self):
+        self.recruiter = make_user('recruiter@example.com', 'recruiter')
+        self.jobs = [make_job(self.recruiter, title=f'Job {n}') for n in range(2)]
+        self.developers = [make_user(f'developer{n}@example.com', 'developer') for n in range(3)]
+
+    def assertCountersMatchRebuild(self):
+        counters = stored_counters()
+        rebuild_application_counts()
+        self.assertEqual(counters, stored_counters())
+
+    def test_record_application(self):
+        for job in self.jobs:
+            for developer in self.developers:
+                record_application(job, developer)
+
+        self.assertCountersMatchRebuild()
+        self.assertEqual(stored_counters()[(self.recruiter.pk, None)]['applied'], 6)
+
+    def test_change_status(self):
+        application = record_application(self.jobs[0], self.developers[0])
+        record_application(self.jobs[1], self.developers[1])
+
+        change_status(application, 'interview', self.recruiter)
+        change_status(application, 'interview', self.recruiter, notes='Same status, notes only')
+        change_status(application, 'hired', self.recruiter)
+
+        self.assertCountersMatchRebuild()
+        self.assertEqual(stored_counters()[(self.recruiter.pk, self.jobs[0].pk)]['hired'], 1)
+
+    def test_bulk_update_status(self):
+        applications = [record_application(job, developer) for job in self.jobs for developer in self.developers]
+        change_status(applications[0], 'under_review', self.recruiter)
+
+        bulk_update_status(self.recruiter, [application.pk for application in applications[:4]], 'rejected')
+        bulk_update_status(self.recruiter, [applications[0].pk, applications[5].pk], 'interview')
+
+        self.assertCountersMatchRebuild()
+        self.assertEqual(
+            stored_counters()[(self.recruiter.pk, None)],
+            {'applied': 1, 'under_review': 0, 'interview': 2, 'hired': 0, 'rejected': 3},
+        )
+
+
+class ImportJobsTests(TestCase):
+    CSV = (
+        'external_id,title,job_type,salary_min,salary_max,requirements\n'
+        'be-1,Backend Developer,full-time,80,120,python|django\n'
+        'be-2,,contract,,,\n'
+        'fe-1,Frontend Developer,part-time,90,60,\n'
+        'fe-2,Frontend Developer,freelance,,,react\n'
+        'da-1,Data Analyst,contract,,,"[""sql"", ""python""]"\n'
+    )
+
+    def setUp(self):
+        self.recruiter = make_user('recruiter@example.com', 'recruiter')
+
+    def import_csv(self, text, recruiter=None):
+        return import_jobs(recruiter or self.recruiter, io.BytesIO(text.encode('utf-8')), 'csv')
+
+    def test_reports_bad_rows_by_line(self):
+        result = self.import_csv(self.CSV)
+
+        self.assertEqual((result['rows'], result['created'], result['skipped']), (5, 2, 3))
+        self.assertEqual([error['line'] for error in result['errors']], [3, 4, 5])
+        self.assertIn('title', result['errors'][0]['message'])
+        self.assertIn('salary_min', result['errors'][1]['message'])
+        self.assertIn('job_type', result['errors'][2]['message'])
+        self.assertEqual(
+            sorted(Job.objects.filter(recruiter=self.recruiter).values_list('external_id', flat=True)), ['be-1', 'da-1'],
+        )
+
+    def test_reimport_updates_instead_of_duplicating(self):
+        self.import_csv(self.CSV)
+        job = Job.objects.get(recruiter=self.recruiter, external_id='be-1')
+
+        result = self.import_csv(self.CSV.replace('Backend Developer', 'Senior Backend Developer'))
+
+        self.assertEqual((result['created'], result['updated']), (0, 2))
+        self.assertEqual(Job.objects.filter(recruiter=self.recruiter).count(), 2)
+        job.refresh_from_db()
+        self.assertEqual(job.title, 'Senior Backend Developer')
+        self.assertEqual(job.requirements, ['python', 'django'])
+
+    def test_reimport_changes_only_the_columns_of_the_file(self):
+        self.import_csv(
+            'external_id,title,location,description,requirements,status\n'
+            'be-1,Backend Developer,"Pune, India",Build APIs,python|django,published\n'
+        )
+        job = Job.objects.get(recruiter=self.recruiter, external_id='be-1')
+        place_id = job.place_id
+
+        result = self.import_csv('external_id,title\nbe-1,Senior Backend Developer\nbe-2,Data Engineer\n')
+
+        self.assertEqual((result['created'], result['updated']), (1, 1))
+        job.refresh_from_db()
+        self.assertEqual(job.title, 'Senior Backend Developer')
+        self.assertEqual(
+            (job.status, job.description, job.requirements, job.location, job.place_id),
+            ('published', 'Build APIs', ['python', 'django'], 'Pune, India', place_id),
+        )
+        created = Job.objects.get(recruiter=self.recruiter, external_id='be-2')
+        self.assertEqual((created.status, created.job_type), ('draft', 'full-time'))
+
+    def test_imported_jobs_are_vectorised_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.import_csv('external_id,title,description\nbe-1,Backend Developer,Build APIs\n')
+        job = Job.objects.get(recruiter=self.recruiter, external_id='be-1')
+        digest = TextVector.objects.get(kind=JOB, object_id=job.pk).digest
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.import_csv('external_id,title,description\nbe-1,Backend Developer,Build APIs in Django\n')
+
+        self.assertNotEqual(TextVector.objects.get(kind=JOB, object_id=job.pk).digest, digest)
+
+    def test_imported_duplicates_are_clustered_on_commit(self):
+        csv_text = (
+            'external_id,title,description,status\n'
+            'be-1,Backend Developer,Build and run the APIs of our hiring platform,published\n'
+            'be-2,Backend Developer,Build and run the APIs of our hiring platform,published\n'
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.import_csv(csv_text)
+        first, second = Job.objects.filter(recruiter=self.recruiter).order_by('pk')
+        self.assertEqual((first.duplicate_of_id, second.duplicate_of_id), (None, first.pk))
+        self.assertTrue(JobBucket.objects.filter(job=first).exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.import_csv('external_id,title,status\nbe-1,Backend Developer,draft\n')
+
+        second.refresh_from_db()
+        self.assertIsNone(second.duplicate_of_id)
+
+    def test_same_external_id_of_another_recruiter_is_a_new_job(self):
+        self.import_csv(self.CSV)
+
+        result = self.import_csv(self.CSV, recruiter=make_user('other@example.com', 'recruiter'))
+
+        self.assertEqual((result['created'], result['updated']), (2, 0))
+        self.assertEqual(Job.objects.filter(external_id='be-1').count(), 2)
+
+    def test_jsonl_errors_name_their_line(self):
+        stream = io.BytesIO(
+            b'{"external_id": "a", "title": "Backend Developer"}\n'
+            b'\n'
+            b'{"external_id": "b", "title": \n'
+            b'["not", "an", "object"]\n'
+        )
+
+        result = import_jobs(self.recruiter, stream, 'jsonl')
+
+        self.assertEqual(result['created'], 1)
+        self.assertEqual([error['line'] for error in result['errors']], [3, 4])
@@ -0,0 +1,478 @@
+"""
+Description similarity between developer profiles and jobs.
+
+The title and description of each job, and the title and summary of each
+developer profile, are stored as sparse vectors of term counts (TextVector)
+over a shared vocabulary (Term). A vector is refreshed when its job or
+profile is saved (jobs.signals, accounts.signals), and only if the text
+changed. The document frequency of each term (Term.job_count) is adjusted
+by the terms a job gained or lost, so nothing is recomputed over the whole
+corpus. ``python manage.py refresh_text_vectors`` catches up after bulk
+writes that skip save().
+
+Similarity is the cosine of TF-IDF weights ``(1 + log tf) * idf`` with
+``idf = log((1 + N) / (1 + df)) + 1`` over the N job vectors. Each process
+keeps the job vectors as a CSR matrix of L2-normalised weights
+(JobVectorIndex, which needs numpy), so a profile is scored against any set
+of jobs with one sparse matrix-vector product. The matrix reloads only the
+vectors that changed since it was built.
+
+Each vector also stores a signature of the text and skills, for the
+"similar jobs" and "similar candidates" lookups (jobs.similarity_index).
+"""
+import hashlib
+import math
+import re
+import sys
+import threading
+import time
+from array import array
+from collections import Counter
+from datetime import timedelta
+
+from django.db import router, transaction
+from django.db.models import Count, F, Max
+
+from accounts.models import DeveloperProfile
+
+from .batching import QUERY_BATCH_SIZE, batches
+from .models import Job, Term, TextVector
+
+JOB = 'job'
+PROFILE = 'profile'
+
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#]*(?:[.\-][a-z0-9+#]+)*')
+
+STOP_WORDS = frozenset("""
+    a about above after again all also am an and any are as at be because been before being below between both
+    but by can could did do does doing down during each etc few for from further get had has have having he her
+    here hers him his how i if in into is it its just me more most my no nor not now of off on once only or other
+    our ours out over own per same she should so some such than that the their theirs them then there these they
+    this those through to too under until up us very via was we were what when where which while who whom why
+    will with within would you your yours
+""".split())
+
+MAX_TERM_LENGTH = 64  # Term.text
+MAX_TERM_COUNT = 65535  # stored as uint16
+
+# How often a process checks for changed job vectors, and how far back each
+# reload looks again for rows saved before the last one but committed after it
+INDEX_REFRESH_SECONDS = 5
+INDEX_REFRESH_OVERLAP = timedelta(seconds=5)
+
+
+def tokenize(text):
+    """Lowercase terms of a text; keeps tech names such as node.js, c++ and c# whole"""
+    return [
+        term for term in TOKEN_RE.findall((text or '').lower())
+        if 1 < len(term) <= MAX_TERM_LENGTH and term not in STOP_WORDS and not term.isdigit()
+    ]
+
+
+def job_text(job):
+    return '\n'.join(filter(None, [job.title, job.description]))
+
+
+def profile_text(profile):
+    return '\n'.join(filter(None, [getattr(profile, 'title', ''), getattr(profile, 'summary', '')]))
+
+
+DOCUMENT_TEXT = {JOB: job_text, PROFILE: profile_text}
+DOCUMENT_MODELS = {JOB: Job, PROFILE: DeveloperProfile}
+DOCUMENT_SKILLS = {JOB: 'requirements', PROFILE: 'skills'}
+DOCUMENT_FIELDS = {JOB: ('title', 'description', 'requirements'), PROFILE: ('title', 'summary', 'skills')}
+
+
+def document_skills(kind, document):
+    return getattr(document, DOCUMENT_SKILLS[kind], None) or []
+
+
+def text_digest(text):
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def document_digest(kind, document):
+    """Digest of what a vector is computed from: the text, and the skills its signature includes"""
+    skills = sorted({str(skill).strip().lower() for skill in document_skills(kind, document)} - {''})
+    return text_digest('\n'.join([DOCUMENT_TEXT[kind](document), '|'.join(skills)]))
+
+
+def pack(typecode, values):
+    """Little-endian bytes of an array of unsigned ints ('I' uint32, 'H' uint16)"""
+    values = array(typecode, values)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values.tobytes()
+
+
+def unpack(typecode, data):
+    values = array(typecode)
+    values.frombytes(bytes(data))
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def term_ids(texts, using=None, create=False):
+    """``{text: Term id}`` for the terms in the vocabulary, adding the missing ones if ``create``"""
+    ids = {}
+    for batch in batches(texts):
+        ids.update(Term.objects.using(using).filter(text__in=batch).values_list('text', 'id'))
+    missing = [text for text in texts if text not in ids]
+    if create and missing:
+        Term.objects.using(using).bulk_create(
+            [Term(text=text) for text in missing], batch_size=QUERY_BATCH_SIZE, ignore_conflicts=True,
+        )
+        for batch in batches(missing):
+            ids.update(Term.objects.using(using).filter(text__in=batch).values_list('text', 'id'))
+    return ids
+
+
+def refresh_vectors(kind, documents, using=None):
+    """
+    Store the vectors and signatures of the given jobs or profiles whose
+    text or skills changed since they were last vectorised, and adjust the
+    document frequency of the terms that jobs gained or lost. Returns the
+    number of vectors written.
+    """
+    db = using or router.db_for_write(TextVector)
+    documents = {document.pk: document for document in documents}
+    texts = {pk: DOCUMENT_TEXT[kind](document) for pk, document in documents.items()}
+    written = 0
+    for batch in batches(texts):
+        with transaction.atomic(using=db):
+            stored = {
+                object_id: (digest, term_ids_data)
+                for object_id, digest, term_ids_data in TextVector.objects.using(db).select_for_update()
+                .filter(kind=kind, object_id__in=batch).values_list('object_id', 'digest', 'term_ids')
+            }
+            digests = {pk: document_digest(kind, documents[pk]) for pk in batch}
+            changed = [pk for pk in batch if pk not in stored or stored[pk][0] != digests[pk]]
+            if not changed:
+                continue
+            counts = {pk: Counter(tokenize(texts[pk])) for pk in changed}
+            vocabulary = term_ids(set().union(*counts.values()), using=db, create=True)
+
+            vectors, job_counts, term_pairs = [], Counter(), {}
+            for pk in changed:
+                pairs = sorted((vocabulary[term], min(n, MAX_TERM_COUNT)) for term, n in counts[pk].items())
+                term_pairs[pk] = pairs
+                vectors.append(TextVector(
+                    kind=kind, object_id=pk, digest=digests[pk],
+                    term_ids=pack('I', [term_id for term_id, _ in pairs]), counts=pack('H', [n for _, n in pairs]),
+                ))
+                if kind == JOB:
+                    new = {term_id for term_id, _ in pairs}
+                    old = set(unpack('I', stored[pk][1])) if pk in stored else set()
+                    job_counts.update(new - old)
+                    job_counts.subtract(old - new)
+            _adjust_job_counts(job_counts, db)
+            signatures = document_signatures(
+                [(term_pairs[pk], document_skills(kind, documents[pk])) for pk in changed], db,
+            )
+            for vector, signature in zip(vectors, signatures):
+                vector.signature = signature
+            TextVector.objects.using(db).bulk_create(
+                vectors, update_conflicts=True, unique_fields=['kind', 'object_id'],
+                update_fields=['digest', 'term_ids', 'counts', 'signature', 'updated_at'],
+            )
+            written += len(vectors)
+    return written
+
+
+def document_signatures(documents, using=None):
+    """
+    Signature bytes (see jobs.similarity_index) of ``[(sorted (term id,
+    count) pairs, skills), ...]``: the L2-normalised TF-IDF weights of the
+    terms and equal weights for the skills, each part counting the same.
+    """
+    from .similarity_index import signatures, skill_keys
+
+    ids = sorted({term_id for pairs, _ in documents for term_id, _ in pairs})
+    job_counts = {}
+    for batch in batches(ids):
+        job_counts.update(Term.objects.using(using).filter(id__in=batch).values_list('id', 'job_count'))
+    n_jobs = TextVector.objects.using(using).filter(kind=JOB).count()
+
+    features = []
+    for pairs, skills in documents:
+        weights = [(1 + math.log(n)) * (math.log((1 + n_jobs) / (1 + job_counts.get(t, 0))) + 1) for t, n in pairs]
+        norm = math.sqrt(sum(w * w for w in weights)) or 1
+        skill_ids = skill_keys(skills)
+        skill_weight = 1 / math.sqrt(len(skill_ids)) if skill_ids else 0
+        features.append((
+            [term_id for term_id, _ in pairs] + skill_ids,
+            [w / norm for w in weights] + [skill_weight] * len(skill_ids),
+        ))
+    return [row.tobytes() for row in signatures(features).astype('<u8')]
+
+
+def remove_vectors(kind, object_ids, using=None):
+    """Delete the vectors of deleted jobs or profiles, and the deleted jobs' document frequencies"""
+    db = using or router.db_for_write(TextVector)
+    for batch in batches(object_ids):
+        with transaction.atomic(using=db):
+            vectors = TextVector.objects.using(db).select_for_update().filter(kind=kind, object_id__in=batch)
+            if kind == JOB:
+                job_counts = Counter()
+                for term_ids_data in vectors.values_list('term_ids', flat=True):
+                    job_counts.subtract(unpack('I', term_ids_data))
+                _adjust_job_counts(job_counts, db)
+            vectors.delete()
+
+
+def refresh_all_vectors(kind, using=None):
+    """
+    Vectorise every job or profile whose text changed since its vector was
+    stored, and remove the vectors of deleted ones, for writes that skipped
+    save() (bulk_create, update()). Returns ``(written, removed)``.
+    """
+    db = using or router.db_for_write(TextVector)
+    model = DOCUMENT_MODELS[kind]
+    documents = model.objects.using(db).only(*DOCUMENT_FIELDS[kind]).order_by('pk')
+    written, batch = 0, []
+    for document in documents.iterator(chunk_size=QUERY_BATCH_SIZE):
+        batch.append(document)
+        if len(batch) == QUERY_BATCH_SIZE:
+            written += refresh_vectors(kind, batch, using=db)
+            batch = []
+    written += refresh_vectors(kind, batch, using=db)
+    orphans = orphaned_vectors(kind, using=db)
+    remove_vectors(kind, orphans, using=db)
+    return written, len(orphans)
+
+
+def stale_vectors(kind, using=None):
+    """Number of jobs or profiles whose stored vector is missing or older than their text or skills"""
+    stored = dict(TextVector.objects.using(using).filter(kind=kind).values_list('object_id', 'digest'))
+    documents = DOCUMENT_MODELS[kind].objects.using(using).only(*DOCUMENT_FIELDS[kind])
+    return sum(
+        stored.get(document.pk) != document_digest(kind, document)
+        for document in documents.iterator(chunk_size=2000)
+    )
+
+
+def orphaned_vectors(kind, using=None):
+    """Object ids of stored vectors whose job or profile no longer exists"""
+    live = set(DOCUMENT_MODELS[kind].objects.using(using).values_list('pk', flat=True))
+    return [
+        object_id for object_id in TextVector.objects.using(using).filter(kind=kind).values_list('object_id', flat=True)
+        if object_id not in live
+    ]
+
+
+def job_count_drift(using=None):
+    """``{term id: (stored, expected)}`` for the terms whose job_count differs from the job vectors"""
+    expected = Counter()
+    for term_ids_data in TextVector.objects.using(using).filter(kind=JOB).values_list('term_ids', flat=True):
+        expected.update(unpack('I', term_ids_data))
+    return {
+        pk: (stored, expected[pk])
+        for pk, stored in Term.objects.using(using).values_list('id', 'job_count').iterator(chunk_size=2000)
+        if stored != expected[pk]
+    }
+
+
+def rebuild_job_counts(using=None):
+    """Recount Term.job_count from the job vectors; returns the number of terms corrected"""
+    db = using or router.db_for_write(Term)
+    with transaction.atomic(using=db):
+        drift = job_count_drift(using=db)
+        Term.objects.using(db).bulk_update(
+            [Term(pk=pk, job_count=expected) for pk, (_, expected) in drift.items()], ['job_count'],
+            batch_size=QUERY_BATCH_SIZE,
+        )
+    return len(drift)
+
+
+def _adjust_job_counts(job_counts, using):
+    """Apply ``{term id: delta}`` to Term.job_count, one UPDATE per delta value and batch"""
+    by_delta = {}
+    for term_id, delta in job_counts.items():
+        if delta:
+            by_delta.setdefault(delta, []).append(term_id)
+    for delta, ids in by_delta.items():
+        for batch in batches(sorted(ids)):
+            Term.objects.using(using).filter(id__in=batch).update(job_count=F('job_count') + delta)
+
+
+def query_vector(kind, document, using=None):
+    """
+    ``(term ids, counts)`` of a job or profile to compare against the job
+    vectors: the stored vector if it is up to date, else computed from the
+    text. Terms not in the vocabulary get the id -1.
+    """
+    text = DOCUMENT_TEXT[kind](document)
+    if getattr(document, 'pk', None) is not None:
+        stored = (
+            TextVector.objects.using(using)
+            .filter(kind=kind, object_id=document.pk, digest=document_digest(kind, document))
+            .values_list('term_ids', 'counts').first()
+        )
+        if stored is not None:
+            return list(unpack('I', stored[0])), list(unpack('H', stored[1]))
+    counts = Counter(tokenize(text))
+    vocabulary = term_ids(list(counts), using=using)
+    return [vocabulary.get(term, -1) for term in counts], [min(n, MAX_TERM_COUNT) for n in counts.values()]
+
+
+class JobVectorIndex:
+    """
+    The job vectors of this process as a CSR matrix of L2-normalised TF-IDF
+    weights, rows in job id order. refresh() reloads the rows changed since
+    the last load, at most every INDEX_REFRESH_SECONDS.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._documents = {}  # job id -> (term ids, counts) numpy arrays
+        self._job_counts = None  # numpy array of Term.job_count by term id
+        self._version = None  # (vector count, latest updated_at) of the loaded rows
+        self._checked_at = None
+        # (job ids, indptr, indices, data, idf), replaced as a whole by build()
+        self.matrix = None
+
+    def _fresh(self):
+        return self._checked_at is not None and time.monotonic() - self._checked_at < INDEX_REFRESH_SECONDS
+
+    def refresh(self, using=None):
+        """Reload changed job vectors from the database; returns the index"""
+        if self._fresh():
+            return self
+        with self._lock:
+            if self._fresh():
+                return self
+            vectors = TextVector.objects.using(using).filter(kind=JOB)
+            version = tuple(vectors.aggregate(n=Count('id'), latest=Max('updated_at')).values())
+            if version != self._version:
+                self._reload(vectors, version, using)
+            self._checked_at = time.monotonic()
+        return self
+
+    def _reload(self, vectors, version, using):
+        import numpy as np
+
+        changed = vectors
+        if self._version is not None and self._version[1] is not None:
+            changed = vectors.filter(updated_at__gte=self._version[1] - INDEX_REFRESH_OVERLAP)
+        touched = set()
+        for object_id, term_ids_data, counts_data in (
+            changed.values_list('object_id', 'term_ids', 'counts').iterator(chunk_size=2000)
+        ):
+            old = self._documents.get(object_id)
+            if old is not None:
+                touched.update(old[0].tolist())
+            document = (np.frombuffer(term_ids_data, '<u4'), np.frombuffer(counts_data, '<u2'))
+            touched.update(document[0].tolist())
+            self._documents[object_id] = document
+        if len(self._documents) != version[0]:
+            live = set(vectors.values_list('object_id', flat=True))
+            for object_id in self._documents.keys() - live:
+                touched.update(self._documents.pop(object_id)[0].tolist())
+
+        # Document frequencies: all of them on the first load, then only
+        # those of the terms the changed jobs had or have
+        terms = Term.objects.using(using)
+        if self._job_counts is None:
+            terms = terms.filter(job_count__gt=0)
+            job_counts = np.zeros(0, dtype=np.int64)
+        else:
+            terms = terms.filter(id__in=sorted(touched)) if len(touched) < QUERY_BATCH_SIZE else terms
+            job_counts = self._job_counts
+        rows = list(terms.values_list('id', 'job_count'))
+        if rows:
+            ids, counts = np.array(rows, dtype=np.int64).T
+            if ids.max() >= len(job_counts):
+                job_counts = np.concatenate([job_counts, np.zeros(ids.max() + 1 - len(job_counts), np.int64)])
+            job_counts[ids] = counts
+        self.build(self._documents, job_counts)
+        self._version = version
+
+    def build(self, documents, job_counts):
+        """Build the matrix from ``{job id: (term ids, counts)}`` and document frequencies by term id"""
+        import numpy as np
+
+        job_ids = np.fromiter(sorted(documents), dtype=np.int64, count=len(documents))
+        lengths = np.fromiter((len(documents[i][0]) for i in job_ids.tolist()), dtype=np.int64, count=len(job_ids))
+        indptr = np.zeros(len(job_ids) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        if len(job_ids):
+            indices = np.concatenate([documents[i][0] for i in job_ids.tolist()]).astype(np.int32)
+            counts = np.concatenate([documents[i][1] for i in job_ids.tolist()]).astype(np.float32)
+        else:
+            indices, counts = np.zeros(0, np.int32), np.zeros(0, np.float32)
+
+        size = max(len(job_counts), int(indices.max()) + 1 if len(indices) else 0)
+        df = np.zeros(size, dtype=np.float32)
+        df[:len(job_counts)] = job_counts
+        idf = (np.log((1 + len(job_ids)) / (1 + df)) + 1).astype(np.float32)
+
+        data = (1 + np.log(counts)) * idf[indices]
+        rows = np.repeat(np.arange(len(job_ids)), lengths)
+        norms = np.sqrt(np.bincount(rows, weights=data * data, minlength=len(job_ids))).astype(np.float32)
+        norms[norms == 0] = 1
+        data /= norms[rows]
+
+        self._job_counts = np.asarray(job_counts)
+        self.matrix = (job_ids, indptr, indices, data, idf)
+        return self
+
+    def similarities(self, query, job_ids=None):
+        """
+        Cosine similarity of a ``(term ids, counts)`` query with each job
+        (all of them by default), as ``{job id: similarity}``. Jobs without
+        a vector or without terms are left out, and an empty query gives {}.
+        """
+        import numpy as np
+
+        if self.matrix is None or not len(self.matrix[0]):
+            return {}
+        all_job_ids, indptr, indices, data, idf = self.matrix
+        if job_ids is None:
+            positions = np.arange(len(all_job_ids))
+        else:
+            wanted = np.fromiter(job_ids, dtype=np.int64)
+            positions = np.searchsorted(all_job_ids, wanted)
+            found = positions < len(all_job_ids)
+            found[found] = all_job_ids[positions[found]] == wanted[found]
+            positions = positions[found]
+        if not len(positions):
+            return {}
+
+        # Query weights as a dense vector over the vocabulary; terms no job
+        # has (id -1 or beyond the matrix) only count towards the query's norm
+        query_ids = np.asarray(query[0], dtype=np.int64)
+        counts = np.asarray(query[1], dtype=np.float32)
+        known = (query_ids >= 0) & (query_ids < len(idf))
+        query_idf = np.full(len(query_ids), math.log(1 + len(all_job_ids)) + 1, dtype=np.float32)
+        query_idf[known] = idf[query_ids[known]]
+        weights = (1 + np.log(np.maximum(counts, 1))) * query_idf
+        norm = float(np.sqrt(np.dot(weights, weights)))
+        if norm == 0:
+            return {}
+        dense = np.zeros(len(idf), dtype=np.float32)
+        dense[query_ids[known]] = weights[known] / norm
+
+        # Sparse matrix-vector product over the selected rows
+        if job_ids is None:
+            products = data * dense[indices]
+            starts, lengths = indptr[:-1], np.diff(indptr)
+        else:
+            lengths = indptr[positions + 1] - indptr[positions]
+            starts = np.cumsum(lengths) - lengths
+            nnz = np.repeat(indptr[positions] - starts, lengths) + np.arange(int(lengths.sum()))
+            products = data[nnz] * dense[indices[nnz]]
+        scores = np.zeros(len(positions), dtype=np.float32)
+        if len(products):
+            # reduceat needs in-range starts (empty rows are dropped below)
+            scores = np.add.reduceat(products, np.minimum(starts, len(products) - 1))
+        has_terms = lengths > 0
+        return dict(zip(all_job_ids[positions][has_terms].tolist(), np.clip(scores[has_terms], 0.0, 1.0).tolist()))
+
+
+JOB_VECTORS = JobVectorIndex()
+
+
+def description_similarities(query, job_ids=None, using=None):
+    """``{job id: cosine similarity}`` of a query vector (see query_vector) with the stored job vectors"""
+    return JOB_VECTORS.refresh(using).similarities(query, job_ids)
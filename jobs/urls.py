@@ -6,5 +6,9 @@ app_name = 'jobs'
 urlpatterns = [
     path('create/', views.create_job, name='create_job'),
     path('find_jobs/', views.find_jobs, name='find_jobs'),
+    path('detail/<int:job_id>/', views.job_detail_with_analysis, name='job_detail'),
+    path('import/', views.bulk_import_jobs, name='import_jobs'),
+    path('export/', views.export_jobs, name='export_jobs'),
+    path('applications/export/', views.export_applications, name='export_applications'),
     
 ]
@@ -1,12 +1,25 @@
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
-from .models import Job
+from django.db import router
+from django.http import HttpResponseBadRequest, HttpResponseForbidden, JsonResponse, StreamingHttpResponse
+from django.utils.functional import cached_property
+from django.views.decorators.http import require_POST
+from smarthire import metrics
+from smarthire.profiling import timed
+from smarthire.routers import use_replica
+from . import geo, matching_weights, similarity_index, text_similarity
+from .import_export import (
+    APPLICATION_EXPORT_COLUMNS, FORMATS, JOB_EXPORT_COLUMNS, detect_format, export_rows, import_jobs,
+)
+from .models import Application, Job
+from .search import search_jobs
 from accounts.models import DeveloperProfile
 import json
-from django.db.models import Q
+from django.db.models import Count, Q
 from datetime import datetime, timedelta
 import re
 from collections import Counter
+from collections.abc import Mapping
 import math
 
 
@@ -41,6 +54,91 @@ def create_job(request):
     return redirect('recruiter:dashboard')
 
 
+@login_required
+@require_POST
+def bulk_import_jobs(request):
+    """Create or update the recruiter's jobs from an uploaded CSV or JSON Lines file, keyed by external_id"""
+    if request.user.user_type != 'recruiter':
+        return HttpResponseForbidden()
+    upload = request.FILES.get('file')
+    if upload is None:
+        return JsonResponse({'success': False, 'message': 'No file uploaded'}, status=400)
+    fmt = request.POST.get('format') or detect_format(upload.name)
+    if fmt not in FORMATS:
+        return JsonResponse({'success': False, 'message': 'Upload a .csv or .jsonl file'}, status=400)
+
+    try:
+        result = import_jobs(request.user, upload.file, fmt, dry_run=request.POST.get('dry_run') == '1')
+    except ValueError as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+    return JsonResponse({
+        'success': True,
+        'message': f"{result['created']} jobs created, {result['updated']} updated, {result['skipped']} rows skipped",
+        **result,
+    })
+
+
+# Helper: The export format from ?format=, or None if it is not one we support
+def export_format(request):
+    fmt = request.GET.get('format', 'csv')
+    return fmt if fmt in FORMATS else None
+
+
+# Helper: A streamed download of export_rows() for a queryset
+def export_response(queryset, columns, fmt, filename):
+    # Bind the read database now: the rows are read after the view returns
+    queryset = queryset.using(router.db_for_read(queryset.model))
+    response = StreamingHttpResponse(
+        export_rows(queryset, columns, fmt),
+        content_type='text/csv' if fmt == 'csv' else 'application/x-ndjson',
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{fmt}"'
+    return response
+
+
+@login_required
+@use_replica
+def export_jobs(request):
+    """Download all of the recruiter's jobs (?format=csv or jsonl), in the import format"""
+    if request.user.user_type != 'recruiter':
+        return HttpResponseForbidden()
+    fmt = export_format(request)
+    if fmt is None:
+        return HttpResponseBadRequest('Unknown export format')
+    jobs = Job.objects.filter(recruiter=request.user).order_by('id')
+    return export_response(jobs, JOB_EXPORT_COLUMNS, fmt, 'jobs')
+
+
+@login_required
+@use_replica
+def export_applications(request):
+    """Download the applications to the recruiter's jobs (?format=csv or jsonl, optional ?job=<id>)"""
+    if request.user.user_type != 'recruiter':
+        return HttpResponseForbidden()
+    fmt = export_format(request)
+    if fmt is None:
+        return HttpResponseBadRequest('Unknown export format')
+    applications = Application.objects.filter(job__recruiter=request.user).order_by('id')
+    job_id = request.GET.get('job')
+    if job_id:
+        if not job_id.isdigit():
+            return HttpResponseBadRequest('Invalid job id')
+        applications = applications.filter(job_id=job_id)
+    return export_response(applications, APPLICATION_EXPORT_COLUMNS, fmt, 'applications')
+
+
+# How many keyword search hits are passed on to JobMatchingAI for scoring
+SEARCH_CANDIDATE_LIMIT = 200
+
+# Radius choices (km) of the find_jobs distance filter
+DISTANCE_CHOICES = [10, 25, 50, 100, 250, 500]
+
+
+MATCH_SCORE_SECONDS = metrics.histogram(
+    'smarthire_match_score_seconds', 'Time spent computing each JobMatchingAI score component', ['component'],
+)
+
+
 class JobMatchingAI:
     """AI-powered job matching system using multiple scoring algorithms"""
     
@@ -52,7 +150,27 @@ class JobMatchingAI:
             'senior': ['senior', 'lead', 'principal', '5+', '5-8', '6+'],
             'expert': ['expert', 'architect', 'director', '8+', '10+', 'staff']
         }
-        
+
+        # Years parsed from free-text experience strings, keyed by the string
+        self._experience_years_cache = {}
+
+        # Location score by distance between the developer's and the job's city (km, score)
+        self.location_distance_scores = [(30, 100.0), (100, 90.0), (300, 80.0)]
+
+        # Description similarity (TF-IDF cosine) that already scores 100, and
+        # the query vector of each profile text scored so far
+        self.description_full_match_similarity = 0.5
+        self._description_queries = {}
+        
+        # Weight of each score component in the overall match score
+        self.weights = {
+            'skills': 0.35,      # 35% - Most important
+            'experience': 0.20,  # 20% - Very important
+            'location': 0.20,    # 20% - Important for logistics
+            'salary': 0.15,      # 15% - Important but negotiable
+            'description': 0.10  # 10% - Role described like the developer's summary
+        }
+
         # Skill category weights for different job types
         self.skill_weights = {
             'frontend': {
@@ -81,6 +199,9 @@ class JobMatchingAI:
             }
         }
 
+        # Weights tuned on application outcomes (tune_matching_weights) replace these
+        matching_weights.apply(self)
+
     def extract_experience_level(self, text):
         """Extract experience level from job title or description"""
         text_lower = text.lower()
@@ -99,36 +220,19 @@ class JobMatchingAI:
         else:
             return 'mid'
 
+    @metrics.timed(MATCH_SCORE_SECONDS, component='skills')
     def calculate_skill_match_score(self, user_skills, job_requirements, job_title):
         """Calculate skill matching score with weighted importance"""
-        if not user_skills or not job_requirements:
-            return 0.0
-        
-        user_skills_lower = [skill.lower() for skill in user_skills]
-        job_requirements_lower = [req.lower() for req in job_requirements]
-        
         # Determine job category for weighted scoring
-        job_category = self.determine_job_category(job_title)
+        job_category, terms = self.skill_match_terms(user_skills, job_requirements, job_title)
         weights = self.skill_weights.get(job_category, {})
         
-        matched_skills = []
         total_weight = 0
         matched_weight = 0
-        
-        for req in job_requirements_lower:
+        for req, match in terms:
             weight = weights.get(req, 1.0)  # Default weight is 1.0
             total_weight += weight
-            
-            # Exact match
-            if req in user_skills_lower:
-                matched_skills.append(req)
-                matched_weight += weight
-            # Partial/similar match
-            else:
-                similarity_score = self.calculate_skill_similarity(req, user_skills_lower)
-                if similarity_score > 0.7:
-                    matched_skills.append(req)
-                    matched_weight += weight * similarity_score
+            matched_weight += weight * match
         
         # Calculate percentage match with weighted scoring
         if total_weight == 0:
@@ -137,6 +241,28 @@ class JobMatchingAI:
         skill_match_percentage = (matched_weight / total_weight) * 100
         return min(skill_match_percentage, 100.0)
 
+    def skill_match_terms(self, user_skills, job_requirements, job_title):
+        """
+        The job's category and ``(requirement, match)`` for each requirement:
+        1 if the developer has the skill, the similarity of a similar skill
+        above 0.7, else 0. No terms if either side has no skills.
+        """
+        job_category = self.determine_job_category(job_title)
+        if not user_skills or not job_requirements:
+            return job_category, []
+        
+        user_skills_lower = [skill.lower() for skill in user_skills]
+        terms = []
+        for req in (req.lower() for req in job_requirements):
+            # Exact match
+            if req in user_skills_lower:
+                terms.append((req, 1.0))
+            # Partial/similar match
+            else:
+                similarity_score = self.calculate_skill_similarity(req, user_skills_lower)
+                terms.append((req, similarity_score if similarity_score > 0.7 else 0.0))
+        return job_category, terms
+
     def calculate_skill_similarity(self, target_skill, user_skills):
         """Calculate similarity between skills using string matching"""
         target_lower = target_skill.lower()
@@ -190,12 +316,14 @@ class JobMatchingAI:
         else:
             return 'general'
 
-    def calculate_experience_match(self, user_experience, job_title, job_description):
+    @metrics.timed(MATCH_SCORE_SECONDS, component='experience')
+    def calculate_experience_match(self, user_experience, job_title, job_description, user_years=None):
         """Calculate experience level compatibility"""
         job_exp_level = self.extract_experience_level(f"{job_title} {job_description}")
         
-        # Convert user experience to years
-        user_years = self.extract_years_from_experience(user_experience)
+        # Convert user experience to years unless the caller already knows them
+        if user_years is None:
+            user_years = self.extract_years_from_experience(user_experience)
         
         # Map job requirements to year ranges
         job_year_ranges = {
@@ -217,6 +345,17 @@ class JobMatchingAI:
             gap = required_min - user_years
             return max(30.0, 100.0 - gap * 20)
 
+    def get_user_years(self, user_profile):
+        """Years of experience, from the parsed resume record when there is one"""
+        record = getattr(user_profile, 'parsed_resume', None)
+        if record is not None and record.years_of_experience is not None:
+            return record.years_of_experience
+
+        experience = getattr(user_profile, 'experience', '') or ''
+        if experience not in self._experience_years_cache:
+            self._experience_years_cache[experience] = self.extract_years_from_experience(experience)
+        return self._experience_years_cache[experience]
+
     def extract_years_from_experience(self, experience_str):
         """Extract years of experience from string"""
         if not experience_str:
@@ -246,7 +385,8 @@ class JobMatchingAI:
         
         return 2  # Default assumption
 
-    def calculate_location_score(self, user_location, job_location, job_type):
+    @metrics.timed(MATCH_SCORE_SECONDS, component='location')
+    def calculate_location_score(self, user_location, job_location, job_type, user_place_id=None, job_place_id=None):
         """Calculate location compatibility score"""
         if not user_location or not job_location:
             return 50.0  # Neutral score for missing data
@@ -255,9 +395,16 @@ class JobMatchingAI:
         job_loc_lower = job_location.lower()
         
         # Remote work gets high score regardless of location
-        if 'remote' in job_loc_lower or job_type.lower() == 'remote':
+        if self.is_remote_job(job_location, job_type):
             return 100.0
-        
+
+        # Compare gazetteer places: the ones stored on save, else resolved from the text
+        user_place = geo.get_place(user_place_id) or geo.resolve(user_location)
+        job_place = geo.get_place(job_place_id) or geo.resolve(job_location)
+        if user_place and job_place:
+            return self.calculate_place_score(user_place, job_place)
+
+        # Locations outside the gazetteer: compare the text
         # Exact city match
         if user_loc_lower in job_loc_lower or job_loc_lower in user_loc_lower:
             return 100.0
@@ -271,6 +418,43 @@ class JobMatchingAI:
         
         return 30.0  # Different locations
 
+    def is_remote_job(self, job_location, job_type):
+        """Remote work: the location mentions it or the job type is remote (find_jobs filters the same way)"""
+        return 'remote' in (job_location or '').lower() or (job_type or '').lower() == 'remote'
+
+    def calculate_place_score(self, user_place, job_place):
+        """Location score of two gazetteer places: by distance between cities, else by country"""
+        if user_place.id == job_place.id:
+            return 100.0
+        distance = geo.place_distance_km(user_place.id, job_place.id)
+        if distance is not None:
+            for max_km, score in self.location_distance_scores:
+                if distance <= max_km:
+                    return score
+        if user_place.country == job_place.country:
+            return 70.0  # Same country
+        if distance is not None and distance <= 1000:
+            return 45.0  # Neighbouring country
+        return 30.0
+
+    def description_similarities(self, user_profile, job_ids):
+        """TF-IDF cosine similarity of the profile's title and summary to each job's title and description"""
+        text = text_similarity.profile_text(user_profile)
+        query = self._description_queries.get(text)
+        if query is None:
+            query = self._description_queries[text] = text_similarity.query_vector(
+                text_similarity.PROFILE, user_profile, using=router.db_for_read(Job),
+            )
+        return text_similarity.description_similarities(query, job_ids, using=router.db_for_read(Job))
+
+    @metrics.timed(MATCH_SCORE_SECONDS, component='description')
+    def calculate_description_score(self, similarity):
+        """Calculate description similarity score"""
+        if similarity is None:
+            return 50.0  # Neutral score for missing text or a job not vectorised yet
+        return 30.0 + 70.0 * min(1.0, similarity / self.description_full_match_similarity)
+
+    @metrics.timed(MATCH_SCORE_SECONDS, component='salary')
     def calculate_salary_score(self, user_expected_salary, job_salary_min, job_salary_max):
         """Calculate salary compatibility score"""
         if not user_expected_salary or not job_salary_min:
@@ -291,8 +475,21 @@ class JobMatchingAI:
             gap_percentage = ((user_salary - job_max) / job_max) * 100
             return max(20.0, 100.0 - gap_percentage)
 
-    def calculate_comprehensive_match_score(self, user_profile, job):
-        """Calculate comprehensive matching score using multiple factors"""
+    def calculate_comprehensive_match_score(self, user_profile, job, description_similarities=None):
+        """
+        Calculate comprehensive matching score using multiple factors. Pass
+        description_similarities (from description_similarities()) when
+        scoring many jobs for one profile, so they are computed in one go.
+        Returns a MatchAnalysis: the scores now, the matched and missing
+        skills and the category when first read.
+        """
+        scores = self.calculate_match_scores(user_profile, job, description_similarities=description_similarities)
+        return MatchAnalysis(self, user_profile.skills or [], job.requirements or [], scores)
+
+    @timed('matcher')
+    @metrics.timed(MATCH_SCORE_SECONDS, component='overall')
+    def calculate_match_scores(self, user_profile, job, description_similarities=None):
+        """Overall and component scores only (rounded), for ranking"""
         
         # Extract user data
         user_skills = user_profile.skills or []
@@ -311,23 +508,26 @@ class JobMatchingAI:
         
         # Calculate individual scores
         skill_score = self.calculate_skill_match_score(user_skills, job_requirements, job_title)
-        experience_score = self.calculate_experience_match(user_experience, job_title, job_description)
-        location_score = self.calculate_location_score(user_location, job_location, job_type)
+        experience_score = self.calculate_experience_match(
+            user_experience, job_title, job_description, user_years=self.get_user_years(user_profile)
+        )
+        location_score = self.calculate_location_score(
+            user_location, job_location, job_type,
+            user_place_id=getattr(user_profile, 'place_id', None), job_place_id=getattr(job, 'place_id', None),
+        )
         salary_score = self.calculate_salary_score(user_salary, job_salary_min, job_salary_max)
+        if description_similarities is None:
+            description_similarities = self.description_similarities(user_profile, [job.pk])
+        description_score = self.calculate_description_score(description_similarities.get(job.pk))
         
         # Weighted combination of scores
-        weights = {
-            'skills': 0.4,      # 40% - Most important
-            'experience': 0.25, # 25% - Very important
-            'location': 0.20,   # 20% - Important for logistics
-            'salary': 0.15      # 15% - Important but negotiable
-        }
-        
+        weights = self.weights
         final_score = (
             skill_score * weights['skills'] +
             experience_score * weights['experience'] +
             location_score * weights['location'] +
-            salary_score * weights['salary']
+            salary_score * weights['salary'] +
+            description_score * weights['description']
         )
         
         return {
@@ -336,9 +536,7 @@ class JobMatchingAI:
             'experience_score': round(experience_score, 2),
             'location_score': round(location_score, 2),
             'salary_score': round(salary_score, 2),
-            'matched_skills': self.get_matched_skills(user_skills, job_requirements),
-            'missing_skills': self.get_missing_skills(user_skills, job_requirements),
-            'match_category': self.categorize_match(final_score)
+            'description_score': round(description_score, 2),
         }
     
     def get_matched_skills(self, user_skills, job_requirements):
@@ -399,33 +597,118 @@ class JobMatchingAI:
             return "Poor Match"
 
 
+class MatchAnalysis(Mapping):
+    """
+    Scores of one profile against one job, read like a dict (in templates
+    too). The scores are computed up front; matched_skills and
+    missing_skills compare every requirement with every skill, so they and
+    match_category are computed the first time they are read. A list that
+    only ranks by overall_score never pays for them.
+    """
+    KEYS = (
+        'overall_score', 'skill_score', 'experience_score', 'location_score', 'salary_score',
+        'description_score', 'matched_skills', 'missing_skills', 'match_category',
+    )
+
+    def __init__(self, matcher, user_skills, job_requirements, scores):
+        self._matcher = matcher
+        self._user_skills = user_skills
+        self._job_requirements = job_requirements
+        self.__dict__.update(scores)
+
+    @cached_property
+    def matched_skills(self):
+        return self._matcher.get_matched_skills(self._user_skills, self._job_requirements)
+
+    @cached_property
+    def missing_skills(self):
+        return self._matcher.get_missing_skills(self._user_skills, self._job_requirements)
+
+    @cached_property
+    def match_category(self):
+        return self._matcher.categorize_match(self.overall_score)
+
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+
 @login_required
+@use_replica
 def find_jobs(request):
     """AI-powered job recommendation system"""
     try:
-        profile = DeveloperProfile.objects.get(user=request.user)
+        profile = DeveloperProfile.objects.select_related('parsed_resume').get(user=request.user)
     except DeveloperProfile.DoesNotExist:
         return render(request, "developer/find_jobs.html", {
             "error": "Please complete your profile first to get job recommendations."
         })
     
-    # Get all active jobs
-    jobs = Job.objects.filter(status='published').select_related('recruiter')
+    # Get all active jobs, or only those matching the keyword search; of each
+    # cluster of near-duplicate postings only the representative is scored
+    search_query = request.GET.get('q', '').strip()
+    jobs = Job.objects.filter(status='published', duplicate_of__isnull=True).select_related('recruiter')
+    relevance = {}
+    if search_query:
+        relevance = dict(search_jobs(search_query, limit=SEARCH_CANDIDATE_LIMIT))
+        # A hit on a duplicate counts for its representative
+        for job_id, representative_id in Job.objects.filter(
+            id__in=list(relevance), duplicate_of__isnull=False,
+        ).values_list('id', 'duplicate_of'):
+            relevance[representative_id] = max(relevance.get(representative_id, 0.0), relevance[job_id])
+        jobs = jobs.filter(id__in=list(relevance))
+
+    # Jobs within ?within_km= of the developer's city (remote jobs always qualify):
+    # an indexed latitude/longitude range first, then the exact distance below
+    within_km = request.GET.get('within_km', '')
+    within_km = int(within_km) if within_km.isdigit() and int(within_km) > 0 else None
+    can_filter_by_distance = profile.latitude is not None
+    if within_km and can_filter_by_distance:
+        # The remote test of JobMatchingAI.is_remote_job, which scores these jobs 100 on location
+        jobs = jobs.filter(
+            geo.bounding_box_q(profile.latitude, profile.longitude, within_km)
+            | Q(place_id=geo.REMOTE) | Q(location__icontains='remote') | Q(job_type__iexact='remote')
+        )
     
     # Initialize AI matching system
     ai_matcher = JobMatchingAI()
+    jobs = list(jobs)
+    description_similarities = ai_matcher.description_similarities(profile, [job.pk for job in jobs])
     
     # Calculate match scores for all jobs
     job_matches = []
     for job in jobs:
-        match_data = ai_matcher.calculate_comprehensive_match_score(profile, job)
+        if (within_km and can_filter_by_distance and job.latitude is not None
+                and not ai_matcher.is_remote_job(job.location, job.job_type)):
+            job.distance_km = geo.haversine_km(profile.latitude, profile.longitude, job.latitude, job.longitude)
+            if job.distance_km > within_km:
+                continue
+        match_data = ai_matcher.calculate_comprehensive_match_score(
+            profile, job, description_similarities=description_similarities,
+        )
         job_matches.append({
             'job': job,
-            'match_data': match_data
+            'match_data': match_data,
+            'relevance': relevance.get(job.id, 0.0),
         })
     
-    # Sort by overall match score (descending)
-    job_matches.sort(key=lambda x: x['match_data']['overall_score'], reverse=True)
+    # Published near-duplicates behind each representative, shown as "+N similar postings"
+    duplicate_counts = dict(
+        Job.objects.filter(status='published', duplicate_of__isnull=False)
+        .values_list('duplicate_of').annotate(n=Count('id')).order_by()
+    )
+    for job_match in job_matches:
+        job_match['job'].duplicate_count = duplicate_counts.get(job_match['job'].id, 0)
+
+    # Sort by overall match score (descending), keyword relevance breaks ties
+    job_matches.sort(key=lambda x: (x['match_data']['overall_score'], x['relevance']), reverse=True)
     
     # Categorize jobs by match quality
     excellent_matches = [jm for jm in job_matches if jm['match_data']['overall_score'] >= 85]
@@ -451,38 +734,68 @@ def find_jobs(request):
         'fair_matches': fair_matches[:10],
         'potential_matches': potential_matches[:5],
         'user_stats': user_stats,
-        'total_jobs_analyzed': len(jobs),
-        'profile': profile
+        'total_jobs_analyzed': len(job_matches),
+        'profile': profile,
+        'search_query': search_query,
+        'within_km': within_km,
+        'distance_choices': DISTANCE_CHOICES,
+        'can_filter_by_distance': can_filter_by_distance,
     }
     
     return render(request, "developer/find_jobs.html", context)
 
 
+# Jobs listed under "More jobs like this"
+SIMILAR_JOBS_LIMIT = 5
+
+
+# Helper: the published jobs most like a job, best first, each with a `similarity` percentage
+def similar_jobs(job, limit=SIMILAR_JOBS_LIMIT):
+    db = router.db_for_read(Job)
+    # Ask for extra ids: some are drafts, closed or deleted since the index was built
+    ranked = similarity_index.similar(text_similarity.JOB, job.pk, limit=limit * 2, using=db)
+    jobs = Job.objects.using(db).filter(status='published').select_related('recruiter').in_bulk(
+        [pk for pk, _ in ranked]
+    )
+    results = []
+    for pk, similarity in ranked:
+        if pk in jobs:
+            jobs[pk].similarity = round(similarity * 100)
+            results.append(jobs[pk])
+    return results[:limit]
+
+
 @login_required
+@use_replica
 def job_detail_with_analysis(request, job_id):
     """Detailed job view with AI analysis"""
     try:
-        job = Job.objects.get(id=job_id)
-        profile = DeveloperProfile.objects.get(user=request.user)
-        ai_matcher = JobMatchingAI()
-        match_analysis = ai_matcher.calculate_comprehensive_match_score(profile, job)
-
-        # Skill gap recommendations
-        recommendations = []
-        missing_skills = match_analysis.get('missing_skills', [])
-        if missing_skills:
-            recommendations.append({
-                'type': 'Skill Gap',
-                'message': f"Consider learning: {', '.join(missing_skills)}"
-            })
-
-        context = {
-            'job': job,
-            'profile': profile,
-            'match_analysis': match_analysis,
-            'recommendations': recommendations
-        }
-        return render(request, "developer/job_detail.html", context)
+        # Drafts and closed postings are visible to their own recruiter only
+        job = Job.objects.select_related('recruiter').get(
+            Q(status='published') | Q(recruiter=request.user), id=job_id,
+        )
+        profile = DeveloperProfile.objects.select_related('parsed_resume').get(user=request.user)
+    except (Job.DoesNotExist, DeveloperProfile.DoesNotExist):
+        # find_jobs asks developers without a profile to complete it
+        return redirect('jobs:find_jobs')
 
-    except Job.DoesNotExist:
-        return redirect('developer:find_jobs')
+    ai_matcher = JobMatchingAI()
+    match_analysis = ai_matcher.calculate_comprehensive_match_score(profile, job)
+
+    # Skill gap recommendations
+    recommendations = []
+    missing_skills = match_analysis.get('missing_skills', [])
+    if missing_skills:
+        recommendations.append({
+            'type': 'Skill Gap',
+            'message': f"Consider learning: {', '.join(missing_skills)}"
+        })
+
+    context = {
+        'job': job,
+        'profile': profile,
+        'match_analysis': match_analysis,
+        'recommendations': recommendations,
+        'similar_jobs': similar_jobs(job),
+    }
+    return render(request, "developer/job_detail.html", context)
@@ -0,0 +1,264 @@
+"""
+Offline tuning of the job matcher's weights on past application outcomes.
+
+Applications that reached a decision are the labelled data: hired (grade
+2) and interview (1) are relevant, rejected (0) is not. Each one is scored
+once with the matcher (OutcomeFeatures): the experience, location, salary
+and description scores, which no weight changes, and the skill match of
+each job requirement. The overall score of every application under any
+weights is then a few numpy operations, so one candidate setting is
+evaluated over hundreds of thousands of applications in milliseconds.
+
+Quality is measured per job, the way a recruiter reads the ranking of its
+applicants: NDCG@k of the applicants ordered by score, averaged over jobs
+with more than one outcome grade, plus the AUC of relevant against rejected
+applications overall. coordinate_search() changes one weight at a time to
+the value that most improves NDCG on the training jobs, and the result is
+compared with the current weights on held-out jobs
+(``python manage.py tune_matching_weights``).
+"""
+import math
+
+from django.db import router
+
+from accounts.models import DeveloperProfile
+
+from .batching import batches
+from .matching_weights import COMPONENTS
+from .models import Application, Job
+
+OUTCOME_GRADES = {'hired': 2, 'interview': 1, 'rejected': 0}
+
+# Skill weights seen in fewer labelled applications than this are not tuned
+MIN_SKILL_SUPPORT = 20
+
+# Multipliers tried for a skill weight, and the bounds it is kept within
+SKILL_FACTORS = (0.5, 0.8, 1.25, 2.0)
+SKILL_WEIGHT_RANGE = (0.25, 4.0)
+
+JOB_FIELDS = ('id', 'title', 'description', 'requirements', 'location', 'job_type', 'salary_min', 'salary_max',
+              'place_id')
+
+
+class OutcomeFeatures:
+    """
+    Matcher scores of the decided applications, as arrays over rows:
+    ``groups`` (job of each row, 0..jobs-1), ``grades``, ``fixed`` (rows x
+    the components other than skills) and the skill terms ``term_rows``,
+    ``term_keys`` and ``term_matches``. A term's key indexes ``skill_keys``,
+    the ``(category, skill)`` pairs with a tunable weight; -1 stands for the
+    fixed default weight 1.0.
+    """
+
+    def __init__(self, job_ids, grades, fixed, term_rows, term_keys, term_matches, skill_keys, skill_support):
+        import numpy as np
+
+        self.job_ids, self.groups = np.unique(np.asarray(job_ids, dtype=np.int64), return_inverse=True)
+        self.grades = np.asarray(grades, dtype=np.int8)
+        self.fixed = np.asarray(fixed, dtype=np.float64).reshape(len(self.grades), len(COMPONENTS) - 1)
+        self.term_rows = np.asarray(term_rows, dtype=np.int64)
+        self.term_keys = np.asarray(term_keys, dtype=np.int64)
+        self.term_matches = np.asarray(term_matches, dtype=np.float64)
+        self.skill_keys = skill_keys
+        self.skill_support = skill_support
+
+    def __len__(self):
+        return len(self.grades)
+
+    def scores(self, weights, skill_values):
+        """Overall match score of every row: ``weights`` in COMPONENTS order, ``skill_values`` per skill key"""
+        import numpy as np
+
+        term_weights = np.append(skill_values, 1.0)[self.term_keys]
+        matched = np.bincount(self.term_rows, weights=term_weights * self.term_matches, minlength=len(self))
+        total = np.bincount(self.term_rows, weights=term_weights, minlength=len(self))
+        skill = np.minimum(100.0 * np.divide(matched, total, out=np.zeros(len(self)), where=total > 0), 100.0)
+        return skill * weights[0] + self.fixed @ weights[1:]
+
+
+def load_outcomes(matcher, using=None, limit=None):
+    """Score the decided applications with a matcher: OutcomeFeatures"""
+    db = using or router.db_for_read(Application)
+    applications = list(
+        Application.objects.using(db).filter(status__in=OUTCOME_GRADES).order_by('-pk')
+        .values_list('job_id', 'developer_id', 'status')[:limit]
+    )
+    jobs = {}
+    for batch in batches(sorted({job_id for job_id, _, _ in applications})):
+        jobs.update((job.pk, job) for job in Job.objects.using(db).filter(pk__in=batch).only(*JOB_FIELDS))
+    profiles = {}
+    for batch in batches(sorted({developer_id for _, developer_id, _ in applications})):
+        profiles.update(
+            (profile.user_id, profile)
+            for profile in DeveloperProfile.objects.using(db).filter(user_id__in=batch).select_related('parsed_resume')
+        )
+
+    by_developer = {}
+    for job_id, developer_id, status in applications:
+        if job_id in jobs and developer_id in profiles:
+            by_developer.setdefault(developer_id, []).append((job_id, OUTCOME_GRADES[status]))
+
+    skill_index = {}
+    skill_keys, skill_support = [], []
+    job_ids, grades, fixed = [], [], []
+    term_rows, term_keys, term_matches = [], [], []
+    for developer_id, outcomes in by_developer.items():
+        profile = profiles[developer_id]
+        user_years = matcher.get_user_years(profile)
+        similarities = matcher.description_similarities(profile, [job_id for job_id, _ in outcomes])
+        for job_id, grade in outcomes:
+            job = jobs[job_id]
+            row = len(grades)
+            job_ids.append(job_id)
+            grades.append(grade)
+            fixed.extend((
+                matcher.calculate_experience_match(
+                    profile.experience or '', job.title or '', job.description or '', user_years=user_years,
+                ),
+                matcher.calculate_location_score(
+                    profile.location or '', job.location or '', job.job_type or '',
+                    user_place_id=profile.place_id, job_place_id=job.place_id,
+                ),
+                matcher.calculate_salary_score(profile.salary, job.salary_min, job.salary_max),
+                matcher.calculate_description_score(similarities.get(job_id)),
+            ))
+            category, terms = matcher.skill_match_terms(profile.skills or [], job.requirements or [], job.title or '')
+            category_weights = matcher.skill_weights.get(category, {})
+            for requirement, match in terms:
+                key = -1
+                if requirement in category_weights:
+                    key = skill_index.get((category, requirement))
+                    if key is None:
+                        key = skill_index[(category, requirement)] = len(skill_keys)
+                        skill_keys.append((category, requirement))
+                        skill_support.append(0)
+                    skill_support[key] += 1
+                term_rows.append(row)
+                term_keys.append(key)
+                term_matches.append(match)
+
+    return OutcomeFeatures(job_ids, grades, fixed, term_rows, term_keys, term_matches, skill_keys, skill_support)
+
+
+class Ranking:
+    """NDCG@k per job and overall AUC of the rows of some jobs, with the ideal rankings precomputed"""
+
+    def __init__(self, features, rows, k=10):
+        import numpy as np
+
+        self.k = k
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.grades = features.grades[self.rows]
+        self.gains = 2.0 ** self.grades - 1.0
+        _, self.groups = np.unique(features.groups[self.rows], return_inverse=True)
+        self.group_count = int(self.groups.max()) + 1 if len(self.rows) else 0
+        self.ideal = self._dcg(self.grades.astype(np.float64))
+
+        # Only jobs whose applicants got different outcomes say anything about the order
+        lowest = np.full(self.group_count, np.inf)
+        highest = np.full(self.group_count, -np.inf)
+        np.minimum.at(lowest, self.groups, self.grades)
+        np.maximum.at(highest, self.groups, self.grades)
+        self.ranked = (highest > lowest) & (self.ideal > 0)
+        self.positive = self.grades > 0
+
+    def _dcg(self, scores):
+        import numpy as np
+
+        order = np.lexsort((-scores, self.groups))
+        groups = self.groups[order]
+        starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]]) if len(groups) else np.array([], int)
+        positions = np.arange(len(groups)) - np.repeat(starts, np.diff(np.r_[starts, len(groups)]))
+        discounts = np.where(positions < self.k, 1.0 / np.log2(positions + 2.0), 0.0)
+        return np.bincount(groups, weights=self.gains[order] * discounts, minlength=self.group_count)
+
+    @property
+    def job_count(self):
+        return int(self.ranked.sum())
+
+    def ndcg(self, scores):
+        """Mean NDCG@k of the ranked jobs, given the scores of all feature rows"""
+        if not self.ranked.any():
+            return math.nan
+        dcg = self._dcg(scores[self.rows])
+        return float((dcg[self.ranked] / self.ideal[self.ranked]).mean())
+
+    def auc(self, scores):
+        """Probability that a relevant application outscores a rejected one (ties count half)"""
+        import numpy as np
+
+        positives = int(self.positive.sum())
+        negatives = len(self.rows) - positives
+        if not positives or not negatives:
+            return math.nan
+        _, inverse, counts = np.unique(scores[self.rows], return_inverse=True, return_counts=True)
+        ranks = (np.cumsum(counts) - (counts - 1) / 2.0)[inverse]
+        return float((ranks[self.positive].sum() - positives * (positives + 1) / 2.0) / (positives * negatives))
+
+    def evaluate(self, scores):
+        return {'ndcg': self.ndcg(scores), 'auc': self.auc(scores)}
+
+
+def split_jobs(features, validation=0.2, seed=0):
+    """Row indexes of the training and held-out jobs"""
+    import numpy as np
+
+    held_out = np.random.default_rng(seed).random(len(features.job_ids)) < validation
+    rows = np.arange(len(features))
+    return rows[~held_out[features.groups]], rows[held_out[features.groups]]
+
+
+def component_values(step):
+    """Grid of values tried for one component weight"""
+    return [round(i * step, 6) for i in range(int(round(1 / step)) + 1)]
+
+
+def coordinate_search(features, ranking, weights, skill_values, step=0.05, rounds=3, tune_skills=True,
+                      tolerance=1e-4):
+    """
+    Improve NDCG on ``ranking`` one weight at a time. A component weight is
+    tried at every value of a ``step`` grid, the other components rescaled
+    so the weights still sum to 1 (scores stay on the 0-100 scale); a skill
+    weight with enough support is tried at each SKILL_FACTORS multiple.
+    Repeats until a round gains less than ``tolerance`` or after ``rounds``.
+    Returns ``(weights, skill_values, ndcg, evaluations)``.
+    """
+    import numpy as np
+
+    weights = np.asarray(weights, dtype=np.float64) / np.sum(weights)
+    skill_values = np.asarray(skill_values, dtype=np.float64).copy()
+    best = ranking.ndcg(features.scores(weights, skill_values))
+    evaluations = 1
+    tunable = [key for key, support in enumerate(features.skill_support) if support >= MIN_SKILL_SUPPORT]
+
+    for _ in range(rounds):
+        start = best
+        for component in range(len(COMPONENTS)):
+            rest = 1.0 - weights[component]
+            for value in component_values(step):
+                candidate = weights * ((1.0 - value) / rest) if rest > 0 else np.full_like(weights, 0.0)
+                candidate[component] = value
+                if not candidate.sum() > 0 or np.allclose(candidate, weights):
+                    continue
+                candidate /= candidate.sum()
+                score = ranking.ndcg(features.scores(candidate, skill_values))
+                evaluations += 1
+                if score > best + tolerance / 10:
+                    best, weights = score, candidate
+
+        for key in tunable if tune_skills else []:
+            current = skill_values[key]
+            for factor in SKILL_FACTORS:
+                value = min(max(current * factor, SKILL_WEIGHT_RANGE[0]), SKILL_WEIGHT_RANGE[1])
+                if value == skill_values[key]:
+                    continue
+                candidate = skill_values.copy()
+                candidate[key] = value
+                score = ranking.ndcg(features.scores(weights, candidate))
+                evaluations += 1
+                if score > best + tolerance / 10:
+                    best, skill_values = score, candidate
+
+        if best - start < tolerance:
+            break
+    return weights, skill_values, best, evaluations
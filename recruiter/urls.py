@@ -6,7 +6,10 @@ app_name = 'recruiter'
 urlpatterns = [
     path('', views.dashboard, name='dashboard'),
     path('candidates/', views.all_candidates, name='all_candidates'),
+    path('candidates/search/', views.search_candidates, name='search_candidates'),
     path('candidate/<int:application_id>/', views.candidate_detail, name='candidate_detail'),
     path('application/<int:application_id>/update-status/', views.update_application_status, name='update_application_status'),
+    path('applications/update-status/', views.bulk_update_application_status, name='bulk_update_application_status'),
     path('job/<int:job_id>/applications/', views.applications_by_job, name='job_applications'),
+    path('events/', views.application_events, name='application_events'),
 ]
\ No newline at end of file
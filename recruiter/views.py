@@ -8,15 +8,27 @@
 # from django.db.models import Count, Q
 # import json
 
+from datetime import datetime
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
+from django.core.handlers.asgi import ASGIRequest
 from django.shortcuts import render, get_object_or_404, redirect
-from django.http import JsonResponse
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse, StreamingHttpResponse
 from django.contrib import messages
+from django.utils import timezone
 from django.views.decorators.http import require_POST
+from jobs import similarity_index, text_similarity
+from jobs.events import ApplicationPoller, event_stream, format_sse, retry_and_ready
 from jobs.models import Job, Application
+from jobs.services import bulk_update_status, change_status, job_counts, recruiter_counts
 from jobs.views import JobMatchingAI  # Import your existing AI matcher
 from accounts.models import DeveloperProfile, User
+from accounts.search import get_candidate_index
+from django.db import router
 from django.db.models import Count, Q
+from smarthire.routers import use_replica
 import json
 
 
@@ -52,20 +64,23 @@ class SimpleJobMatcher:
             'location_match': 15 if hasattr(profile, 'location') and profile.location and job.location and profile.location.lower() in job.location.lower() else 0,
         }
 @login_required
+@use_replica
 def dashboard(request):
     recruiter = request.user
-    jobs = Job.objects.filter(recruiter=recruiter).order_by('-created_at')
+    jobs = list(Job.objects.filter(recruiter=recruiter).order_by('-created_at'))
 
-    # Annotate application counts for each job
+    # Application counts for each job, from the counter rows
+    counters = job_counts([job.pk for job in jobs])
     for job in jobs:
-        job.total_applications = job.applications.count()
-        job.applied_count = job.applications.filter(status="applied").count()
-        job.shortlisted_count = job.applications.filter(status="shortlisted").count()
-        job.rejected_count = job.applications.filter(status="rejected").count()
-
-    total_jobs = jobs.count()
-    published_jobs = jobs.filter(status='published').count()
-    total_applications = sum(job.total_applications for job in jobs)
+        counter = counters[job.pk]
+        job.total_applications = counter.total
+        job.applied_count = counter.applied
+        job.shortlisted_count = counter.interview
+        job.rejected_count = counter.rejected
+
+    total_jobs = len(jobs)
+    published_jobs = sum(1 for job in jobs if job.status == 'published')
+    total_applications = recruiter_counts(recruiter.pk).total
     avg_applications = total_applications // total_jobs if total_jobs else 0
 
     context = {
@@ -80,6 +95,7 @@ def dashboard(request):
 
 
 @login_required
+@use_replica
 def all_candidates(request):
     """Display all candidates who applied to recruiter's jobs with AI analysis"""
     recruiter = request.user
@@ -91,14 +107,8 @@ def all_candidates(request):
         'job', 'developer'
     ).order_by('-applied_at')
     
-    # Calculate statistics
-    stats = {
-        'applied': applications.filter(status='applied').count(),
-        'under_review': applications.filter(status='under_review').count(),
-        'interview': applications.filter(status='interview').count(),
-        'hired': applications.filter(status='hired').count(),
-        'rejected': applications.filter(status='rejected').count(),
-    }
+    # Statistics from the recruiter's counter row
+    stats = recruiter_counts(recruiter.pk).as_dict()
     
     # Initialize AI matching system (use your existing JobMatchingAI)
     ai_matcher = JobMatchingAI()
@@ -108,7 +118,7 @@ def all_candidates(request):
     for app in applications:
         # Try to get developer profile, create basic one if doesn't exist
         try:
-            profile = DeveloperProfile.objects.get(user=app.developer)
+            profile = DeveloperProfile.objects.select_related('parsed_resume').get(user=app.developer)
         except DeveloperProfile.DoesNotExist:
             # Create a basic profile object for display
             profile = type('Profile', (), {
@@ -150,6 +160,84 @@ def all_candidates(request):
     return render(request, 'recruiter/all_candidates.html', context)
 
 
+@login_required
+def search_candidates(request):
+    """Full-text search over all developer profiles and their parsed resumes"""
+    if request.user.user_type != 'recruiter':
+        return redirect('developer:dashboard')
+
+    query = request.GET.get('q', '').strip()
+    skill = request.GET.get('skill', '').strip()
+    location = request.GET.get('location', '').strip()
+    try:
+        page = max(1, int(request.GET.get('page', 1)))
+    except ValueError:
+        page = 1
+    per_page = 20
+
+    found = get_candidate_index().search(
+        query, skill=skill or None, location=location or None,
+        limit=per_page, offset=(page - 1) * per_page,
+    )
+
+    # Load the profiles for this page, keeping the index's ranking order
+    profile_ids = [hit['profile_id'] for hit in found['results']]
+    profiles = DeveloperProfile.objects.in_bulk(profile_ids)
+    results = []
+    for hit in found['results']:
+        profile = profiles.get(hit['profile_id'])
+        if profile is None:
+            continue  # deleted since it was indexed
+        candidate_skills = profile.skills or []
+        results.append({
+            'profile': profile,
+            'snippet': hit['snippet'],
+            'skills': candidate_skills[:6],
+            'extra_skills_count': max(0, len(candidate_skills) - 6),
+        })
+
+    context = {
+        'query': query,
+        'selected_skill': skill,
+        'selected_location': location,
+        'results': results,
+        'total': found['total'],
+        'skill_facets': found['facets']['skills'],
+        'location_facets': found['facets']['locations'],
+        'page': page,
+        'has_previous': page > 1,
+        'has_next': page * per_page < found['total'],
+    }
+    return render(request, 'recruiter/search_candidates.html', context)
+
+
+# Candidates listed under "Similar candidates"
+SIMILAR_CANDIDATES_LIMIT = 5
+
+
+# Helper: the developer profiles most like a profile, best first, each with a
+# `similarity` percentage and the recruiter's latest application from them
+# (`application`, None if they did not apply to the recruiter's jobs)
+def similar_candidates(profile, recruiter, limit=SIMILAR_CANDIDATES_LIMIT):
+    db = router.db_for_read(DeveloperProfile)
+    ranked = similarity_index.similar(text_similarity.PROFILE, profile.pk, limit=limit, using=db)
+    profiles = DeveloperProfile.objects.using(db).in_bulk([pk for pk, _ in ranked])
+    applications = {}
+    for application in Application.objects.using(db).filter(
+        job__recruiter=recruiter, developer__in=[p.user_id for p in profiles.values()],
+    ).order_by('applied_at'):
+        applications[application.developer_id] = application
+    results = []
+    for pk, similarity in ranked:
+        candidate = profiles.get(pk)
+        if candidate is None:
+            continue  # deleted since it was indexed
+        candidate.similarity = round(similarity * 100)
+        candidate.application = applications.get(candidate.user_id)
+        results.append(candidate)
+    return results
+
+
 @login_required
 def candidate_detail(request, application_id):
     """Detailed view of a specific candidate application"""
@@ -160,7 +248,7 @@ def candidate_detail(request, application_id):
     )
     
     try:
-        profile = DeveloperProfile.objects.get(user=application.developer)
+        profile = DeveloperProfile.objects.select_related('parsed_resume').get(user=application.developer)
     except DeveloperProfile.DoesNotExist:
         messages.error(request, "Candidate profile not found.")
         return redirect('recruiter:all_candidates')
@@ -174,6 +262,7 @@ def candidate_detail(request, application_id):
         'profile': profile,
         'match_analysis': match_analysis,
         'job': application.job,
+        'similar_candidates': similar_candidates(profile, request.user),
     }
     
     return render(request, 'recruiter/candidate_detail.html', context)
@@ -184,7 +273,7 @@ def candidate_detail(request, application_id):
 def update_application_status(request, application_id):
     """Update the status of a candidate application"""
     application = get_object_or_404(
-        Application,
+        Application.objects.select_related('job'),
         id=application_id,
         job__recruiter=request.user
     )
@@ -201,12 +290,8 @@ def update_application_status(request, application_id):
         messages.error(request, 'Invalid status selected.')
         return redirect('recruiter:candidate_detail', application_id=application_id)
     
-    # Update application
-    old_status = application.status
-    application.status = new_status
-    if notes:
-        application.notes = notes
-    application.save()
+    # Update application, its history and the status counters
+    change_status(application, new_status, request.user, notes)
     
     status_display_names = {
         'applied': 'Applied',
@@ -228,6 +313,49 @@ def update_application_status(request, application_id):
     return redirect('recruiter:candidate_detail', application_id=application_id)
 
 
+@login_required
+@require_POST
+def bulk_update_application_status(request):
+    """Move many applications to one status in a single transaction (JSON or form POST)"""
+    if request.content_type == 'application/json':
+        try:
+            payload = json.loads(request.body)
+        except ValueError:
+            return JsonResponse({'success': False, 'message': 'Invalid JSON'}, status=400)
+        if not isinstance(payload, dict):
+            return JsonResponse({'success': False, 'message': 'Expected a JSON object'}, status=400)
+        raw_ids = payload.get('application_ids')
+        new_status = payload.get('status')
+        notes = payload.get('notes') or ''
+    else:
+        raw_ids = request.POST.getlist('application_ids')
+        new_status = request.POST.get('status')
+        notes = request.POST.get('notes', '')
+
+    try:
+        if not isinstance(raw_ids, list) or not isinstance(notes, str):
+            raise TypeError
+        application_ids = [int(pk) for pk in raw_ids]
+    except (TypeError, ValueError):
+        return JsonResponse({'success': False, 'message': 'application_ids must be a list of ids'}, status=400)
+    if not application_ids:
+        return JsonResponse({'success': False, 'message': 'No applications selected'}, status=400)
+
+    try:
+        results = bulk_update_status(request.user, application_ids, new_status, notes)
+    except ValueError as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+
+    updated = sum(1 for result in results if result['result'] == 'updated')
+    return JsonResponse({
+        'success': True,
+        'message': f'{updated} application{"s" if updated != 1 else ""} updated',
+        'status': new_status,
+        'updated': updated,
+        'results': results,
+    })
+
+
 @login_required
 def applications_by_job(request, job_id):
     """View all applications for a specific job"""
@@ -242,7 +370,7 @@ def applications_by_job(request, job_id):
     processed_applications = []
     for app in applications:
         try:
-            profile = DeveloperProfile.objects.get(user=app.developer)
+            profile = DeveloperProfile.objects.select_related('parsed_resume').get(user=app.developer)
         except DeveloperProfile.DoesNotExist:
             continue
         
@@ -266,14 +394,8 @@ def applications_by_job(request, job_id):
     # Sort by match score
     processed_applications.sort(key=lambda x: x['match_score'], reverse=True)
     
-    # Calculate statistics for this job
-    stats = {
-        'applied': applications.filter(status='applied').count(),
-        'under_review': applications.filter(status='under_review').count(),
-        'interview': applications.filter(status='interview').count(),
-        'hired': applications.filter(status='hired').count(),
-        'rejected': applications.filter(status='rejected').count(),
-    }
+    # Statistics for this job, from its counter row
+    stats = job_counts([job.pk])[job.pk].as_dict()
     
     context = {
         'job': job,
@@ -282,4 +404,41 @@ def applications_by_job(request, job_id):
         'total_applications': len(processed_applications),
     }
     
-    return render(request, 'recruiter/job_applications.html', context)
\ No newline at end of file
+    return render(request, 'recruiter/job_applications.html', context)
+
+
+# Helper: Where an event stream starts: the browser's Last-Event-ID when it reconnects, else now
+def event_stream_start(request):
+    last_event_id = request.headers.get('Last-Event-ID')
+    if last_event_id:
+        try:
+            since = datetime.fromisoformat(last_event_id)
+        except ValueError:
+            pass
+        else:
+            if timezone.is_aware(since):
+                return since
+    return timezone.now()
+
+
+@login_required
+async def application_events(request):
+    """Server-Sent Events feed of new applications and status changes on the recruiter's jobs"""
+    user = await request.auser()
+    if user.user_type != 'recruiter':
+        return HttpResponseForbidden()
+
+    poll_seconds = settings.APPLICATION_EVENTS_POLL_SECONDS
+    poller = ApplicationPoller(user.pk, event_stream_start(request))
+
+    if not isinstance(request, ASGIRequest):
+        # A long-lived stream would hold a WSGI worker thread: answer with the
+        # changes since the last event instead, and let the browser reconnect
+        events = await sync_to_async(poller.poll)()
+        body = retry_and_ready(poller, poll_seconds) + ''.join(format_sse(e, e.get('updated_at')) for e in events)
+        response = HttpResponse(body, content_type='text/event-stream')
+    else:
+        response = StreamingHttpResponse(event_stream(user.pk, poller, poll_seconds), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # no proxy buffering (nginx)
+    return response
@@ -1,13 +1,27 @@
+import logging
 import re
-import PyPDF2
-import spacy
+import sys
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import json
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
+from functools import lru_cache
 from pathlib import Path
 
-@dataclass
+from smarthire import metrics
+
+logger = logging.getLogger(__name__)
+
+PARSE_STAGE_SECONDS = metrics.histogram(
+    'smarthire_resume_parse_stage_seconds', 'Time spent in each resume parser stage', ['stage'],
+)
+
+# The parser output is kept compact: every class uses __slots__, and the
+# ones that are built in one go are frozen. Lists default to empty lists
+# rather than None.
+
+@dataclass(frozen=True, slots=True)
 class ContactInfo:
     name: Optional[str] = None
     email: Optional[str] = None
@@ -17,7 +31,7 @@ class ContactInfo:
     github: Optional[str] = None
     website: Optional[str] = None
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Education:
     degree: Optional[str] = None
     institution: Optional[str] = None
@@ -25,7 +39,8 @@ class Education:
     gpa: Optional[str] = None
     field_of_study: Optional[str] = None
 
-@dataclass
+# Filled in line by line while a section is parsed, so not frozen
+@dataclass(slots=True)
 class Experience:
     job_title: Optional[str] = None
     company: Optional[str] = None
@@ -33,37 +48,196 @@ class Experience:
     start_date: Optional[str] = None
     end_date: Optional[str] = None
     description: Optional[str] = None
-    responsibilities: List[str] = None
+    responsibilities: List[str] = field(default_factory=list)
     experience_type: Optional[str] = None  # 'work', 'internship', 'freelance', etc.
     location: Optional[str] = None
     is_current: bool = False
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ParsedResume:
-    contact_info: ContactInfo
+    contact_info: ContactInfo = field(default_factory=ContactInfo)
     summary: Optional[str] = None
-    skills: List[str] = None
-    technical_skills: List[str] = None
-    soft_skills: List[str] = None
-    work_experience: List[Experience] = None
-    internship_experience: List[Experience] = None
-    all_experience: List[Experience] = None  # Combined work + internships
-    education: List[Education] = None
-    certifications: List[str] = None
-    projects: List[str] = None
-    languages: List[str] = None
+    skills: List[str] = field(default_factory=list)
+    technical_skills: List[str] = field(default_factory=list)
+    soft_skills: List[str] = field(default_factory=list)
+    work_experience: List[Experience] = field(default_factory=list)
+    internship_experience: List[Experience] = field(default_factory=list)
+    all_experience: List[Experience] = field(default_factory=list)  # Combined work + internships
+    education: List[Education] = field(default_factory=list)
+    certifications: List[str] = field(default_factory=list)
+    projects: List[str] = field(default_factory=list)
+    languages: List[str] = field(default_factory=list)
     years_of_experience: Optional[int] = None
     total_internship_months: Optional[int] = None
 
+    def to_dict(self) -> Dict:
+        """
+        Plain JSON-compatible dict, e.g. for the session or a JSONField.
+
+        all_experience only repeats the work and internship entries, so it is
+        left out; from_dict() rebuilds it from the same objects.
+        """
+        data = _field_dict(self)
+        del data['all_experience']
+        data['contact_info'] = _field_dict(self.contact_info)
+        for key in ('work_experience', 'internship_experience', 'education'):
+            data[key] = [_field_dict(item) for item in data[key]]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ParsedResume':
+        """Rebuild from to_dict() output; unknown keys are ignored."""
+        data = _known_fields(cls, data or {})
+        data['contact_info'] = ContactInfo(**_known_fields(ContactInfo, data.get('contact_info') or {}))
+        for key in ('work_experience', 'internship_experience'):
+            data[key] = [_load_experience(exp) for exp in data.get(key) or []]
+        data['all_experience'] = data['work_experience'] + data['internship_experience']
+        data['education'] = [Education(**_known_fields(Education, edu)) for edu in data.get('education') or []]
+        # Skills come from a small fixed vocabulary: share one string per skill
+        # across every loaded resume instead of one per resume
+        for key in ('skills', 'technical_skills', 'soft_skills'):
+            data[key] = [sys.intern(skill) for skill in data.get(key) or []]
+        return cls(**data)
+
+
+def _field_dict(obj) -> Dict:
+    # asdict() deep-copies every value; the values here are strings, numbers
+    # and lists of strings, so copying the lists is enough
+    return {
+        name: list(value) if isinstance(value, list) else value
+        for name in obj.__dataclass_fields__
+        for value in (getattr(obj, name),)
+    }
+
+
+def _known_fields(cls, data: Dict) -> Dict:
+    names = cls.__dataclass_fields__
+    return {key: value for key, value in data.items() if key in names}
+
+
+def _load_experience(data: Dict) -> Experience:
+    exp = Experience(**_known_fields(Experience, data))
+    if exp.experience_type:
+        exp.experience_type = sys.intern(exp.experience_type)
+    return exp
+
+
+# Section header keywords, by section name. Order matters where headers
+# overlap: "intern experience" is an internship header, not an experience one.
+SECTION_HEADERS = {
+    'summary': [r'(?:professional\s+|career\s+)?summary', r'objective', r'(?:professional\s+)?profile', r'about\s+me'],
+    'internships': [r'(?:summer\s+)?internships?', r'intern\s+experience', r'industrial\s+training', r'co-op\s+experience'],
+    'experience': [r'(?:work\s+)?experience', r'employment(?:\s+history)?', r'career\s+history', r'work\s+history'],
+    'education': [r'education', r'academic\s+background', r'academics'],
+    'skills': [r'(?:technical\s+)?skills', r'technologies', r'tech\s+stack'],
+    'projects': [r'projects?'],
+    'certifications': [r'certifications?', r'licenses'],
+    # Sections we don't extract from, matched only so they end the one before
+    'other': [r'awards', r'honou?rs', r'publications', r'references', r'interests',
+              r'activities', r'languages', r'volunteering', r'leadership'],
+}
+
+# One pass over the text, one match per line. A header is a short line (at
+# most 60 characters, checked first so prose lines are rejected cheaply): up
+# to three qualifier words ("Relevant", "Leadership and Involvement"), a
+# section keyword, an optional "and <words>" tail ("Skills and Certifications")
+# and an optional colon. Any other line is consumed whole by the last branch,
+# which keeps the scan from retrying the header branch at every character.
+SECTION_HEADER_RE = re.compile(
+    r'^(?=[^\n]{1,60}$)[^\S\n]*(?:[A-Za-z]+[^\S\n]+){0,3}?'
+    r'(?:' + '|'.join(
+        f"(?P<{name}>{'|'.join(patterns)})" for name, patterns in SECTION_HEADERS.items()
+    ) + r')\b'
+    r'(?:[^\S\n]+(?:and|&)[^\S\n]+[A-Za-z]+(?:[^\S\n]+[A-Za-z]+)?)?'
+    r'[^\S\n]*:?[^\S\n]*$'
+    r'|[^\n]+',
+    re.IGNORECASE | re.MULTILINE,
+)
+
+_HEADER_MINOR_WORDS = {'and', '&', 'of'}
+
+# Anything that suggests a line holds a date: a year (which also covers
+# MM/YYYY and MM-YYYY), a month name or a "present"-style end date
+DATE_HINT_RE = re.compile(
+    r'\d{4}|jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec|present|current|ongoing',
+    re.IGNORECASE,
+)
+
+
+def _looks_like_header(line: str) -> bool:
+    """Headers are upper case, title case or end with a colon, unlike prose lines."""
+    line = line.strip()
+    if line.endswith(':'):
+        return True
+    words = line.split()
+    return line.isupper() or all(w[0].isupper() or w.lower() in _HEADER_MINOR_WORDS for w in words)
+
+
+@dataclass
+class ResumeSections:
+    """Offsets of the named sections of a resume's text, found in a single pass.
+
+    Each span is ``(start, end)``: the section body, from the end of its header
+    line to the next header. Extractors scan the spans in place with
+    ``pattern.search(text, start, end)`` and only slice the bodies they split
+    into lines.
+    """
+    text: str
+    spans: Dict[str, List[Tuple[int, int]]] = field(default_factory=dict)
+
+    def all(self, name: str) -> List[Tuple[int, int]]:
+        return self.spans.get(name, [])
+
+    def first(self, name: str) -> Optional[Tuple[int, int]]:
+        spans = self.spans.get(name)
+        return spans[0] if spans else None
+
+    def body(self, span: Tuple[int, int]) -> str:
+        return self.text[span[0]:span[1]]
+
+
+def segment_sections(text: str) -> ResumeSections:
+    """Split resume text into named sections with one scan of SECTION_HEADER_RE."""
+    sections = ResumeSections(text)
+    current = None
+    for match in SECTION_HEADER_RE.finditer(text):
+        if match.lastgroup is None or not _looks_like_header(match.group(0)):
+            continue
+        if current:
+            sections.spans.setdefault(current[0], []).append((current[1], match.start()))
+        current = (match.lastgroup, match.end())
+    if current:
+        sections.spans.setdefault(current[0], []).append((current[1], len(text)))
+    return sections
+
+
+_NOT_LOADED = object()
+
+SPACY_MODEL = "en_core_web_sm"
+
+# How much of spaCy extract_contact_info uses to find the candidate's name:
+#   full      - the whole pipeline (tagger, parser, lemmatizer, NER, ...)
+#   ner       - only the entity recognizer and the tok2vec it listens to
+#   heuristic - no spaCy at all, the name is taken from the first lines;
+#               for high-volume batch imports
+NLP_PROFILES = ('full', 'ner', 'heuristic')
+DEFAULT_NLP_PROFILE = 'ner'
+
+# Components the name lookup never uses. Excluded components are not even
+# loaded from disk, unlike disabled ones.
+NER_EXCLUDED_COMPONENTS = [
+    'tagger', 'morphologizer', 'parser', 'senter', 'attribute_ruler', 'lemmatizer', 'textcat',
+]
+
+
 class ResumeParser:
-    def __init__(self):
-        """Initialize the resume parser with NLP model and skill databases."""
-        # Load spaCy model (install with: python -m spacy download en_core_web_sm)
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            print("Warning: spaCy model not found. Install with: python -m spacy download en_core_web_sm")
-            self.nlp = None
+    def __init__(self, nlp_profile: str = DEFAULT_NLP_PROFILE):
+        """Initialize the resume parser with skill databases; the NLP model loads on first use."""
+        if nlp_profile not in NLP_PROFILES:
+            raise ValueError(f"Unknown NLP profile {nlp_profile!r}, expected one of {', '.join(NLP_PROFILES)}")
+        self.nlp_profile = nlp_profile
+        self._nlp = _NOT_LOADED
+        self._nlp_lock = threading.Lock()
         
         # Common technical skills database
         self.technical_skills = {
@@ -110,9 +284,48 @@ class ResumeParser:
             r'm\.?(?:sc|tech|eng|com|ba|s)',
             r'(?:bachelor|master|phd|doctorate)',
         ]
+        self._degree_res = [re.compile(pattern, re.IGNORECASE) for pattern in self.degree_patterns]
+
+    @property
+    def nlp(self):
+        """spaCy pipeline, or None when spaCy or its model is unavailable."""
+        if self._nlp is _NOT_LOADED:
+            with self._nlp_lock:
+                if self._nlp is _NOT_LOADED:
+                    self._nlp = self._load_nlp()
+        return self._nlp
+
+    @nlp.setter
+    def nlp(self, value):
+        self._nlp = value
+
+    def _load_nlp(self):
+        if self.nlp_profile == 'heuristic':
+            return None
+        # spaCy takes most of a second to import, so it is only imported
+        # when a resume is actually parsed
+        try:
+            import spacy
+        except ImportError:
+            logger.warning("spaCy not installed. Install with: pip install spacy")
+            return None
+        # Load spaCy model (install with: python -m spacy download en_core_web_sm)
+        try:
+            if self.nlp_profile == 'full':
+                return spacy.load(SPACY_MODEL)
+            nlp = spacy.load(SPACY_MODEL, exclude=NER_EXCLUDED_COMPONENTS)
+        except OSError:
+            logger.warning("spaCy model not found. Install with: python -m spacy download en_core_web_sm")
+            return None
+        # The shared tok2vec is only worth running if the NER listens to it
+        if 'tok2vec' in nlp.pipe_names and not nlp.get_pipe('tok2vec').listening_components:
+            nlp.remove_pipe('tok2vec')
+        return nlp
 
     def extract_text_from_pdf(self, pdf_path: str) -> str:
         """Extract text from PDF file."""
+        import PyPDF2
+
         try:
             text = ""
             with open(pdf_path, 'rb') as file:
@@ -121,17 +334,17 @@ class ResumeParser:
                     text += page.extract_text() + "\n"
             return text
         except Exception as e:
-            print(f"Error extracting text from PDF: {e}")
+            logger.warning("Error extracting text from PDF: %s", e)
             return ""
 
     def extract_contact_info(self, text: str) -> ContactInfo:
         """Extract contact information from resume text."""
-        contact = ContactInfo()
+        contact = {}
         
         # Extract email
         email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
         emails = re.findall(email_pattern, text)
-        contact.email = emails[0] if emails else None
+        contact['email'] = emails[0] if emails else None
         
         # Extract phone number
         phone_patterns = [
@@ -142,40 +355,40 @@ class ResumeParser:
         for pattern in phone_patterns:
             phones = re.findall(pattern, text)
             if phones:
-                contact.phone = phones[0].strip()
+                contact['phone'] = phones[0].strip()
                 break
         
         # Extract LinkedIn
         linkedin_pattern = r'(?:linkedin\.com/in/|linkedin\.com/profile/view\?id=)([A-Za-z0-9\-]+)'
         linkedin_matches = re.findall(linkedin_pattern, text.lower())
         if linkedin_matches:
-            contact.linkedin = f"linkedin.com/in/{linkedin_matches[0]}"
+            contact['linkedin'] = f"linkedin.com/in/{linkedin_matches[0]}"
         
         # Extract GitHub
         github_pattern = r'(?:github\.com/)([A-Za-z0-9\-]+)'
         github_matches = re.findall(github_pattern, text.lower())
         if github_matches:
-            contact.github = f"github.com/{github_matches[0]}"
+            contact['github'] = f"github.com/{github_matches[0]}"
         
         # Extract name (assume first line or first proper noun)
         if self.nlp:
             doc = self.nlp(text[:500])  # First 500 chars
             for ent in doc.ents:
                 if ent.label_ == "PERSON":
-                    contact.name = ent.text
+                    contact['name'] = ent.text
                     break
         
-        if not contact.name:
+        if not contact.get('name'):
             # Fallback: extract from first line
             lines = text.split('\n')
             for line in lines[:5]:
                 line = line.strip()
                 if line and not any(char.isdigit() or '@' in line for char in line):
                     if len(line.split()) >= 2:
-                        contact.name = line
+                        contact['name'] = line
                         break
         
-        return contact
+        return ContactInfo(**contact)
 
     def extract_skills(self, text: str) -> Tuple[List[str], List[str], List[str]]:
         """Extract technical skills, soft skills, and all skills from resume."""
@@ -245,81 +458,27 @@ class ResumeParser:
         
         return False
 
-    def extract_experience(self, text: str) -> Tuple[List[Experience], List[Experience], List[Experience]]:
+    def extract_experience(self, text: str, sections: Optional[ResumeSections] = None) -> Tuple[List[Experience], List[Experience], List[Experience]]:
         """Extract work experience and internships from resume."""
+        sections = sections or segment_sections(text)
         all_experiences = []
         work_experiences = []
         internship_experiences = []
         
-        # Common experience section headers
-        experience_patterns = [
-            r'(?:work\s+)?experience',
-            r'employment\s+history',
-            r'professional\s+experience',
-            r'career\s+history',
-            r'work\s+history'
-        ]
-        
-        # Internship section headers
-        internship_patterns = [
-            r'internships?',
-            r'intern\s+experience',
-            r'summer\s+internships?',
-            r'industrial\s+training',
-            r'co-op\s+experience'
-        ]
-        
         # Keywords that indicate internship vs work
         internship_keywords = [
             'intern', 'internship', 'trainee', 'co-op', 'summer intern',
             'graduate trainee', 'industrial training', 'apprentice'
         ]
         
-        work_keywords = [
-            'employee', 'developer', 'engineer', 'manager', 'analyst',
-            'specialist', 'consultant', 'lead', 'senior', 'junior',
-            'associate', 'executive', 'director', 'coordinator'
-        ]
-        
-        # Find all experience sections
-        sections_found = []
-        
-        # Look for work experience sections
-        for pattern in experience_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                sections_found.append(('work', match.start(), match.end()))
-        
-        # Look for internship sections
-        for pattern in internship_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                sections_found.append(('internship', match.start(), match.end()))
-        
-        # If no specific sections found, look for general experience
-        if not sections_found:
-            general_pattern = r'experience|employment'
-            match = re.search(general_pattern, text, re.IGNORECASE)
-            if match:
-                sections_found.append(('general', match.start(), match.end()))
+        # Experience and internship sections, in the order they appear
+        sections_found = sorted(
+            [(span, 'work') for span in sections.all('experience')] +
+            [(span, 'internship') for span in sections.all('internships')]
+        )
         
-        for section_type, start_pos, end_pos in sections_found:
-            # Find the end of this section
-            next_sections = [
-                'education', 'skills', 'projects', 'certifications', 
-                'awards', 'publications', 'references', 'interests'
-            ]
-            section_end = len(text)
-            section_start = end_pos
-            
-            for next_section in next_sections:
-                next_match = re.search(next_section, text[section_start:], re.IGNORECASE)
-                if next_match:
-                    section_end = section_start + next_match.start()
-                    break
-            
-            section_text = text[section_start:section_end]
-            section_experiences = self._parse_experience_section(section_text, section_type)
+        for span, section_type in sections_found:
+            section_experiences = self._parse_experience_section(sections.body(span), section_type)
             
             for exp in section_experiences:
                 all_experiences.append(exp)
@@ -488,15 +647,7 @@ class ResumeParser:
 
     def _contains_date(self, line: str) -> bool:
         """Check if line contains date information."""
-        date_patterns = [
-            r'\d{4}',  # Year
-            r'\d{1,2}/\d{4}',  # MM/YYYY
-            r'\d{1,2}-\d{4}',  # MM-YYYY
-            r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)',  # Month names
-            r'present|current|ongoing',  # Present indicators
-        ]
-        
-        return any(re.search(pattern, line.lower()) for pattern in date_patterns)
+        return DATE_HINT_RE.search(line) is not None
 
     def _extract_dates(self, text: str) -> List[str]:
         """Extract start and end dates from text."""
@@ -528,34 +679,17 @@ class ResumeParser:
         first_word = line.split()[0].lower().rstrip('.,!?;:') if line.split() else ''
         return first_word in action_verbs
 
-    def extract_education(self, text: str) -> List[Education]:
+    def extract_education(self, text: str, sections: Optional[ResumeSections] = None) -> List[Education]:
         """Extract education information from resume."""
+        sections = sections or segment_sections(text)
         education_list = []
         
-        # Find education section
-        education_pattern = r'education'
-        match = re.search(education_pattern, text, re.IGNORECASE)
-        
-        if match:
-            start_pos = match.start()
-            # Find next major section
-            next_sections = ['experience', 'skills', 'projects', 'certifications']
-            end_pos = len(text)
-            for section in next_sections:
-                section_match = re.search(section, text[start_pos:], re.IGNORECASE)
-                if section_match:
-                    end_pos = start_pos + section_match.start()
-                    break
-            
-            education_section = text[start_pos:end_pos]
-            
+        span = sections.first('education')
+        if span:
             # Extract degree information
-            for pattern in self.degree_patterns:
-                matches = re.findall(pattern, education_section, re.IGNORECASE)
-                for match in matches:
-                    edu = Education()
-                    edu.degree = match
-                    education_list.append(edu)
+            for pattern in self._degree_res:
+                for match in pattern.findall(text, *span):
+                    education_list.append(Education(degree=match))
         
         return education_list
 
@@ -624,45 +758,46 @@ class ResumeParser:
         
         return 6  # Default 6 months for other positions
 
-    def extract_summary(self, text: str) -> Optional[str]:
+    def extract_summary(self, text: str, sections: Optional[ResumeSections] = None) -> Optional[str]:
         """Extract professional summary or objective."""
-        summary_patterns = [
-            r'(?:professional\s+)?summary',
-            r'objective',
-            r'profile',
-            r'about\s+me'
-        ]
-        
-        for pattern in summary_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                start_pos = match.end()
-                # Get next few sentences
-                summary_section = text[start_pos:start_pos+500]
-                lines = summary_section.split('\n')
-                summary_lines = []
-                for line in lines[:5]:  # Get first 5 lines
-                    line = line.strip()
-                    if line and not re.match(r'^[A-Z\s]+$', line):  # Skip headers
-                        summary_lines.append(line)
-                return ' '.join(summary_lines)
-        
-        return None
+        sections = sections or segment_sections(text)
+        span = sections.first('summary')
+        if not span:
+            return None
+        
+        # Get next few sentences
+        start_pos, end_pos = span
+        summary_section = text[start_pos:min(end_pos, start_pos + 500)]
+        lines = summary_section.split('\n')
+        summary_lines = []
+        for line in lines[:5]:  # Get first 5 lines
+            line = line.strip()
+            if line and not re.match(r'^[A-Z\s]+$', line):  # Skip headers
+                summary_lines.append(line)
+        return ' '.join(summary_lines) or None
 
     def parse_resume(self, pdf_path: str) -> ParsedResume:
         """Main method to parse resume and extract all information."""
         # Extract text from PDF
-        text = self.extract_text_from_pdf(pdf_path)
+        with PARSE_STAGE_SECONDS.time(stage='text_extraction'):
+            text = self.extract_text_from_pdf(pdf_path)
         
         if not text:
             return ParsedResume(contact_info=ContactInfo())
         
         # Extract all information
-        contact_info = self.extract_contact_info(text)
-        skills, technical_skills, soft_skills = self.extract_skills(text)
-        all_experience, work_experience, internship_experience = self.extract_experience(text)
-        education = self.extract_education(text)
-        summary = self.extract_summary(text)
+        with PARSE_STAGE_SECONDS.time(stage='contact'):
+            contact_info = self.extract_contact_info(text)
+        with PARSE_STAGE_SECONDS.time(stage='skills'):
+            skills, technical_skills, soft_skills = self.extract_skills(text)
+        with PARSE_STAGE_SECONDS.time(stage='sections'):
+            sections = segment_sections(text)
+        with PARSE_STAGE_SECONDS.time(stage='experience'):
+            all_experience, work_experience, internship_experience = self.extract_experience(text, sections)
+        with PARSE_STAGE_SECONDS.time(stage='education'):
+            education = self.extract_education(text, sections)
+        with PARSE_STAGE_SECONDS.time(stage='summary'):
+            summary = self.extract_summary(text, sections)
         
         # Calculate experience metrics
         years_exp, internship_months = self.calculate_experience_metrics(work_experience, internship_experience)
@@ -689,6 +824,12 @@ class ResumeParser:
         with open(output_path, 'w') as f:
             json.dump(asdict(parsed_resume), f, indent=2, default=str)
 
+@lru_cache(maxsize=None)
+def get_resume_parser(nlp_profile: str = DEFAULT_NLP_PROFILE) -> ResumeParser:
+    """Shared parser per NLP profile, so the skill tables and NLP model are built once per process."""
+    return ResumeParser(nlp_profile)
+
+
 def main():
     """Example usage of the resume parser."""
     parser = ResumeParser()
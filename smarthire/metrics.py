@@ -0,0 +1,238 @@
+"""
+In-process metrics registry: counters and histograms with labels, rendered
+in the Prometheus text exposition format by smarthire.views.metrics.
+
+Hot paths (resume parser stages, JobMatchingAI sub-scores, GitHub/LeetCode
+calls) observe into module-level histograms:
+
+    PARSE_SECONDS = metrics.histogram('..._seconds', 'help', ['stage'])
+
+    with PARSE_SECONDS.time(stage='contact'):
+        ...
+
+    @metrics.timed(MATCH_SECONDS, stage='skills')
+    def calculate_skill_match_score(...): ...
+
+Prometheus computes p50/p99 from the buckets (histogram_quantile). Each
+worker process keeps its own registry, so scrape every worker or run a
+single one when measuring. This module does not import Django, so the
+resume parser can use it on its own.
+"""
+import math
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+
+# Upper bounds in seconds, from 10 microseconds (matcher sub-scores) to 10
+# seconds (PDF extraction, slow external APIs)
+DEFAULT_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class _CounterValue:
+    __slots__ = ('value', 'lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self.lock:
+            self.value += amount
+
+
+class _HistogramValue:
+    __slots__ = ('upper_bounds', 'counts', 'sum', 'lock')
+
+    def __init__(self, upper_bounds):
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)  # the last one is +Inf
+        self.sum = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect_left(self.upper_bounds, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def time(self):
+        return _Timer(self)
+
+
+class _Timer:
+    __slots__ = ('child', 'started')
+
+    def __init__(self, child):
+        self.child = child
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.child.observe(time.perf_counter() - self.started)
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, **labels):
+        """The value for one combination of label values"""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    @property
+    def exposed_name(self):
+        """Name in the HELP and TYPE lines, which the sample names extend"""
+        return self.name
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def samples(self):
+        """Yield ``(suffix, labels dict, value)`` for every exported sample"""
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    @property
+    def exposed_name(self):
+        # Samples are named <name>_total, and the 0.0.4 text parser only types
+        # samples whose name matches the TYPE line (as client_python writes it)
+        return f'{self.name}_total'
+
+    def _new_child(self):
+        return _CounterValue()
+
+    def inc(self, amount=1, **labels):
+        self.labels(**labels).inc(amount)
+
+    def samples(self):
+        for key, child in list(self._children.items()):
+            yield '', dict(zip(self.labelnames, key)), child.value
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.upper_bounds = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.upper_bounds)
+
+    def observe(self, value, **labels):
+        self.labels(**labels).observe(value)
+
+    def time(self, **labels):
+        """Context manager observing the time spent in its block"""
+        return _Timer(self.labels(**labels))
+
+    def samples(self):
+        for key, child in list(self._children.items()):
+            labels = dict(zip(self.labelnames, key))
+            with child.lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip(self.upper_bounds + (math.inf,), counts):
+                cumulative += count
+                yield '_bucket', {**labels, 'le': _format_bound(bound)}, cumulative
+            yield '_sum', labels, total
+            yield '_count', labels, cumulative
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                # Re-importing a module (e.g. the autoreloader) must not reset it
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} is already registered differently")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for metric in sorted(self._metrics.values(), key=lambda m: m.name):
+            name = metric.exposed_name
+            lines.append(f'# HELP {name} {_escape_help(metric.documentation)}')
+            lines.append(f'# TYPE {name} {metric.kind}')
+            for suffix, labels, value in metric.samples():
+                lines.append(f'{name}{suffix}{_format_labels(labels)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+
+def counter(name, documentation, labelnames=()):
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+
+def histogram(name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))
+
+
+def timed(histogram, **labels):
+    """Decorator observing each call's duration; the labelled value is looked up once"""
+    child = histogram.labels(**labels)
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                child.observe(time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+def _format_bound(bound):
+    return '+Inf' if bound == math.inf else repr(float(bound))
+
+
+def _format_value(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _escape_help(text):
+    return text.replace('\\', r'\\').replace('\n', r'\n')
+
+
+def _escape_label_value(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape_label_value(value)}"' for name, value in labels.items()) + '}'
@@ -0,0 +1,244 @@
+"""
+Opt-in per-request profiling.
+
+With REQUEST_PROFILING enabled, ProfilingMiddleware records for each sampled
+request (REQUEST_PROFILING_SAMPLE_RATE):
+
+* total time,
+* SQL query count and time, through an execute wrapper installed on every
+  database connection as it is opened,
+* outbound HTTP calls made with ``requests`` or ``httpx`` (GitHub,
+  LeetCode); concurrent calls of an async view each count their own time,
+* time in named spans, e.g. ``matcher`` (JobMatchingAI scoring) and
+  ``parser`` (resume parsing), marked with ``span()`` / ``@timed()``,
+* optionally the tracemalloc allocation peak (REQUEST_PROFILING_MEMORY).
+
+The breakdown is sent back as a ``Server-Timing`` header, which browser dev
+tools show next to the request, and logged as one JSON line on the
+``smarthire.profiling`` logger. When profiling is off the middleware removes
+itself and spans cost a single context variable lookup. The middleware
+supports both sync and async views, so it does not force async views onto a
+thread.
+"""
+import json
+import logging
+import random
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+_current_profile = ContextVar('request_profile', default=None)
+
+# Server-Timing description for a span's call count
+COUNT_LABELS = {'sql': 'queries', 'http': 'calls'}
+
+
+class RequestProfile:
+    """Call counts and accumulated seconds per span name for one request"""
+    __slots__ = ('timings',)
+
+    def __init__(self):
+        self.timings = {}
+
+    def add(self, name, seconds):
+        entry = self.timings.get(name)
+        if entry is None:
+            self.timings[name] = [1, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+
+
+@contextmanager
+def span(name):
+    """Add the time spent in the block to the current request's profile, if any"""
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add(name, time.perf_counter() - started)
+
+
+def timed(name):
+    """Decorator form of span()"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            profile = _current_profile.get()
+            if profile is None:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profile.add(name, time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+def instrument_requests():
+    """Time every request sent through the requests library as an 'http' span"""
+    try:
+        import requests
+    except ImportError:
+        return
+    send = requests.Session.send
+    if getattr(send, 'profiled', False):
+        return
+
+    @wraps(send)
+    def profiled_send(self, request, **kwargs):
+        with span('http'):
+            return send(self, request, **kwargs)
+
+    profiled_send.profiled = True
+    requests.Session.send = profiled_send
+
+
+def instrument_httpx():
+    """Time every request sent through httpx (the async views' client) as an 'http' span"""
+    try:
+        import httpx
+    except ImportError:
+        return
+    send = httpx.AsyncClient.send
+    if getattr(send, 'profiled', False):
+        return
+
+    @wraps(send)
+    async def profiled_send(self, request, **kwargs):
+        with span('http'):
+            return await send(self, request, **kwargs)
+
+    profiled_send.profiled = True
+    httpx.AsyncClient.send = profiled_send
+
+
+def _sql_wrapper(execute, sql, params, many, context):
+    profile = _current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.add('sql', time.perf_counter() - started)
+
+
+def _install_sql_wrapper(sender, connection, **kwargs):
+    # Connections are per thread, and the ORM calls of async views run in
+    # sync_to_async threads, so the wrapper lives on the connection and finds
+    # the request's profile through the (propagated) context variable
+    if _sql_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_sql_wrapper)
+
+
+class ProfilingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = settings.REQUEST_PROFILING_SAMPLE_RATE
+        self.trace_memory = settings.REQUEST_PROFILING_MEMORY
+        instrument_requests()
+        instrument_httpx()
+        connection_created.connect(_install_sql_wrapper, dispatch_uid='smarthire.profiling')
+        for connection in connections.all(initialized_only=True):
+            _install_sql_wrapper(None, connection)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+
+        with self.profiling(request) as result:
+            result.response = self.get_response(request)
+        return result.response
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+
+        with self.profiling(request) as result:
+            result.response = await self.get_response(request)
+        return result.response
+
+    def sampled(self):
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    @contextmanager
+    def profiling(self, request):
+        """Profile the block, which sets ``.response`` on the yielded object, and report it"""
+        profile = RequestProfile()
+        result = _ProfiledResponse()
+        token = _current_profile.set(profile)
+        # tracemalloc is process-wide: with concurrent requests the peak
+        # covers all of them, so enable it for single-worker profiling only
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        elif self.trace_memory:
+            tracemalloc.reset_peak()
+        started = time.perf_counter()
+        try:
+            yield result
+        finally:
+            total = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1] if self.trace_memory else None
+            if started_tracing:
+                tracemalloc.stop()
+            _current_profile.reset(token)
+
+        self.report(request, result.response, profile, total, peak)
+
+    def report(self, request, response, profile, total, peak):
+        timings = {
+            name: {'count': count, 'ms': round(seconds * 1000, 2)}
+            for name, (count, seconds) in sorted(profile.timings.items())
+        }
+
+        header = [f'total;dur={total * 1000:.2f}']
+        for name, timing in timings.items():
+            label = COUNT_LABELS.get(name, 'calls')
+            header.append(f'{name};desc="{timing["count"]} {label}";dur={timing["ms"]:.2f}')
+        if response.has_header('Server-Timing'):
+            header.insert(0, response['Server-Timing'])
+        response['Server-Timing'] = ', '.join(header)
+
+        match = request.resolver_match
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 2),
+            'timings': timings,
+        }
+        if peak is not None:
+            record['peak_memory_kb'] = round(peak / 1024)
+        logger.info(json.dumps(record))
+
+
+class _ProfiledResponse:
+    __slots__ = ('response',)
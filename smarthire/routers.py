@@ -0,0 +1,64 @@
+"""
+Primary/replica database routing.
+
+Writes always go to the ``default`` (primary) alias. Reads go to the
+primary too, except inside views decorated with ``@use_replica``, which
+send their reads to the ``replica`` alias when one is configured (see
+DATABASE_REPLICA_URL in settings). Use it only on read-heavy pages that
+can tolerate a little replication lag; views that write, and pages a user
+lands on right after writing, should stay on the primary.
+"""
+
+import functools
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_ALIAS = 'replica'
+
+_read_alias = ContextVar('smarthire_read_alias', default=None)
+
+
+def use_replica(view_func):
+    """Route the ORM reads made while this view runs to the replica."""
+    if iscoroutinefunction(view_func):
+        @functools.wraps(view_func)
+        async def _wrapped_view(*args, **kwargs):
+            token = _read_alias.set(REPLICA_ALIAS)
+            try:
+                return await view_func(*args, **kwargs)
+            finally:
+                _read_alias.reset(token)
+    else:
+        @functools.wraps(view_func)
+        def _wrapped_view(*args, **kwargs):
+            token = _read_alias.set(REPLICA_ALIAS)
+            try:
+                return view_func(*args, **kwargs)
+            finally:
+                _read_alias.reset(token)
+    return _wrapped_view
+
+
+class PrimaryReplicaRouter:
+    """Send reads inside ``use_replica`` views to the replica and everything else to the primary."""
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias and alias in connections.settings:
+            return alias
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data, so cross-alias relations are fine
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Schema changes are applied on the primary and replicated
+        if db == REPLICA_ALIAS:
+            return False
+        return None
@@ -18,6 +18,8 @@ from django.contrib import admin
 from django.urls import path, include
 from django.views.generic import TemplateView
 
+from . import views
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', TemplateView.as_view(template_name='index.html'), name='index'),
@@ -25,6 +27,7 @@ urlpatterns = [
     path('developer/', include('developer.urls')),
     path('recruiter/', include('recruiter.urls')),
     path('jobs/', include('jobs.urls')),
+    path('metrics/', views.metrics, name='metrics'),
 ]
 
 
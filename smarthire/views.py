@@ -0,0 +1,13 @@
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+from . import metrics as metrics_registry
+
+
+def metrics(request):
+    """Prometheus scrape endpoint for this process's metrics, local clients only"""
+    if request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS:
+        raise Http404
+    return HttpResponse(
+        metrics_registry.REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8',
+    )